@@ -0,0 +1,174 @@
+"""
+Admission control: per route class concurrency and queue limits.
+
+Requests are sorted into classes:
+
+- ``priority``: today's entry, the rotation counters, /health and /metrics.
+  Never limited; together with the caps below they always find a free
+  database connection.
+- ``login``: POST /auth/login, bounded by bcrypt on the password pool.
+- ``heavy``: full GET /entries lists (no ``limit``, or ``stream``), search
+  and the bulk/batch admin writes.
+- ``default``: everything else.
+
+Each limited class runs at most ADMISSION_<CLASS>_CONCURRENCY requests at a
+time and queues at most ADMISSION_<CLASS>_QUEUE more, first come first
+served. A request that finds the queue full, or waits longer than
+ADMISSION_QUEUE_TIMEOUT_SECONDS, gets a 503 with ``Retry-After`` at once
+instead of piling up behind the connection pool's own timeout.
+
+The limits are per worker process, like the connection pool they protect.
+"""
+import asyncio
+from collections import deque
+from typing import Deque, Dict, Optional
+from urllib.parse import parse_qs
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.config import settings
+from app.serializers import FastJSONResponse
+
+API = "/api/v1/quiet-time"
+PRIORITY_PATHS = frozenset((
+    f"{API}/entries/today",
+    f"{API}/entries/rotation/status",
+    f"{API}/entries/rotation/days-remaining",
+    f"{API}/entries/rotation/entries-remaining",
+    "/health",
+    "/metrics",
+))
+LOGIN_PATH = "/api/v1/auth/login"
+HEAVY_WRITES = frozenset((
+    ("POST", f"{API}/entries/bulk"),
+    ("PATCH", f"{API}/entries/batch"),
+    ("DELETE", f"{API}/entries/batch"),
+))
+
+
+class Limiter:
+    """At most ``concurrency`` holders, at most ``queue`` waiters (FIFO)."""
+
+    def __init__(self, name: str, concurrency: int, queue: int):
+        self.name = name
+        self.concurrency = concurrency
+        self.queue = queue
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self.admitted = 0
+        self.rejected_full = 0
+        self.rejected_timeout = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self, timeout: float) -> bool:
+        """True once a slot is held; False (rejected) if the queue is full or the wait times out."""
+        if self.active < self.concurrency and not self._waiters:
+            self.active += 1
+            self.admitted += 1
+            return True
+        if len(self._waiters) >= self.queue:
+            self.rejected_full += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout)
+        except asyncio.TimeoutError:
+            self._give_up(waiter)
+            self.rejected_timeout += 1
+            return False
+        except asyncio.CancelledError:
+            self._give_up(waiter)
+            raise
+        self.admitted += 1
+        return True
+
+    def _give_up(self, waiter: asyncio.Future) -> None:
+        if waiter.done():
+            # The slot was handed over just as we stopped waiting; pass it on
+            self.release()
+        else:
+            waiter.cancel()
+            self._waiters.remove(waiter)
+
+    def release(self) -> None:
+        # Hand the slot straight to the next waiter, so nobody can jump the queue
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "active": self.active,
+            "queue_depth": self.queue_depth,
+            "admitted": self.admitted,
+            "rejected_full": self.rejected_full,
+            "rejected_timeout": self.rejected_timeout,
+        }
+
+
+limiters: Dict[str, Limiter] = {
+    "login": Limiter("login", settings.ADMISSION_LOGIN_CONCURRENCY, settings.ADMISSION_LOGIN_QUEUE),
+    "heavy": Limiter("heavy", settings.ADMISSION_HEAVY_CONCURRENCY, settings.ADMISSION_HEAVY_QUEUE),
+    "default": Limiter("default", settings.ADMISSION_DEFAULT_CONCURRENCY, settings.ADMISSION_DEFAULT_QUEUE),
+}
+
+
+def total_concurrency() -> int:
+    return sum(limiter.concurrency for limiter in limiters.values())
+
+
+def pool_capacity() -> int:
+    return settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+
+
+def route_class(scope: Scope) -> str:
+    method, path = scope["method"], scope["path"]
+    if path in PRIORITY_PATHS:
+        return "priority"
+    if method == "POST" and path == LOGIN_PATH:
+        return "login"
+    if (method, path) in HEAVY_WRITES or path == f"{API}/entries/search":
+        return "heavy"
+    if method == "GET" and path == f"{API}/entries":
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        # A cursor alone pages with the default page size
+        if ("limit" not in query and "cursor" not in query) or "stream" in query:
+            return "heavy"
+    return "default"
+
+
+def _busy_response() -> FastJSONResponse:
+    return FastJSONResponse(
+        {"success": False, "message": "Server is busy, please retry shortly", "data": None},
+        status_code=503,
+        headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER_SECONDS)}
+    )
+
+
+class AdmissionControlMiddleware:
+    """Pure ASGI middleware holding a class slot for the whole response."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        limiter: Optional[Limiter] = None
+        if scope["type"] == "http":
+            limiter = limiters.get(route_class(scope))
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not await limiter.acquire(settings.ADMISSION_QUEUE_TIMEOUT_SECONDS):
+            await _busy_response()(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
@@ -1,17 +1,57 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.config import settings
 from app.database import get_db
 from app.models import Admin
+from app.cache import TTLCache
+from app.metrics import password_duration
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
 
+# bcrypt is deliberately slow CPU work. It runs on a small dedicated pool (the
+# bcrypt extension releases the GIL), so a burst of logins only queues behind
+# other logins instead of stalling the event loop.
+password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_CONCURRENCY,
+    thread_name_prefix="password-hash"
+)
+
+# Resolved admins per bearer token, so admin requests skip the DB lookup.
+# Keyed by the whole token so a signature can't be replayed with other claims.
+admin_cache = TTLCache(maxsize=settings.ADMIN_CACHE_MAX_SIZE, ttl=settings.ADMIN_CACHE_TTL_SECONDS)
+
+
+def invalidate_admin(username: str) -> None:
+    """
+    Forget every cached token for ``username``. Call this when an admin is
+    deleted or changes password. ORM deletes/updates trigger it automatically;
+    other workers catch up within ADMIN_CACHE_TTL_SECONDS.
+    """
+    admin_cache.discard_where(lambda admin: admin.username == username)
+
+
+@event.listens_for(Admin, "after_delete")
+def _invalidate_deleted_admin(mapper, connection, target):
+    invalidate_admin(target.username)
+
+
+@event.listens_for(Admin, "after_update")
+def _invalidate_updated_admin(mapper, connection, target):
+    state = inspect(target)
+    if state.attrs.hashed_password.history.has_changes() or state.attrs.username.history.has_changes():
+        for username in {target.username, *state.attrs.username.history.deleted}:
+            invalidate_admin(username)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -21,6 +61,27 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def _timed(operation: str, func, *args):
+    """Run ``func`` and record its bcrypt time (excluding time queued for the pool)."""
+    started = time.perf_counter()
+    try:
+        return func(*args)
+    finally:
+        password_duration.observe(time.perf_counter() - started, operation)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        password_executor, _timed, "verify", verify_password, plain_password, hashed_password
+    )
+
+
+async def get_password_hash_async(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, _timed, "hash", get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -32,26 +93,32 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 
-def authenticate_admin(db: Session, username: str, password: str) -> Optional[Admin]:
-    admin = db.query(Admin).filter(Admin.username == username).first()
+async def authenticate_admin(db: AsyncSession, username: str, password: str) -> Optional[Admin]:
+    admin = await db.scalar(select(Admin).filter(Admin.username == username))
     if not admin:
         return None
-    if not verify_password(password, admin.hashed_password):
+    # Hand the pooled connection back before possibly queueing for bcrypt
+    await db.close()
+    if not await verify_password_async(password, admin.hashed_password):
         return None
     return admin
 
 
 async def get_current_admin(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Admin:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    token = credentials.credentials
+    cached_admin = admin_cache.get(token)
+    if cached_admin is not None:
+        return cached_admin
+    
     try:
-        token = credentials.credentials
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         username: str = payload.get("sub")
         if username is None:
@@ -59,8 +126,12 @@ async def get_current_admin(
     except JWTError:
         raise credentials_exception
     
-    admin = db.query(Admin).filter(Admin.username == username).first()
+    admin = await db.scalar(select(Admin).filter(Admin.username == username))
     if admin is None:
         raise credentials_exception
+    
+    # Never outlive the token itself
+    expires_in = payload.get("exp", 0) - time.time()
+    admin_cache.set(token, admin, ttl=expires_in)
     return admin
 
@@ -0,0 +1,118 @@
+"""
+Delta sync for clients that keep a local copy of the library.
+
+Changed entries are read in (updated_at, id) order and deletions come from
+the tombstone table written by the delete routes, each through its own
+index, so a sync reads only what changed after the client's cursor.
+
+Rows are stamped with the time their statement ran (models.change_timestamp),
+not when their transaction started. Changes younger than SYNC_SETTLE_SECONDS
+are held back until a later sync: SQLite timestamps have whole-second
+resolution, so a later write can tie with the cursor, and a row only becomes
+visible when its transaction commits, a little after it was stamped. Writes
+that run long (the bulk import) restamp their rows just before committing,
+so every write commits well within the settle window of its stamp.
+"""
+import heapq
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+from sqlalchemy import and_, delete, insert, or_, select, true, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.models import EntryTombstone, QuietTimeEntry, change_timestamp
+from app.serializers import fields_to_dict, select_fields
+
+
+@dataclass
+class Changes:
+    items: List[dict] = field(default_factory=list)
+    deleted: List[dict] = field(default_factory=list)
+    # Sort key of the last change returned, or the one passed in
+    cursor: Optional[Tuple[datetime, int]] = None
+    has_more: bool = False
+
+
+def settled_before(now: Optional[datetime] = None) -> datetime:
+    current = now or datetime.now(timezone.utc)
+    return current - timedelta(seconds=settings.SYNC_SETTLE_SECONDS)
+
+
+def _after(timestamp_column, id_column, since: Optional[Tuple[datetime, int]]):
+    if since is None:
+        return true()
+    after_timestamp, after_id = since
+    return or_(
+        timestamp_column > after_timestamp,
+        and_(timestamp_column == after_timestamp, id_column > after_id)
+    )
+
+
+async def read_changes(
+    db: AsyncSession,
+    since: Optional[Tuple[datetime, int]],
+    limit: int,
+    fields: Tuple[str, ...]
+) -> Changes:
+    """Up to ``limit`` upserts and deletions after ``since``, oldest first."""
+    until = settled_before()
+    entries = (await db.execute(
+        select_fields(fields, QuietTimeEntry.updated_at, QuietTimeEntry.id)
+        .filter(QuietTimeEntry.updated_at <= until)
+        .filter(_after(QuietTimeEntry.updated_at, QuietTimeEntry.id, since))
+        .order_by(QuietTimeEntry.updated_at, QuietTimeEntry.id)
+        .limit(limit + 1)
+    )).all()
+    tombstones = (await db.execute(
+        select(EntryTombstone.deleted_at, EntryTombstone.entry_id)
+        .filter(EntryTombstone.deleted_at <= until)
+        .filter(_after(EntryTombstone.deleted_at, EntryTombstone.entry_id, since))
+        .order_by(EntryTombstone.deleted_at, EntryTombstone.entry_id)
+        .limit(limit + 1)
+    )).all()
+
+    # Both lists are sorted by the same key; an id is never in both (see clear_tombstones)
+    merged = heapq.merge(
+        ((row.updated_at, row.id, row) for row in entries),
+        ((row.deleted_at, row.entry_id, None) for row in tombstones),
+        key=lambda change: change[:2]
+    )
+    changes = Changes(cursor=since)
+    for count, (timestamp, entry_id, row) in enumerate(merged):
+        if count == limit:
+            changes.has_more = True
+            break
+        if row is None:
+            changes.deleted.append({"id": str(entry_id), "deletedAt": timestamp.isoformat()})
+        else:
+            changes.items.append(fields_to_dict(row, fields))
+        changes.cursor = (timestamp, entry_id)
+    return changes
+
+
+async def restamp(db: AsyncSession, first_id: int, last_id: int) -> None:
+    """Move updated_at of a range of entries written by this transaction to now."""
+    await db.execute(
+        update(QuietTimeEntry)
+        .where(QuietTimeEntry.id.between(first_id, last_id))
+        .values(updated_at=change_timestamp())
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def record_deletions(db: AsyncSession, entry_ids: List[int]) -> None:
+    """Write tombstones for deleted entries, in the deleting transaction."""
+    if entry_ids:
+        await db.execute(insert(EntryTombstone), [{"entry_id": entry_id} for entry_id in entry_ids])
+
+
+async def clear_tombstones(db: AsyncSession, first_id: int, last_id: Optional[int] = None) -> None:
+    """
+    Drop tombstones for newly inserted ids. SQLite hands out the id of a
+    deleted last row again, and the new entry supersedes the deletion.
+    """
+    await db.execute(
+        delete(EntryTombstone)
+        .where(EntryTombstone.entry_id.between(first_id, last_id if last_id is not None else first_id))
+        .execution_options(synchronize_session=False)
+    )
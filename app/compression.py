@@ -0,0 +1,255 @@
+"""
+Response compression.
+
+Negotiates ``br`` (when the optional ``brotli`` package is installed) or
+``gzip`` from Accept-Encoding. A response that carries an ETag is a fixed
+content version, so its compressed bytes are computed once and reused until
+the ETag changes; everything else is compressed on the fly.
+
+Each encoding is its own representation, so it gets its own ETag
+(``"<etag>-gzip"``). Validators coming back in If-None-Match have the suffix
+stripped before the route sees them, so routes only deal in plain ETags.
+"""
+import gzip
+import zlib
+from typing import Iterable, Optional, Tuple
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.cache import TTLCache
+from app.config import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+# Preferred first when the client weighs them equally
+ENCODINGS: Tuple[str, ...] = ("br", "gzip") if brotli is not None else ("gzip",)
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+# Cached variants are paid for once, so they use a stronger setting than streams
+GZIP_LEVEL = 9
+GZIP_STREAM_LEVEL = 6
+BROTLI_QUALITY = 9
+BROTLI_STREAM_QUALITY = 5
+
+# Bodies above this are compressed on a worker thread (zlib and brotli release the GIL)
+THREADPOOL_THRESHOLD = 256 * 1024
+
+# (ETag, encoding) -> compressed body
+compressed_cache = TTLCache(
+    maxsize=settings.COMPRESSION_CACHE_MAX_SIZE,
+    ttl=settings.COMPRESSION_CACHE_TTL_SECONDS
+)
+
+
+def negotiate(accept_encoding: Optional[str], available: Iterable[str] = ENCODINGS) -> Optional[str]:
+    """
+    Pick the best encoding from an Accept-Encoding header, or None for
+    identity. Honours q-values (``q=0`` refuses) and ``*``.
+    """
+    if not accept_encoding:
+        return None
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[name] = q
+
+    best, best_q = None, 0.0
+    for encoding in available:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """``"abc"`` -> ``"abc-gzip"`` (weak prefix kept)."""
+    if etag.endswith('"'):
+        return f'{etag[:-1]}-{encoding}"'
+    return f"{etag}-{encoding}"
+
+
+def strip_encoded_etags(if_none_match: str) -> str:
+    """Map encoding-specific validators back to the route's plain ETag."""
+    tags = []
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        for encoding in ("br", "gzip"):
+            suffix = f'-{encoding}"'
+            if tag.endswith(suffix):
+                tag = tag[:-len(suffix)] + '"'
+                break
+        tags.append(tag)
+    return ", ".join(tags)
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    # mtime=0 keeps the output identical across workers for the same ETag
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+class _StreamCompressor:
+    """Incremental compressor that flushes every chunk, so NDJSON stays line-by-line."""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=BROTLI_STREAM_QUALITY)
+        else:
+            # wbits 16+ gives a gzip container
+            self._zlib = zlib.compressobj(GZIP_STREAM_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def process(self, chunk: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(chunk) + self._brotli.flush()
+        return self._zlib.compress(chunk) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI middleware (no BaseHTTPMiddleware buffering) that compresses
+    JSON and NDJSON responses for GET requests.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        encoding = negotiate(request_headers.get("accept-encoding"))
+        if_none_match = request_headers.get("if-none-match")
+        # Whether a 304 should echo the encoded validator the client is holding
+        echo_encoded = bool(if_none_match and encoding and f'-{encoding}"' in if_none_match)
+        if if_none_match:
+            # Rewritten in place: the router records the matched route on this scope
+            scope["headers"] = [
+                (key, value) for key, value in scope["headers"] if key != b"if-none-match"
+            ] + [(b"if-none-match", strip_encoded_etags(if_none_match).encode("latin-1"))]
+
+        responder = _CompressionResponder(send, encoding, self.minimum_size, echo_encoded)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, send: Send, encoding: Optional[str], minimum_size: int, echo_encoded: bool):
+        self._send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.echo_encoded = echo_encoded
+        self.start: Optional[Message] = None
+        self.status = 0
+        self.compressible = False
+        self.passthrough = False
+        self.streamer: Optional[_StreamCompressor] = None
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            self.status = message["status"]
+            headers = MutableHeaders(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            self.compressible = (
+                "content-encoding" not in headers
+                and content_type.startswith(COMPRESSIBLE_TYPES)
+            )
+            if self.status == 304:
+                headers.add_vary_header("Accept-Encoding")
+                etag = headers.get("etag")
+                if etag and self.echo_encoded:
+                    headers["ETag"] = encoded_etag(etag, self.encoding)
+            elif self.compressible:
+                headers.add_vary_header("Accept-Encoding")
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        if self.streamer is not None:
+            await self._send_stream_chunk(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if not self.compressible or self.encoding is None or self.status != 200:
+            self.passthrough = True
+            await self._flush_start()
+            await self._send(message)
+            return
+
+        if more_body:
+            # Streaming response: compress incrementally, no Content-Length
+            headers = MutableHeaders(raw=self.start["headers"])
+            del headers["content-length"]
+            headers["Content-Encoding"] = self.encoding
+            self.streamer = _StreamCompressor(self.encoding)
+            await self._flush_start()
+            await self._send_stream_chunk(message)
+            return
+
+        if len(body) < self.minimum_size:
+            await self._flush_start()
+            await self._send(message)
+            return
+
+        headers = MutableHeaders(raw=self.start["headers"])
+        etag = headers.get("etag")
+        compressed = await self._compressed(body, etag)
+        headers["Content-Encoding"] = self.encoding
+        headers["Content-Length"] = str(len(compressed))
+        if etag:
+            headers["ETag"] = encoded_etag(etag, self.encoding)
+        await self._flush_start()
+        await self._send({"type": "http.response.body", "body": compressed})
+
+    async def _compressed(self, body: bytes, etag: Optional[str]) -> bytes:
+        key = (etag, self.encoding)
+        if etag:
+            cached = compressed_cache.get(key)
+            if cached is not None:
+                return cached
+        if len(body) > THREADPOOL_THRESHOLD:
+            compressed = await run_in_threadpool(compress, body, self.encoding)
+        else:
+            compressed = compress(body, self.encoding)
+        # Weak ETags promise equivalence, not identical bytes, so only strong ones are cache keys
+        if etag and not etag.startswith("W/") and len(compressed) <= settings.COMPRESSION_CACHE_MAX_BYTES:
+            compressed_cache.set(key, compressed)
+        return compressed
+
+    async def _send_stream_chunk(self, message: Message) -> None:
+        data = self.streamer.process(message.get("body", b""))
+        more_body = message.get("more_body", False)
+        if not more_body:
+            data += self.streamer.finish()
+        await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+    async def _flush_start(self) -> None:
+        if self.start is not None:
+            await self._send(self.start)
+            self.start = None
@@ -4,9 +4,59 @@ from typing import Optional
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    READ_DATABASE_URL: Optional[str] = None  # replica for public GETs; defaults to DATABASE_URL
+    READ_REPLICA_LAG_SECONDS: float = 2  # replica reads this soon after a write are not cached
+    # Connection pools (PostgreSQL; ignored for SQLite). Each engine gets its own pool.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds before a connection is replaced; -1 never
+    DB_POOL_PRE_PING: bool = False  # test connections on checkout (one extra round trip)
+    DB_STATEMENT_TIMEOUT_MS: int = 0  # server-side statement_timeout; 0 disables
+    CREATE_TABLES_ON_STARTUP: bool = False  # local development only; use `alembic upgrade head`
     SECRET_KEY: str = "your-secret-key-please-change-in-production-09876543210"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 10080  # 7 days
+    PASSWORD_HASH_CONCURRENCY: int = 2  # bcrypt operations allowed to run at once
+    ADMIN_CACHE_TTL_SECONDS: int = 300  # never longer than the token's own exp
+    ADMIN_CACHE_MAX_SIZE: int = 1024
+    BULK_IMPORT_BATCH_SIZE: int = 500  # rows per multi-row INSERT
+    ROTATION_CACHE_TTL_SECONDS: int = 60
+    # Changes newer than this are held back from GET /entries/changes until the next
+    # sync (ties and late commits); keep it above the read replica's lag
+    SYNC_SETTLE_SECONDS: int = 2
+    # Serve the public reads from an in-memory copy of the library (see app.read_model)
+    READ_MODEL_ENABLED: bool = False
+    READ_MODEL_REFRESH_SECONDS: float = 5  # version check for other workers' writes
+    # Public read micro-cache (0 disables it); writes invalidate it immediately
+    MICRO_CACHE_TTL_SECONDS: float = 2
+    MICRO_CACHE_STALE_SECONDS: float = 10  # served while one refresh runs
+    MICRO_CACHE_MAX_ENTRIES: int = 512
+    MICRO_CACHE_MAX_BODY_BYTES: int = 1024 * 1024  # larger responses are not cached
+    # Memory-mapped file shared by the workers on one machine (e.g. /dev/shm/quiet-time-cache)
+    SHARED_CACHE_PATH: Optional[str] = None
+    SHARED_CACHE_SLOTS: int = 64  # responses kept; the file is sparse until they are written
+    SHARED_CACHE_SLOT_BYTES: int = 1024 * 1024 + 64 * 1024  # one response with its headers
+    # Admission control (see app.admission); keep the limited classes' total below the
+    # DB pool size (DB_POOL_SIZE + DB_MAX_OVERFLOW) so today's entry always gets a connection
+    ADMISSION_CONTROL_ENABLED: bool = True
+    ADMISSION_LOGIN_CONCURRENCY: int = 4
+    ADMISSION_LOGIN_QUEUE: int = 32
+    ADMISSION_HEAVY_CONCURRENCY: int = 2  # full lists, search, bulk and batch writes
+    ADMISSION_HEAVY_QUEUE: int = 8
+    ADMISSION_DEFAULT_CONCURRENCY: int = 8
+    ADMISSION_DEFAULT_QUEUE: int = 100
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 5  # then 503, well before DB_POOL_TIMEOUT
+    ADMISSION_RETRY_AFTER_SECONDS: int = 1
+    COMPRESSION_MIN_SIZE: int = 1024  # smaller bodies are sent as-is
+    COMPRESSION_CACHE_MAX_SIZE: int = 256  # compressed variants kept per worker
+    COMPRESSION_CACHE_MAX_BYTES: int = 8 * 1024 * 1024  # larger variants are not cached
+    COMPRESSION_CACHE_TTL_SECONDS: int = 86400
+    METRICS_ENABLED: bool = True  # GET /metrics in Prometheus text format
+    SQL_PROFILING: bool = False  # profile every request's SQL
+    SQL_PROFILING_HEADER: bool = False  # let clients opt in with "X-DB-Profile: 1"
+    SLOW_QUERY_MS: int = 200  # log statements at least this slow; 0 disables
+    SQL_REPEATED_QUERY_THRESHOLD: int = 5  # same statement this often in one request -> N+1 warning
     
     class Config:
         env_file = ".env"
@@ -1,18 +1,97 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
 
-engine = create_engine(settings.DATABASE_URL)
+# DATABASE_URL may name either driver; the request path always uses the async one
+# (asyncpg for Postgres, aiosqlite for local testing) and scripts use the sync one.
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+SYNC_DRIVERS = {"postgresql": "psycopg2", "sqlite": "pysqlite"}
+
+
+def _with_driver(url: str, drivers: dict) -> URL:
+    parsed = make_url(url)
+    driver = drivers.get(parsed.get_backend_name())
+    if driver is None:
+        return parsed
+    return parsed.set(drivername=f"{parsed.get_backend_name()}+{driver}")
+
+
+def async_database_url(url: str) -> URL:
+    return _with_driver(url, ASYNC_DRIVERS)
+
+
+def sync_database_url(url: str) -> URL:
+    return _with_driver(url, SYNC_DRIVERS)
+
+
+def engine_options(url: URL) -> dict:
+    """
+    Pool and timeout settings for ``url``. SQLite keeps SQLAlchemy's own
+    pooling (NullPool for files, StaticPool in memory) and has no statement
+    timeout.
+    """
+    if url.get_backend_name() == "sqlite":
+        return {}
+    options = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if settings.DB_STATEMENT_TIMEOUT_MS and url.get_backend_name() == "postgresql":
+        timeout = str(settings.DB_STATEMENT_TIMEOUT_MS)
+        if url.get_driver_name() == "asyncpg":
+            options["connect_args"] = {"server_settings": {"statement_timeout": timeout}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+    return options
+
+
+def _create_async_engine(url: str):
+    parsed = async_database_url(url)
+    return create_async_engine(parsed, **engine_options(parsed))
+
+
+# Synchronous engine for scripts (init_admin.py, migrations)
+_sync_url = sync_database_url(settings.DATABASE_URL)
+engine = create_engine(_sync_url, **engine_options(_sync_url))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Asynchronous engine for the request path, so queries never block the event loop.
+# Admin writes always use this (primary) engine.
+async_engine = _create_async_engine(settings.DATABASE_URL)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+# Public reads go to READ_DATABASE_URL (a replica) when it is set, so they don't
+# compete with admin writes for primary connections
+read_async_engine = (
+    _create_async_engine(settings.READ_DATABASE_URL) if settings.READ_DATABASE_URL else async_engine
+)
+ReadSessionLocal = async_sessionmaker(
+    bind=read_async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 Base = declarative_base()
 
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
+
+async def get_read_db():
+    """Session for read-only routes; may lag the primary by the replication delay."""
+    async with ReadSessionLocal() as db:
+        yield db
@@ -0,0 +1,66 @@
+"""
+HTTP caching helpers: strong ETags, 304 handling and
+Cache-Control bounded by the daily rotation rollover.
+"""
+import hashlib
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+from fastapi import Request, Response
+
+
+def make_etag(*parts) -> str:
+    digest = hashlib.sha1(":".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'"{digest}"'
+
+
+def as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes; they are stored in UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def start_of_utc_day(now: Optional[datetime] = None) -> datetime:
+    current = now or datetime.now(timezone.utc)
+    return current.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def seconds_until_utc_midnight(now: Optional[datetime] = None) -> int:
+    current = now or datetime.now(timezone.utc)
+    next_midnight = start_of_utc_day(current) + timedelta(days=1)
+    return max(int((next_midnight - current).total_seconds()), 0)
+
+
+# Every UTC offset in use is a whole number of quarter hours, so somewhere a
+# new day (and a new rotation entry) starts at each quarter hour
+ROLLOVER_INTERVAL_SECONDS = 15 * 60
+
+
+def seconds_until_next_rollover(now: Optional[datetime] = None) -> float:
+    current = now or datetime.now(timezone.utc)
+    return ROLLOVER_INTERVAL_SECONDS - current.timestamp() % ROLLOVER_INTERVAL_SECONDS
+
+
+def cache_headers(etag: str, max_age: int) -> Dict[str, str]:
+    # No Last-Modified: creates and deletes change which entry (or how many)
+    # a response holds without moving any updated_at, so If-Modified-Since
+    # could wrongly answer 304. The ETag covers those changes.
+    return {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={max_age}",
+    }
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """Evaluate If-None-Match (weak comparison, as RFC 9110 requires for GET)."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any((tag[2:] if tag.startswith("W/") else tag) == etag for tag in candidates)
+
+
+def not_modified_response(headers: Dict[str, str]) -> Response:
+    return Response(status_code=304, headers=headers)
@@ -1,17 +1,76 @@
-from fastapi import FastAPI
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from app import admission, metrics, profiling, read_model
+from app.auth import admin_cache
+from app.compression import CompressionMiddleware, compressed_cache
+from app.microcache import MicroCacheMiddleware, response_cache
+from app.config import settings
 from app.routers import auth, quiet_time
-from app.database import engine, Base
+from app.database import async_engine, read_async_engine, engine, Base
+from app.rotation import InvalidTimezone, rotation_cache
+from app.serializers import api_response
+from app.shared_cache import shared_cache
+
+logger = logging.getLogger(__name__)
+
+
+# Importing this module never touches the database. The schema is managed
+# out-of-band with `alembic upgrade head`.
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.CREATE_TABLES_ON_STARTUP:
+        # Local development convenience only; it never alters existing tables
+        async with async_engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+    if settings.ADMISSION_CONTROL_ENABLED and admission.total_concurrency() >= admission.pool_capacity():
+        logger.warning(
+            "Admission limits allow %d concurrent requests but the DB pool holds %d connections; "
+            "today's entry may wait for a connection under load",
+            admission.total_concurrency(), admission.pool_capacity()
+        )
+    if settings.SHARED_CACHE_PATH:
+        try:
+            shared_cache.open(
+                settings.SHARED_CACHE_PATH, settings.SHARED_CACHE_SLOTS, settings.SHARED_CACHE_SLOT_BYTES
+            )
+        except OSError:
+            logger.exception("Shared cache unavailable; caching per worker only")
+    refresher = None
+    if settings.READ_MODEL_ENABLED:
+        try:
+            await read_model.load()
+        except Exception:
+            # Serve from the database until the periodic check manages to load it
+            logger.exception("Read model failed to load")
+        refresher = asyncio.create_task(read_model.refresh_periodically())
+    yield
+    if refresher is not None:
+        refresher.cancel()
+    shared_cache.close()
+    await async_engine.dispose()
+    if read_async_engine is not async_engine:
+        await read_async_engine.dispose()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
     title="Quiet Time API",
     description="Backend API for Quiet Time Application",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+# Per route class concurrency and queue limits (innermost, so cache hits and
+# requests waiting on another's render never hold a slot)
+if settings.ADMISSION_CONTROL_ENABLED:
+    app.add_middleware(admission.AdmissionControlMiddleware)
+
+# Short-lived cache for the public reads (inside CORS and compression, so it stores plain bodies)
+if settings.MICRO_CACHE_TTL_SECONDS > 0:
+    app.add_middleware(MicroCacheMiddleware, paths=quiet_time.MICRO_CACHED_PATHS)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -21,11 +80,42 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# gzip/brotli for JSON and NDJSON responses
+app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE)
+
+# Per-request SQL profiling (opt-in) and slow-query logging
+profiling.install(async_engine.sync_engine)
+if read_async_engine is not async_engine:
+    profiling.install(read_async_engine.sync_engine)
+app.add_middleware(profiling.SQLProfilingMiddleware)
+
+# Request, DB, pool, bcrypt and cache metrics (outermost, so it times everything)
+if settings.METRICS_ENABLED:
+    metrics.instrument_engine(async_engine.sync_engine, "async")
+    if read_async_engine is not async_engine:
+        metrics.instrument_engine(read_async_engine.sync_engine, "read")
+    metrics.instrument_engine(engine, "sync")
+    metrics.register_cache("admin", admin_cache)
+    metrics.register_cache("rotation", rotation_cache)
+    metrics.register_cache("compression", compressed_cache)
+    metrics.register_cache("micro", response_cache)
+    if settings.SHARED_CACHE_PATH:
+        metrics.register_cache("shared", shared_cache)
+    if settings.ADMISSION_CONTROL_ENABLED:
+        metrics.register_limiters(admission.limiters.values())
+    app.add_middleware(metrics.MetricsMiddleware)
+
 # Include routers
 app.include_router(auth.router)
 app.include_router(quiet_time.router)
 
 
+# A bad `tz` (see quiet_time.requested_day) fails like the routes' other input errors
+@app.exception_handler(InvalidTimezone)
+async def invalid_timezone(request: Request, exc: InvalidTimezone):
+    return api_response(str(exc), success=False)
+
+
 @app.get("/")
 async def root():
     return {
@@ -39,3 +129,8 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def get_metrics():
+        return Response(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
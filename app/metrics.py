@@ -0,0 +1,307 @@
+"""
+Prometheus metrics without extra dependencies.
+
+A small registry of counters, histograms and scrape-time gauges rendered in
+the Prometheus text format (version 0.0.4) by GET /metrics. Recording is a
+dict lookup, a bisect and a lock, so it stays on in production.
+
+Metrics are per process: with several workers, scrape each one (or run a
+single worker per container).
+"""
+import bisect
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Starlette appends "; charset=utf-8"
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+PASSWORD_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0, 5.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            values = list(self._values.items())
+        for labels, value in values:
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}")
+        return lines
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = HTTP_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (last one is +Inf), sum]
+        self._values: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(labels)
+            if series is None:
+                series = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            values = [(labels, list(counts), total) for labels, (counts, total) in self._values.items()]
+        for labels, counts, total in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = _labels(self.labelnames, labels, f'le="{_number(bound)}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            suffix = _labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{suffix} {_number(total)}")
+            lines.append(f"{self.name}_count{suffix} {cumulative}")
+        return lines
+
+
+class GaugeFunction:
+    """A gauge (or counter) whose samples are read at scrape time."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        collect: Callable[[], Iterable[Tuple[Sequence[str], float]]],
+        labelnames: Sequence[str] = (),
+        kind: str = "gauge"
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.kind = kind
+        self._collect = collect
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for labels, value in self._collect():
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> bytes:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.collect())
+        return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+registry = Registry()
+
+http_requests = registry.register(Counter(
+    "http_requests_total", "HTTP requests by route template and status.", ("method", "route", "status")
+))
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "Time to the last response byte.", ("method", "route")
+))
+http_in_flight = registry.register(Gauge(
+    "http_requests_in_progress", "HTTP requests being served."
+))
+db_query_duration = registry.register(Histogram(
+    "db_query_duration_seconds", "SQL statement execution time by statement type.", ("engine", "operation"), DB_BUCKETS
+))
+db_query_errors = registry.register(Counter(
+    "db_query_errors_total", "SQL statements that raised.", ("engine", "operation")
+))
+password_duration = registry.register(Histogram(
+    "password_hash_duration_seconds", "bcrypt time on the password pool.", ("operation",), PASSWORD_BUCKETS
+))
+
+
+def _operation(statement: str) -> str:
+    word = statement.lstrip().split(None, 1)[:1]
+    return word[0].upper() if word else "OTHER"
+
+
+# (name, engine, checked-out count) for each instrumented engine
+_engines: List[tuple] = []
+# (name, TTLCache) for each registered cache
+_caches: List[tuple] = []
+# app.admission limiters
+_limiters: List = []
+
+
+def _pool_samples():
+    for name, engine, checked_out in _engines:
+        yield (name, "checked_out"), checked_out[0]
+        pool = engine.pool
+        # Only QueuePool has a fixed size and overflow
+        if hasattr(pool, "overflow"):
+            yield (name, "size"), pool.size()
+            yield (name, "overflow"), max(pool.overflow(), 0)
+
+
+def _cache_sizes():
+    for name, cache in _caches:
+        yield (name,), len(cache)
+
+
+def _cache_lookups():
+    for name, cache in _caches:
+        stats = cache.stats()
+        yield (name, "hit"), stats["hits"]
+        yield (name, "miss"), stats["misses"]
+
+
+def _admission_samples():
+    for limiter in _limiters:
+        yield (limiter.name, "active"), limiter.active
+        yield (limiter.name, "queued"), limiter.queue_depth
+
+
+def _admission_rejections():
+    for limiter in _limiters:
+        yield (limiter.name, "queue_full"), limiter.rejected_full
+        yield (limiter.name, "timeout"), limiter.rejected_timeout
+
+
+registry.register(GaugeFunction(
+    "db_pool_connections", "Connection pool state per engine.", _pool_samples, ("engine", "state")
+))
+registry.register(GaugeFunction(
+    "cache_entries", "Entries held by in-process caches.", _cache_sizes, ("cache",)
+))
+registry.register(GaugeFunction(
+    "admission_requests", "Requests holding or waiting for a slot per route class.",
+    _admission_samples, ("class", "state")
+))
+registry.register(GaugeFunction(
+    "admission_rejected_total", "Requests answered 503 per route class and reason.",
+    _admission_rejections, ("class", "reason"), "counter"
+))
+registry.register(GaugeFunction(
+    "cache_lookups_total", "In-process cache lookups by result.", _cache_lookups, ("cache", "result"), "counter"
+))
+
+
+def instrument_engine(engine, name: str) -> None:
+    """Time every statement and track pool checkouts for a sync Engine."""
+    from sqlalchemy import event
+
+    checked_out = [0]
+    _engines.append((name, engine, checked_out))
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context._metrics_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_metrics_started", None)
+        if started is not None:
+            db_query_duration.observe(time.perf_counter() - started, name, _operation(statement))
+
+    @event.listens_for(engine, "handle_error")
+    def _error(exception_context):
+        db_query_errors.inc(name, _operation(exception_context.statement or ""))
+
+    @event.listens_for(engine.pool, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        checked_out[0] += 1
+
+    @event.listens_for(engine.pool, "checkin")
+    def _checkin(dbapi_connection, connection_record):
+        checked_out[0] -= 1
+
+
+def register_cache(name: str, cache) -> None:
+    """Expose a TTLCache's size and hit/miss counts."""
+    _caches.append((name, cache))
+
+
+def register_limiters(limiters) -> None:
+    """Expose admission limiters' in-flight, queue depth and rejection counts."""
+    _limiters.extend(limiters)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording request counts and latency per route
+    template (``/entries/{entry_id}``, not the concrete path), so label
+    cardinality stays bounded.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        http_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_in_flight.dec()
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "<unmatched>"
+            method = scope["method"]
+            http_request_duration.observe(time.perf_counter() - started, method, template)
+            http_requests.inc(method, template, str(status_code))
@@ -0,0 +1,294 @@
+"""
+Micro-cache for the public read routes.
+
+Rendered responses are kept for MICRO_CACHE_TTL_SECONDS. Concurrent misses
+for the same URL share one render (single-flight), and for up to
+MICRO_CACHE_STALE_SECONDS after expiry the old response is served while one
+background render refreshes it. Nothing is kept past the next quarter hour,
+when the daily rotation may move on in some time zone (``tz``).
+
+Writes call ``invalidate()``, which bumps a generation counter: responses
+rendered before it are never served again, not even as stale. The counter is
+per process, so other workers pick up a write within TTL + stale seconds -
+unless the shared cache (app.shared_cache) is open: then the counter lives
+there, a write is seen by every worker at once, and a miss first looks for a
+fresh response another worker already rendered for the same generation.
+
+With a read replica (READ_DATABASE_URL), a render in the first
+READ_REPLICA_LAG_SECONDS of a generation may still see the data from before
+the write, so it is served but not kept (``replica_caught_up``).
+
+The cache sits inside CORS and compression and stores the identity-encoded
+response; If-None-Match is answered from the cached ETag.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+from starlette.requests import Request
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.cache import TTLCache
+from app.config import settings
+from app.http_cache import is_not_modified, not_modified_response, seconds_until_next_rollover
+from app.shared_cache import shared_cache
+
+logger = logging.getLogger(__name__)
+
+CONDITIONAL_HEADERS = (b"if-none-match", b"if-modified-since")
+# Response headers a 304 repeats
+VALIDATOR_HEADERS = ("etag", "cache-control")
+
+
+@dataclass
+class CachedResponse:
+    status: int
+    headers: List[Tuple[bytes, bytes]]
+    body: bytes
+    # The matched route, so outer middlewares still label cache hits
+    route: object
+    generation: int
+    stored_at: float
+    fresh_until: float
+
+    def header(self, name: str) -> Optional[str]:
+        raw = name.encode("latin-1")
+        for key, value in self.headers:
+            if key == raw:
+                return value.decode("latin-1")
+        return None
+
+
+_generation = 0
+# (generation, monotonic time this worker first saw it)
+_seen: Optional[Tuple[int, float]] = None
+# (path, query string) -> CachedResponse
+response_cache = TTLCache(
+    maxsize=settings.MICRO_CACHE_MAX_ENTRIES,
+    ttl=settings.MICRO_CACHE_TTL_SECONDS + settings.MICRO_CACHE_STALE_SECONDS
+)
+# Renders in progress, shared by every request for the same key
+_inflight: Dict[Hashable, "asyncio.Task"] = {}
+# Called with the new generation by invalidate()
+invalidation_hooks: List[Callable[[int], None]] = []
+# Path -> matched route, for responses rendered by another worker
+_routes: Dict[str, object] = {}
+
+
+def current_generation() -> int:
+    global _seen
+    generation = shared_cache.generation() if shared_cache.enabled else _generation
+    if _seen is None:
+        # Whatever was written before this worker started has replicated by now
+        _seen = (generation, float("-inf"))
+    elif _seen[0] != generation:
+        # Seen at or after the write, so the lag is never underestimated
+        _seen = (generation, time.monotonic())
+    return generation
+
+
+def replica_caught_up(generation: int) -> bool:
+    """
+    Whether reads for ``generation`` may be cached: always without a replica,
+    otherwise once READ_REPLICA_LAG_SECONDS have passed since it began.
+    """
+    if not settings.READ_DATABASE_URL:
+        return True
+    if _seen is None or _seen[0] != generation:
+        return False
+    return time.monotonic() - _seen[1] >= settings.READ_REPLICA_LAG_SECONDS
+
+
+def invalidate() -> None:
+    """Call after a write commits; earlier responses are dropped for good."""
+    global _generation
+    if shared_cache.enabled:
+        generation = shared_cache.bump()
+    else:
+        _generation += 1
+        generation = _generation
+    response_cache.clear()
+    for hook in invalidation_hooks:
+        hook(generation)
+
+
+def forget_local() -> None:
+    """
+    Drop this worker's responses after it reloaded content on its own (the
+    read model). Other workers are left alone: a reload is not a write.
+    """
+    if shared_cache.enabled:
+        response_cache.clear()
+    else:
+        invalidate()
+
+
+def _cache_key(scope: Scope) -> tuple:
+    return scope["path"], scope.get("query_string", b"")
+
+
+def _route(scope: Scope) -> object:
+    route = _routes.get(scope["path"])
+    if route is None and "app" in scope:
+        for candidate in scope["app"].router.routes:
+            if candidate.matches(scope)[0] == Match.FULL:
+                route = _routes[scope["path"]] = candidate
+                break
+    return route
+
+
+def _from_shared(scope: Scope, key: tuple, generation: int) -> Optional[CachedResponse]:
+    """A response another worker rendered for this generation, while still fresh."""
+    shared = shared_cache.get(key, generation)
+    if shared is None:
+        return None
+    status, headers, body, stored_at, fresh_until = shared
+    wall_now, now = time.time(), time.monotonic()
+    if wall_now >= fresh_until:
+        return None
+    response = CachedResponse(
+        status=status,
+        headers=headers,
+        body=body,
+        route=_route(scope),
+        generation=generation,
+        stored_at=now - max(wall_now - stored_at, 0),
+        fresh_until=now + fresh_until - wall_now
+    )
+    keep_for = fresh_until - wall_now + settings.MICRO_CACHE_STALE_SECONDS
+    response_cache.set(key, response, ttl=min(keep_for, seconds_until_next_rollover()))
+    return response
+
+
+async def _render(app: ASGIApp, scope: Scope, key: tuple) -> CachedResponse:
+    """Run the route once, unconditionally, and capture the full response."""
+    generation = current_generation()
+    if shared_cache.enabled:
+        response = _from_shared(scope, key, generation)
+        if response is not None:
+            return response
+
+    render_scope = dict(scope)
+    render_scope["headers"] = [
+        (name, value) for name, value in scope["headers"] if name not in CONDITIONAL_HEADERS
+    ]
+    start: Dict[str, object] = {}
+    chunks: List[bytes] = []
+    requested = False
+
+    async def receive() -> Message:
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Nobody disconnects from a render; wait until the app stops listening
+        await asyncio.Event().wait()
+
+    async def send(message: Message) -> None:
+        if message["type"] == "http.response.start":
+            start.update(message)
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(render_scope, receive, send)
+
+    now = time.monotonic()
+    until_rollover = seconds_until_next_rollover()
+    if render_scope.get("route") is not None:
+        _routes[scope["path"]] = render_scope["route"]
+    response = CachedResponse(
+        status=start["status"],
+        headers=[(name, value) for name, value in start.get("headers", []) if name != b"content-length"],
+        body=b"".join(chunks),
+        route=render_scope.get("route"),
+        generation=generation,
+        stored_at=now,
+        fresh_until=now + min(settings.MICRO_CACHE_TTL_SECONDS, until_rollover)
+    )
+    # Only successful responses, and never one rendered before an invalidation
+    # or from a replica that may not have the write yet
+    if (
+        response.status == 200
+        and generation == current_generation()
+        and replica_caught_up(generation)
+        and len(response.body) <= settings.MICRO_CACHE_MAX_BODY_BYTES
+    ):
+        keep_for = settings.MICRO_CACHE_TTL_SECONDS + settings.MICRO_CACHE_STALE_SECONDS
+        response_cache.set(key, response, ttl=min(keep_for, until_rollover))
+        shared_cache.put(
+            key, generation, response.status, response.headers, response.body,
+            fresh_for=response.fresh_until - now
+        )
+    return response
+
+
+def _log_failure(task: "asyncio.Task") -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Background refresh failed", exc_info=task.exception())
+
+
+def _start_render(app: ASGIApp, scope: Scope, key: tuple) -> "asyncio.Task":
+    """The render for ``key`` already in flight, or a new one."""
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_render(app, scope, key))
+        _inflight[key] = task
+        task.add_done_callback(lambda done: _inflight.pop(key, None))
+    return task
+
+
+class MicroCacheMiddleware:
+    """Pure ASGI middleware caching GET responses for the given paths."""
+
+    def __init__(self, app: ASGIApp, paths: Iterable[str]):
+        self.app = app
+        self.paths = frozenset(paths)
+
+    def _cacheable(self, scope: Scope) -> bool:
+        return (
+            scope["type"] == "http"
+            and scope["method"] == "GET"
+            and scope["path"] in self.paths
+            # Streamed lists are too large to buffer
+            and b"stream=" not in scope.get("query_string", b"")
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if not self._cacheable(scope):
+            await self.app(scope, receive, send)
+            return
+
+        key = _cache_key(scope)
+        cached = response_cache.get(key)
+        if cached is not None and cached.generation == current_generation():
+            if time.monotonic() >= cached.fresh_until and key not in _inflight:
+                # Stale: answer now, refresh once in the background
+                _start_render(self.app, scope, key).add_done_callback(_log_failure)
+            await self._replay(cached, scope, receive, send)
+            return
+
+        # The render outlives this request if the client goes away,
+        # so the other requests waiting on it still get a response
+        response = await asyncio.shield(_start_render(self.app, scope, key))
+        await self._replay(response, scope, receive, send)
+
+    @staticmethod
+    async def _replay(cached: CachedResponse, scope: Scope, receive: Receive, send: Send) -> None:
+        if cached.route is not None:
+            scope["route"] = cached.route
+
+        etag = cached.header("etag")
+        if cached.status == 200 and etag:
+            if is_not_modified(Request(scope), etag):
+                headers = {name: cached.header(name) for name in VALIDATOR_HEADERS if cached.header(name)}
+                await not_modified_response(headers)(scope, receive, send)
+                return
+
+        age = int(time.monotonic() - cached.stored_at)
+        headers = cached.headers + [
+            (b"content-length", str(len(cached.body)).encode("latin-1")),
+            (b"age", str(age).encode("latin-1")),
+        ]
+        await send({"type": "http.response.start", "status": cached.status, "headers": headers})
+        await send({"type": "http.response.body", "body": cached.body})
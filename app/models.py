@@ -1,7 +1,40 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index, DDL, event
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.sql import func
+from sqlalchemy.sql.expression import FunctionElement
 from app.database import Base
 
+# SQLite's CURRENT_TIMESTAMP has no fractional seconds. Bind timestamps in the
+# same text format, otherwise equal values compare unequal (keyset cursors).
+Timestamp = DateTime(timezone=True).with_variant(
+    sqlite.DATETIME(
+        storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"
+    ),
+    "sqlite"
+)
+
+
+class change_timestamp(FunctionElement):
+    """
+    When the statement runs, for the columns delta sync orders by.
+    PostgreSQL's now() is the start of the transaction, which can be long
+    before the row commits; clock_timestamp() is not.
+    """
+    type = DateTime(timezone=True)
+    inherit_cache = True
+
+
+@compiles(change_timestamp)
+def _change_timestamp(element, compiler, **kw):
+    # SQLite evaluates CURRENT_TIMESTAMP per statement already
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(change_timestamp, "postgresql")
+def _change_timestamp_postgresql(element, compiler, **kw):
+    return "clock_timestamp()"
+
 
 class Admin(Base):
     __tablename__ = "admins"
@@ -22,6 +55,93 @@ class QuietTimeEntry(Base):
     scripture_text = Column(Text, nullable=False)
     prayer_title = Column(String(255), nullable=False)
     prayer_content = Column(Text, nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # 0-based, gap-free slot in the daily rotation (creation order)
+    rotation_position = Column(Integer, unique=True, index=True, nullable=False)
+    created_at = Column(Timestamp, server_default=func.now())
+    updated_at = Column(Timestamp, server_default=change_timestamp(), onupdate=change_timestamp())
+
+    __table_args__ = (
+        # Keyset pagination order for GET /entries
+        Index("ix_quiet_time_entries_created_at_id", "created_at", "id"),
+        # Delta sync order for GET /entries/changes
+        Index("ix_quiet_time_entries_updated_at_id", "updated_at", "id"),
+    )
+
+
+class EntryTombstone(Base):
+    """A deleted entry, kept so sync clients can observe the deletion."""
+    __tablename__ = "quiet_time_entry_tombstones"
+    
+    entry_id = Column(Integer, primary_key=True, autoincrement=False)
+    deleted_at = Column(Timestamp, server_default=change_timestamp(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_quiet_time_entry_tombstones_deleted_at_entry_id", "deleted_at", "entry_id"),
+    )
+
+
+# Full-text search index, maintained by the database itself on every write.
+# PostgreSQL: a generated, weighted tsvector column with a GIN index.
+# SQLite (local/testing): an external-content FTS5 table kept in sync by triggers.
+SEARCH_COLUMNS = ("song_title", "scripture_reference", "scripture_text", "prayer_title", "prayer_content")
+SEARCH_FTS_TABLE = "quiet_time_entries_fts"
+
+POSTGRES_SEARCH_DDL = (
+    """
+    ALTER TABLE quiet_time_entries ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(song_title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(scripture_reference, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(prayer_title, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(scripture_text, '')), 'C') ||
+        setweight(to_tsvector('english', coalesce(prayer_content, '')), 'C')
+    ) STORED
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_quiet_time_entries_search
+    ON quiet_time_entries USING GIN (search_vector)
+    """,
+)
+
+_fts_columns = ", ".join(SEARCH_COLUMNS)
+_fts_new = ", ".join(f"new.{column}" for column in SEARCH_COLUMNS)
+_fts_old = ", ".join(f"old.{column}" for column in SEARCH_COLUMNS)
+SQLITE_SEARCH_DDL = (
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_FTS_TABLE} USING fts5(
+        {_fts_columns},
+        content='quiet_time_entries', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_FTS_TABLE}_ai AFTER INSERT ON quiet_time_entries BEGIN
+        INSERT INTO {SEARCH_FTS_TABLE}(rowid, {_fts_columns}) VALUES (new.id, {_fts_new});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_FTS_TABLE}_ad AFTER DELETE ON quiet_time_entries BEGIN
+        INSERT INTO {SEARCH_FTS_TABLE}({SEARCH_FTS_TABLE}, rowid, {_fts_columns})
+        VALUES ('delete', old.id, {_fts_old});
+    END
+    """,
+    # Only text changes touch the index; rotation moves don't
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_FTS_TABLE}_au AFTER UPDATE OF {_fts_columns}
+    ON quiet_time_entries BEGIN
+        INSERT INTO {SEARCH_FTS_TABLE}({SEARCH_FTS_TABLE}, rowid, {_fts_columns})
+        VALUES ('delete', old.id, {_fts_old});
+        INSERT INTO {SEARCH_FTS_TABLE}(rowid, {_fts_columns}) VALUES (new.id, {_fts_new});
+    END
+    """,
+)
 
+for _statement in POSTGRES_SEARCH_DDL:
+    event.listen(QuietTimeEntry.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+for _statement in SQLITE_SEARCH_DDL:
+    event.listen(QuietTimeEntry.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+# The FTS table isn't part of the metadata, so drop it alongside its content table
+event.listen(
+    QuietTimeEntry.__table__,
+    "after_drop",
+    DDL(f"DROP TABLE IF EXISTS {SEARCH_FTS_TABLE}").execute_if(dialect="sqlite")
+)
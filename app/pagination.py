@@ -0,0 +1,32 @@
+"""
+Opaque keyset cursors.
+
+A cursor is the sort key of the last row on a page, so fetching the next
+page is an index range scan that costs the same at any depth.
+"""
+import base64
+import json
+from datetime import datetime, timezone
+from typing import Tuple
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(timestamp: datetime, entry_id: int) -> str:
+    raw = json.dumps([timestamp.isoformat(), entry_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, entry_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        after = datetime.fromisoformat(timestamp)
+        if after.tzinfo is not None:
+            # Compared in UTC (see read_model); fails near datetime's limits
+            after.astimezone(timezone.utc)
+        return after, int(entry_id)
+    except (ValueError, TypeError, UnicodeError, OverflowError) as e:
+        raise InvalidCursor("Invalid cursor") from e
@@ -0,0 +1,180 @@
+"""
+Per-request SQL profiling.
+
+When profiling is on for a request (SQL_PROFILING for every request, or the
+``X-DB-Profile: 1`` header when SQL_PROFILING_HEADER is allowed) every
+statement it issues is recorded with its duration and row count. The
+response then carries ``X-DB-Query-Count``, ``X-DB-Time-ms``, ``X-DB-Rows``
+and ``Server-Timing``, and the statements are logged at DEBUG.
+
+Independently of that, any statement slower than SLOW_QUERY_MS is logged
+with the *shape* of its parameters (types only, never values), and a
+profiled request that runs the same statement SQL_REPEATED_QUERY_THRESHOLD
+times or more is logged as a likely N+1.
+
+Headers are added when the response starts, so for streamed responses
+they cover the queries made before the first byte.
+"""
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, List, Optional
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "x-db-profile"
+
+
+@dataclass
+class QueryRecord:
+    statement: str
+    duration: float
+    # Rows returned (or affected); None when streamed from a server-side cursor
+    rows: Optional[int]
+    parameters: Any
+
+
+@dataclass
+class RequestProfile:
+    queries: List[QueryRecord] = field(default_factory=list)
+
+    @property
+    def total_time(self) -> float:
+        return sum(query.duration for query in self.queries)
+
+    @property
+    def total_rows(self) -> int:
+        return sum(query.rows or 0 for query in self.queries)
+
+    def repeated(self, threshold: int) -> List[tuple]:
+        """(statement, times) for statements run at least ``threshold`` times."""
+        counts = Counter(query.statement for query in self.queries)
+        return [(statement, times) for statement, times in counts.most_common() if times >= threshold]
+
+    def headers(self) -> dict:
+        total_ms = self.total_time * 1000
+        return {
+            "X-DB-Query-Count": str(len(self.queries)),
+            "X-DB-Time-ms": f"{total_ms:.2f}",
+            "X-DB-Rows": str(self.total_rows),
+            "Server-Timing": f"db;dur={total_ms:.2f};desc=\"{len(self.queries)} queries\"",
+        }
+
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("sql_profile", default=None)
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> Any:
+    """Types instead of values, e.g. ``{'id_1': 'int'}`` or ``['str', 'int'] x 500``."""
+    if executemany and isinstance(parameters, (list, tuple)) and parameters:
+        return f"{parameter_shape(parameters[0])} x {len(parameters)}"
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def _row_count(cursor, context) -> Optional[int]:
+    if context.execution_options.get("stream_results"):
+        return None
+    # The asyncpg and aiosqlite adapters buffer result rows on the cursor
+    rows = getattr(cursor, "_rows", None)
+    if rows is not None and getattr(cursor, "description", None):
+        return len(rows)
+    rowcount = getattr(cursor, "rowcount", -1)
+    return rowcount if rowcount is not None and rowcount >= 0 else None
+
+
+def _one_line(statement: str) -> str:
+    return " ".join(statement.split())
+
+
+def install(engine) -> None:
+    """Record statements for profiled requests and log slow ones, for a sync Engine."""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context._profile_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_profile_started", None)
+        if started is None:
+            return
+        duration = time.perf_counter() - started
+        profile = _current_profile.get()
+        slow = settings.SLOW_QUERY_MS > 0 and duration * 1000 >= settings.SLOW_QUERY_MS
+        if profile is None and not slow:
+            return
+
+        record = QueryRecord(
+            statement=_one_line(statement),
+            duration=duration,
+            rows=_row_count(cursor, context),
+            parameters=parameter_shape(parameters, executemany)
+        )
+        if profile is not None:
+            profile.queries.append(record)
+        if slow:
+            logger.warning(
+                "Slow query (%.1f ms, %s rows): %s -- parameters: %s",
+                duration * 1000, record.rows, record.statement, record.parameters
+            )
+
+
+def _profiling_requested(scope: Scope) -> bool:
+    if settings.SQL_PROFILING:
+        return True
+    if not settings.SQL_PROFILING_HEADER:
+        return False
+    return Headers(scope=scope).get(PROFILE_HEADER, "").lower() in ("1", "true", "yes")
+
+
+class SQLProfilingMiddleware:
+    """Pure ASGI middleware that opens a RequestProfile for opted-in requests."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not _profiling_requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=message["headers"])
+                for name, value in profile.headers().items():
+                    headers[name] = value
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_profile.reset(token)
+            self._log(scope, profile)
+
+    @staticmethod
+    def _log(scope: Scope, profile: RequestProfile) -> None:
+        route = getattr(scope.get("route"), "path", scope["path"])
+        logger.info(
+            "%s %s: %d queries, %.2f ms, %d rows",
+            scope["method"], route, len(profile.queries), profile.total_time * 1000, profile.total_rows
+        )
+        for query in profile.queries:
+            logger.debug(
+                "  %.2f ms, %s rows: %s -- parameters: %s",
+                query.duration * 1000, query.rows, query.statement, query.parameters
+            )
+        for statement, times in profile.repeated(settings.SQL_REPEATED_QUERY_THRESHOLD):
+            logger.warning("Possible N+1 on %s %s: ran %d times: %s", scope["method"], route, times, statement)
@@ -0,0 +1,286 @@
+"""
+In-process read model of the entry library (optional, READ_MODEL_ENABLED).
+
+The whole library is loaded at startup into compact ``__slots__`` records
+holding each entry's JSON already encoded, in full and summary form, kept in
+rotation order and in list order. While it is loaded, today's entry, the
+rotation routes and GET /entries (summary or full fields) are answered
+without any SQL; other routes and field selections still use the database.
+
+Admin writes in this worker apply their change after commit. Every
+READ_MODEL_REFRESH_SECONDS a one-row version check (index-only maxima plus the
+latest tombstone) catches writes from other workers and out-of-band changes,
+and reloads the library when the version moved. Versions younger than
+SYNC_SETTLE_SECONDS are not trusted (timestamps can tie), so the check
+reloads again until they settle.
+
+The model also records the micro-cache generation it is current for. When
+another worker's write moves the shared generation (app.shared_cache), the
+model is set aside and the database answers until the next check reloads it.
+"""
+import asyncio
+import bisect
+import logging
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+from fastapi import Response
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import microcache
+from app.changes import settled_before
+from app.config import settings
+from app.database import ReadSessionLocal
+from app.http_cache import as_utc
+from app.models import EntryTombstone, QuietTimeEntry
+from app.serializers import SUMMARY_FIELDS, dumps, entry_to_dict, fields_to_dict, select_entries
+
+logger = logging.getLogger(__name__)
+
+# Ids re-read per statement after a write
+RELOAD_CHUNK_SIZE = 500
+
+
+def _encode(content: Any) -> bytes:
+    # orjson hands back an over-allocated buffer (1 KB or more even for a
+    # short summary); copying it keeps only the bytes actually used
+    return bytes(memoryview(dumps(content)))
+
+
+class EntryRecord:
+    __slots__ = ("id", "created_at", "updated_at", "full", "summary")
+
+    def __init__(self, row: Any):
+        self.id = row.id
+        self.created_at = row.created_at
+        self.updated_at = row.updated_at
+        self.full = _encode(entry_to_dict(row))
+        self.summary = _encode(fields_to_dict(row, SUMMARY_FIELDS))
+
+    @property
+    def list_key(self) -> tuple:
+        return self.created_at, self.id
+
+    @property
+    def sort_key(self) -> tuple:
+        # Compared in UTC: a cursor may carry either the naive or the aware form
+        return as_utc(self.created_at), self.id
+
+
+class ReadModel:
+    def __init__(self, rows: Iterable[Any], version: tuple, generation: int):
+        # Rows arrive in rotation order, so a record's index is its position
+        self.by_position: List[EntryRecord] = [EntryRecord(row) for row in rows]
+        self.by_id: Dict[int, EntryRecord] = {record.id: record for record in self.by_position}
+        self._sort()
+        self.version = version
+        self.generation = generation
+        # Bumped by local writes; a reload started before one is discarded
+        self.revision = 0
+        # Set when a local write could not be applied cleanly
+        self.dirty = False
+
+    def _sort(self) -> None:
+        # GET /entries order is newest first; kept ascending for bisect
+        self.by_created = sorted(self.by_position, key=lambda record: record.sort_key)
+        self._created_keys = [record.sort_key for record in self.by_created]
+        self.last_updated = max(
+            (record.updated_at for record in self.by_position if record.updated_at is not None),
+            default=None
+        )
+
+    def __len__(self) -> int:
+        return len(self.by_position)
+
+    def at_position(self, position: int) -> Optional[EntryRecord]:
+        if 0 <= position < len(self.by_position):
+            return self.by_position[position]
+        return None
+
+    def page(self, limit: Optional[int], after: Optional[Tuple[Any, int]]) -> Tuple[List[EntryRecord], bool]:
+        """Records newest first, strictly after the ``after`` key; and whether more remain."""
+        if after is None:
+            end = len(self.by_created)
+        else:
+            end = bisect.bisect_left(self._created_keys, (as_utc(after[0]), after[1]))
+        start = 0 if limit is None else max(end - limit, 0)
+        return self.by_created[start:end][::-1], start > 0
+
+    def _position_of(self, record: EntryRecord, position: int) -> int:
+        if 0 <= position < len(self.by_position) and self.by_position[position] is record:
+            return position
+        # Out of step with the database; find it the slow way and reload soon
+        self.dirty = True
+        return self.by_position.index(record)
+
+    def _list(self, record: EntryRecord) -> None:
+        key = record.sort_key
+        index = bisect.bisect_left(self._created_keys, key)
+        self._created_keys.insert(index, key)
+        self.by_created.insert(index, record)
+
+    def _unlist(self, record: EntryRecord) -> None:
+        index = bisect.bisect_left(self._created_keys, record.sort_key)
+        if index < len(self.by_created) and self.by_created[index] is record:
+            del self._created_keys[index]
+            del self.by_created[index]
+        else:
+            self.dirty = True
+            index = self.by_created.index(record)
+            del self._created_keys[index]
+            del self.by_created[index]
+
+    def upsert(self, rows: Iterable[Any]) -> None:
+        """Apply created or updated rows in place, without re-sorting."""
+        for row in rows:
+            record = EntryRecord(row)
+            existing = self.by_id.get(record.id)
+            if existing is not None:
+                self.by_position[self._position_of(existing, row.rotation_position)] = record
+                self._unlist(existing)
+            elif row.rotation_position == len(self.by_position):
+                self.by_position.append(record)
+            else:
+                # Only appends are expected; anything else needs a reload
+                self.dirty = True
+                self.by_position.insert(min(row.rotation_position, len(self.by_position)), record)
+            self.by_id[record.id] = record
+            self._list(record)
+            if record.updated_at is not None and (self.last_updated is None or record.updated_at > self.last_updated):
+                self.last_updated = record.updated_at
+        self.revision += 1
+
+    def remove(self, positions: Mapping[int, int]) -> None:
+        """
+        Drop deleted entries, given as id -> the position they had. Later
+        entries move down, as close_gaps() does in the database.
+        """
+        removed = False
+        # Highest first, so the positions still to go stay valid
+        for entry_id, position in sorted(positions.items(), key=lambda item: item[1], reverse=True):
+            record = self.by_id.pop(entry_id, None)
+            if record is None:
+                continue
+            del self.by_position[self._position_of(record, position)]
+            self._unlist(record)
+            removed = True
+        # last_updated only grows: the ETag still changes with the count
+        if removed:
+            self.revision += 1
+
+
+# Set by load(); None while disabled or before the first successful load
+store: Optional[ReadModel] = None
+
+
+def active() -> Optional[ReadModel]:
+    if store is not None and store.generation == microcache.current_generation():
+        return store
+    return None
+
+
+def _caught_up(generation: int) -> None:
+    # Local writes reach the model before invalidate(), so it is current
+    # unless another worker wrote in between
+    if store is not None and store.generation == generation - 1:
+        store.generation = generation
+
+
+microcache.invalidation_hooks.append(_caught_up)
+
+
+def envelope(message: str, data: bytes, headers: Optional[Dict[str, str]] = None) -> Response:
+    """The APIResponse envelope around an already encoded ``data`` value."""
+    body = b'{"success":true,"message":' + dumps(message) + b',"data":' + data + b"}"
+    return Response(body, media_type="application/json", headers=headers)
+
+
+def json_array(fragments: Iterable[bytes]) -> bytes:
+    return b"[" + b",".join(fragments) + b"]"
+
+
+async def read_version(db: AsyncSession) -> tuple:
+    """Index-only maxima that move on any insert, update or delete."""
+    return tuple((await db.execute(
+        select(
+            func.max(QuietTimeEntry.rotation_position),
+            func.max(QuietTimeEntry.id),
+            func.max(QuietTimeEntry.updated_at),
+            select(func.max(EntryTombstone.deleted_at)).scalar_subquery()
+        )
+    )).one())
+
+
+def _settled(version: tuple) -> bool:
+    cutoff = settled_before()
+    return all(timestamp is None or as_utc(timestamp) <= cutoff for timestamp in version[2:])
+
+
+async def _build() -> ReadModel:
+    generation = microcache.current_generation()
+    async with ReadSessionLocal() as db:
+        # Version first: a write landing in between only causes one extra reload
+        version = await read_version(db)
+        rows = (await db.execute(select_entries().order_by(QuietTimeEntry.rotation_position))).all()
+    return ReadModel(rows, version, generation)
+
+
+async def load() -> None:
+    global store
+    started_revision = store.revision if store is not None else None
+    model = await _build()
+    if store is not None and store.revision != started_revision:
+        # A local write landed while loading; keep it and try again next time
+        store.dirty = True
+        return
+    store = model
+    microcache.forget_local()
+    logger.info("Read model loaded: %d entries", len(model))
+
+
+async def check() -> None:
+    """Reload when the database moved on since the last load."""
+    if store is None:
+        await load()
+        return
+    async with ReadSessionLocal() as db:
+        version = await read_version(db)
+    if (
+        store.dirty
+        or version != store.version
+        or store.generation != microcache.current_generation()
+        or not _settled(version)
+    ):
+        await load()
+
+
+async def refresh_periodically() -> None:
+    while True:
+        await asyncio.sleep(settings.READ_MODEL_REFRESH_SECONDS)
+        try:
+            await check()
+        except Exception:
+            logger.exception("Read model refresh failed")
+
+
+def saved(rows: Iterable[Any]) -> None:
+    """Apply entries created or updated by this worker (ORM objects or rows)."""
+    if store is not None:
+        store.upsert(rows)
+
+
+async def saved_ids(db: AsyncSession, entry_ids: List[int]) -> None:
+    """Like saved(), re-reading the rows by id (bulk and batch writes)."""
+    if store is None or not entry_ids:
+        return
+    for start in range(0, len(entry_ids), RELOAD_CHUNK_SIZE):
+        chunk = entry_ids[start:start + RELOAD_CHUNK_SIZE]
+        store.upsert((await db.execute(
+            select_entries(QuietTimeEntry.rotation_position)
+            .filter(QuietTimeEntry.id.in_(chunk))
+            .order_by(QuietTimeEntry.rotation_position)
+        )).all())
+
+
+def deleted(positions: Mapping[int, int]) -> None:
+    """Apply deletions by this worker, as entry id -> former rotation position."""
+    if store is not None:
+        store.remove(positions)
@@ -0,0 +1,279 @@
+"""
+Daily rotation helpers.
+
+Every entry owns a 0-based, gap-free ``rotation_position`` in creation order,
+so picking today's entry is a single indexed lookup instead of loading the
+whole table. Creates append at the end and deletes close the gap in the same
+transaction.
+
+Days are calendar days in the caller's time zone (UTC by default): every
+route turns ``tz`` into a LocalDay with local_day(), and the rotation day is
+that date's distance from REFERENCE_DATE.
+"""
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone, tzinfo
+from functools import lru_cache
+from typing import Iterable, Optional
+from sqlalchemy import func, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import microcache, read_model
+from app.cache import TTLCache
+from app.config import settings
+from app.models import QuietTimeEntry
+
+try:
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+except ImportError:  # Python 3.8: UTC offsets only
+    ZoneInfo = None
+
+# Fixed reference date for consistent daily rotation
+REFERENCE_DATE = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+# "+05:30", "-0800", "+9", "UTC-03:00"; an unescaped "+" arrives as a space
+UTC_OFFSET = re.compile(r"^(?:UTC|GMT)?\s*([+-]?)(\d{1,2})(?::?(\d{2}))?$", re.IGNORECASE)
+
+
+class InvalidTimezone(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class RotationState:
+    day: int
+    total_entries: int
+    # 0-based slot shown today (0 when there are no entries)
+    position: int
+    entry_id: Optional[int]
+
+    @property
+    def is_last(self) -> bool:
+        return self.total_entries > 0 and self.position == self.total_entries - 1
+
+    @property
+    def remaining(self) -> int:
+        """Entries (and days) left in the cycle after today's."""
+        if self.total_entries == 0:
+            return 0
+        return self.total_entries - self.position - 1
+
+
+# Key for the PostgreSQL advisory lock that serializes position changes
+ROTATION_LOCK_ID = 517417
+
+# Rotation state per (local rotation day, content generation), shared by every time zone
+# on that date; writes invalidate it, other workers catch up within the TTL, or at once
+# when the shared cache carries the generation
+rotation_cache = TTLCache(maxsize=8, ttl=settings.ROTATION_CACHE_TTL_SECONDS)
+
+
+@dataclass(frozen=True)
+class LocalDay:
+    """A calendar day in some time zone; ``start`` and ``end`` are in UTC."""
+    index: int
+    date: date
+    start: datetime
+    end: datetime
+
+    def seconds_left(self, now: Optional[datetime] = None) -> int:
+        current = now or datetime.now(timezone.utc)
+        return max(int((self.end - current).total_seconds()), 0)
+
+
+@lru_cache(maxsize=256)
+def parse_timezone(value: Optional[str]) -> tzinfo:
+    """
+    The ``tz`` parameter: an IANA name ("America/New_York") or a UTC offset
+    ("+05:30", "-0800"). UTC when omitted.
+    """
+    value = (value or "").strip()
+    if value.upper() in ("", "Z", "UTC", "GMT"):
+        return timezone.utc
+    match = UTC_OFFSET.match(value)
+    if match:
+        sign, hours, minutes = match.groups()
+        offset = timedelta(hours=int(hours), minutes=int(minutes or 0))
+        if offset > timedelta(hours=14) or int(minutes or 0) >= 60:
+            raise InvalidTimezone(f"UTC offset out of range: {value}")
+        # Cached responses expire at quarter hours (http_cache.ROLLOVER_INTERVAL_SECONDS),
+        # which is when a day can start in any real time zone
+        if int(minutes or 0) % 15:
+            raise InvalidTimezone(f"UTC offset must be a whole number of quarter hours: {value}")
+        return timezone(-offset if sign == "-" else offset)
+    if ZoneInfo is None:
+        raise InvalidTimezone("Time zone names need Python 3.9+; pass a UTC offset such as +05:30")
+    try:
+        return ZoneInfo(value)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise InvalidTimezone(f"Unknown time zone: {value}")
+
+
+def _midnight(on: date, zone: tzinfo) -> datetime:
+    return datetime.combine(on, time(), tzinfo=zone).astimezone(timezone.utc)
+
+
+def day_index(on: date) -> int:
+    """Rotation day for a calendar date."""
+    return (on - REFERENCE_DATE.date()).days
+
+
+def local_day(zone: tzinfo = timezone.utc, now: Optional[datetime] = None) -> LocalDay:
+    """The current day in ``zone``; the only place rotation days are derived from the clock."""
+    on = (now or datetime.now(timezone.utc)).astimezone(zone).date()
+    return LocalDay(
+        index=day_index(on),
+        date=on,
+        start=_midnight(on, zone),
+        end=_midnight(on + timedelta(days=1), zone)
+    )
+
+
+async def get_rotation_state(db: AsyncSession, today: Optional[LocalDay] = None) -> RotationState:
+    """
+    The rotation on ``today`` (default: the current UTC day), from one
+    statement that reads only the position index: the entry count and the id
+    at ``day % count``. No SQL at all while the read model is loaded.
+    """
+    day = (today or local_day()).index
+    model = read_model.active()
+    if model is not None:
+        total_entries = len(model)
+        position = day % total_entries if total_entries else 0
+        record = model.at_position(position)
+        return RotationState(
+            day=day,
+            total_entries=total_entries,
+            position=position,
+            entry_id=record.id if record is not None else None
+        )
+    generation = microcache.current_generation()
+    cache_key = (day, generation)
+    state = rotation_cache.get(cache_key)
+    if state is not None:
+        return state
+
+    total = select(
+        func.coalesce(func.max(QuietTimeEntry.rotation_position) + 1, 0).label("total")
+    ).subquery()
+    total_entries, entry_id = (await db.execute(
+        select(total.c.total, QuietTimeEntry.id)
+        .select_from(total)
+        .outerjoin(
+            QuietTimeEntry,
+            # NULLIF keeps an empty library from dividing by zero
+            QuietTimeEntry.rotation_position == literal(day) % func.nullif(total.c.total, 0)
+        )
+    )).one()
+
+    state = RotationState(
+        day=day,
+        total_entries=total_entries,
+        position=day % total_entries if total_entries else 0,
+        entry_id=entry_id
+    )
+    if microcache.replica_caught_up(generation):
+        rotation_cache.set(cache_key, state)
+    return state
+
+
+def invalidate_rotation_state() -> None:
+    rotation_cache.clear()
+
+
+async def count_entries(db: AsyncSession) -> int:
+    """
+    Number of entries in the rotation.
+    Positions are gap-free, so this is MAX(position) + 1 - an index lookup
+    rather than a table scan.
+    """
+    max_position = await db.scalar(select(func.max(QuietTimeEntry.rotation_position)))
+    return 0 if max_position is None else max_position + 1
+
+
+async def lock_rotation(db: AsyncSession) -> None:
+    """
+    Serialize writes that assign or shift positions until the transaction
+    ends; otherwise two concurrent creates read the same MAX(position).
+    """
+    if db.bind.dialect.name == "postgresql":
+        await db.execute(select(func.pg_advisory_xact_lock(ROTATION_LOCK_ID)))
+    else:
+        # Any write statement holds SQLite's database write lock until commit
+        await db.execute(
+            update(QuietTimeEntry)
+            .where(QuietTimeEntry.id.is_(None))
+            .values(rotation_position=QuietTimeEntry.rotation_position)
+            .execution_options(synchronize_session=False)
+        )
+
+
+async def next_position(db: AsyncSession) -> int:
+    """The position for a new entry; takes the rotation lock first."""
+    await lock_rotation(db)
+    return await count_entries(db)
+
+
+async def close_gap(db: AsyncSession, position: int) -> None:
+    """
+    Shift every entry after ``position`` down by one.
+    Done in two steps (negate, then flip back) so the unique index never
+    sees two rows with the same position mid-statement. ``updated_at`` is
+    kept as-is because moving in the rotation is not a content change.
+    """
+    await db.execute(
+        update(QuietTimeEntry)
+        .where(QuietTimeEntry.rotation_position > position)
+        .values(
+            rotation_position=-QuietTimeEntry.rotation_position,
+            updated_at=QuietTimeEntry.updated_at
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await db.execute(
+        update(QuietTimeEntry)
+        .where(QuietTimeEntry.rotation_position < 0)
+        .values(
+            rotation_position=-QuietTimeEntry.rotation_position - 1,
+            updated_at=QuietTimeEntry.updated_at
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def close_gaps(db: AsyncSession, positions: Iterable[int]) -> None:
+    """
+    Renumber after deleting the entries at ``positions``: every entry past the
+    first gap moves to its rank among the remaining entries. One window-function
+    UPDATE ... FROM (PostgreSQL, SQLite 3.33+), with the same negate-then-flip
+    steps as close_gap.
+    """
+    positions = sorted(set(positions))
+    if not positions:
+        return
+    if len(positions) == 1:
+        await close_gap(db, positions[0])
+        return
+
+    first = positions[0]
+    ranked = select(
+        QuietTimeEntry.id.label("id"),
+        (func.row_number().over(order_by=QuietTimeEntry.rotation_position) - 1).label("ordinal")
+    ).where(QuietTimeEntry.rotation_position > first).subquery()
+    await db.execute(
+        update(QuietTimeEntry)
+        .where(QuietTimeEntry.id == ranked.c.id)
+        .values(
+            rotation_position=-(first + ranked.c.ordinal) - 1,
+            updated_at=QuietTimeEntry.updated_at
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await db.execute(
+        update(QuietTimeEntry)
+        .where(QuietTimeEntry.rotation_position < 0)
+        .values(
+            rotation_position=-QuietTimeEntry.rotation_position - 1,
+            updated_at=QuietTimeEntry.updated_at
+        )
+        .execution_options(synchronize_session=False)
+    )
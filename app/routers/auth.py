@@ -1,6 +1,6 @@
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.schemas import LoginRequest, APIResponse, LoginData, UserResponse
 from app.auth import authenticate_admin, create_access_token
@@ -10,11 +10,11 @@ router = APIRouter(prefix="/api/v1/auth", tags=["authentication"])
 
 
 @router.post("/login", response_model=APIResponse)
-async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
+async def login(login_data: LoginRequest, db: AsyncSession = Depends(get_db)):
     """
     Admin login endpoint
     """
-    admin = authenticate_admin(db, login_data.username, login_data.password)
+    admin = await authenticate_admin(db, login_data.username, login_data.password)
     
     if not admin:
         return APIResponse(
@@ -1,10 +1,18 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.database import get_db
+from datetime import date, timedelta
+from typing import Any, List, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import and_, bindparam, delete, func, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.database import get_db, get_read_db, ReadSessionLocal
 from app.schemas import (
     QuietTimeEntryCreate,
     QuietTimeEntryResponse,
+    QuietTimeEntryPatch,
+    QuietTimeEntryBatchUpdate,
+    QuietTimeEntryBatchDelete,
     APIResponse,
     SongSchema,
     ScriptureSchema,
@@ -12,14 +20,104 @@ from app.schemas import (
 )
 from app.models import QuietTimeEntry, Admin
 from app.auth import get_current_admin
+from app.rotation import (
+    day_index,
+    local_day,
+    LocalDay,
+    RotationState,
+    parse_timezone,
+    get_rotation_state,
+    invalidate_rotation_state,
+    next_position,
+    lock_rotation,
+    close_gap,
+    close_gaps
+)
+from app.http_cache import (
+    make_etag,
+    cache_headers,
+    is_not_modified,
+    not_modified_response,
+    seconds_until_utc_midnight
+)
+from app.pagination import encode_cursor, decode_cursor, InvalidCursor
+from app.changes import read_changes, record_deletions, clear_tombstones, restamp
+from app import microcache, read_model
+from app.search import search_query, search_terms
+from app.cache import TTLCache
+from app.serializers import (
+    api_response,
+    dumps,
+    entry_to_dict,
+    fields_to_dict,
+    parse_fields,
+    select_entries,
+    select_fields,
+    UnknownField,
+    ALL_FIELDS,
+    ENTRY_FIELDS,
+    SUMMARY_FIELDS
+)
+from app.streaming import (
+    ndjson_lines,
+    json_envelope,
+    iter_ndjson,
+    iter_json_array,
+    MalformedJSON,
+    NDJSON_MEDIA_TYPE
+)
 
 router = APIRouter(prefix="/api/v1/quiet-time", tags=["quiet-time"])
 
+# Public reads served through app.microcache; every write below invalidates it
+MICRO_CACHED_PATHS = tuple(
+    f"{router.prefix}{path}"
+    for path in (
+        "/entries",
+        "/entries/today",
+        "/entries/schedule",
+        "/entries/rotation/status",
+        "/entries/rotation/days-remaining",
+        "/entries/rotation/entries-remaining",
+    )
+)
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+# Rows fetched per round trip from the server-side cursor when streaming
+STREAM_BATCH_SIZE = 500
+# Per-item errors listed in a bulk import response (the count is always exact)
+MAX_REPORTED_ERRORS = 100
+MAX_SCHEDULE_DAYS = 366
+MAX_SEARCH_QUERY_LENGTH = 200
+DEFAULT_CHANGES_PAGE_SIZE = 100
+MAX_CHANGES_PAGE_SIZE = 1000
+
+
+def format_entry(entry: QuietTimeEntry) -> QuietTimeEntryResponse:
+    return QuietTimeEntryResponse(
+        id=str(entry.id),
+        song=SongSchema(
+            title=entry.song_title,
+            youtubeId=entry.song_youtube_id
+        ),
+        scripture=ScriptureSchema(
+            reference=entry.scripture_reference,
+            text=entry.scripture_text
+        ),
+        prayer=PrayerSchema(
+            title=entry.prayer_title,
+            content=entry.prayer_content
+        ),
+        createdAt=entry.created_at.isoformat(),
+        updatedAt=entry.updated_at.isoformat() if entry.updated_at else None
+    )
+
 
 @router.post("/entries", response_model=APIResponse, status_code=201)
 async def create_entry(
     entry: QuietTimeEntryCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_admin: Admin = Depends(get_current_admin)
 ):
     """
@@ -47,31 +145,21 @@ async def create_entry(
         scripture_reference=entry.scripture.reference,
         scripture_text=entry.scripture.text,
         prayer_title=entry.prayer.title,
-        prayer_content=entry.prayer.content
+        prayer_content=entry.prayer.content,
+        rotation_position=await next_position(db)
     )
     
     db.add(new_entry)
-    db.commit()
-    db.refresh(new_entry)
+    await db.flush()
+    await clear_tombstones(db, new_entry.id)
+    await db.commit()
+    await db.refresh(new_entry)
+    read_model.saved([new_entry])
+    invalidate_rotation_state()
+    microcache.invalidate()
     
     # Format response
-    response_data = QuietTimeEntryResponse(
-        id=str(new_entry.id),
-        song=SongSchema(
-            title=new_entry.song_title,
-            youtubeId=new_entry.song_youtube_id
-        ),
-        scripture=ScriptureSchema(
-            reference=new_entry.scripture_reference,
-            text=new_entry.scripture_text
-        ),
-        prayer=PrayerSchema(
-            title=new_entry.prayer_title,
-            content=new_entry.prayer_content
-        ),
-        createdAt=new_entry.created_at.isoformat(),
-        updatedAt=new_entry.updated_at.isoformat() if new_entry.updated_at else None
-    )
+    response_data = format_entry(new_entry)
     
     return APIResponse(
         success=True,
@@ -80,102 +168,580 @@ async def create_entry(
     )
 
 
+def _entry_row(entry: QuietTimeEntryCreate, rotation_position: int) -> dict:
+    return {
+        "song_title": entry.song.title,
+        "song_youtube_id": entry.song.youtubeId,
+        "scripture_reference": entry.scripture.reference,
+        "scripture_text": entry.scripture.text,
+        "prayer_title": entry.prayer.title,
+        "prayer_content": entry.prayer.content,
+        "rotation_position": rotation_position
+    }
+
+
+@router.post("/entries/bulk", response_model=APIResponse, status_code=201)
+async def bulk_create_entries(
+    request: Request,
+    batch_size: int = Query(settings.BULK_IMPORT_BATCH_SIZE, ge=1, le=5000),
+    abort_on_error: bool = False,
+    db: AsyncSession = Depends(get_db),
+    current_admin: Admin = Depends(get_current_admin)
+):
+    """
+    Import many quiet time entries in one transaction (Admin only)
+    The body is a JSON array of entries, or NDJSON (one entry per line) when sent
+    as `application/x-ndjson`. Items are validated as they stream in and inserted
+    in batches of `batch_size`. Invalid items are reported by index and skipped,
+    unless `abort_on_error` is set, in which case nothing is imported.
+    """
+    content_type = request.headers.get("content-type", "")
+    if "ndjson" in content_type or "jsonl" in content_type:
+        items = iter_ndjson(request.stream())
+    else:
+        items = iter_json_array(request.stream())
+    
+    # Taken at the first insert, so a slow upload doesn't hold up other writes
+    # before it has anything to write
+    position: Optional[int] = None
+    received = 0
+    failed = 0
+    errors = []
+    inserted_ids = []
+    batch = []
+    
+    async def flush_batch():
+        nonlocal position
+        if not batch:
+            return
+        if position is None:
+            position = await next_position(db)
+        # Multi-row INSERT ... RETURNING, ids come back in parameter order
+        result = await db.execute(
+            insert(QuietTimeEntry).returning(QuietTimeEntry.id, sort_by_parameter_order=True),
+            [_entry_row(entry, position + offset) for offset, entry in enumerate(batch)]
+        )
+        batch_ids = result.scalars().all()
+        await clear_tombstones(db, min(batch_ids), max(batch_ids))
+        inserted_ids.extend(str(entry_id) for entry_id in batch_ids)
+        position += len(batch)
+        batch.clear()
+    
+    try:
+        async for item in items:
+            index = received
+            received += 1
+            try:
+                if isinstance(item, MalformedJSON):
+                    raise item
+                batch.append(QuietTimeEntryCreate.model_validate(item))
+            except (ValidationError, MalformedJSON) as e:
+                failed += 1
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    if isinstance(e, ValidationError):
+                        details = [
+                            f"{'.'.join(str(part) for part in error['loc']) or 'entry'}: {error['msg']}"
+                            for error in e.errors()
+                        ]
+                    else:
+                        details = [f"Invalid JSON: {e}"]
+                    errors.append({"index": index, "errors": details})
+                if abort_on_error:
+                    break
+                continue
+            if len(batch) >= batch_size:
+                await flush_batch()
+        else:
+            await flush_batch()
+    except MalformedJSON as e:
+        await db.rollback()
+        return APIResponse(
+            success=False,
+            message=f"Malformed JSON array: {e}",
+            data={"received": received, "inserted": 0, "failed": failed, "ids": [], "errors": errors}
+        )
+    
+    if failed and abort_on_error:
+        await db.rollback()
+        return APIResponse(
+            success=False,
+            message="Import aborted, no entries were added",
+            data={"received": received, "inserted": 0, "failed": failed, "ids": [], "errors": errors}
+        )
+    
+    if inserted_ids:
+        # Early batches were stamped while the body was still streaming in;
+        # delta sync needs stamps close to the commit (see app.changes)
+        await restamp(db, int(inserted_ids[0]), int(inserted_ids[-1]))
+    await db.commit()
+    await read_model.saved_ids(db, [int(entry_id) for entry_id in inserted_ids])
+    invalidate_rotation_state()
+    microcache.invalidate()
+    
+    return APIResponse(
+        success=True,
+        message=f"{len(inserted_ids)} quiet time entries added successfully",
+        data={
+            "received": received,
+            "inserted": len(inserted_ids),
+            "failed": failed,
+            "ids": inserted_ids,
+            "errors": errors
+        }
+    )
+
+
+async def requested_day(tz: Optional[str] = None) -> LocalDay:
+    """
+    Today in the ``tz`` query parameter (default UTC). An invalid zone raises
+    InvalidTimezone, which app.main turns into a failed APIResponse.
+    """
+    return local_day(parse_timezone(tz))
+
+
+# Today's entry per (local rotation day, content generation), shared by every time
+# zone on that date; kept no longer than the micro-cache keeps responses
+today_cache = TTLCache(maxsize=8, ttl=settings.MICRO_CACHE_TTL_SECONDS)
+
+
+async def _todays_entry(db: AsyncSession, today: LocalDay) -> Optional[Tuple[RotationState, Any, dict]]:
+    """Today's rotation state, the entry's updated_at and the entry itself."""
+    generation = microcache.current_generation()
+    cache_key = (today.index, generation)
+    selected = today_cache.get(cache_key)
+    if selected is not None:
+        return selected
+    # The state may predate a write made by another worker; recompute once if so
+    for _ in range(2):
+        rotation = await get_rotation_state(db, today)
+        if rotation.entry_id is None:
+            return None
+        row = (await db.execute(
+            select_entries().filter(QuietTimeEntry.id == rotation.entry_id)
+        )).one_or_none()
+        if row is not None:
+            selected = (rotation, row.updated_at, entry_to_dict(row))
+            if microcache.replica_caught_up(generation):
+                today_cache.set(cache_key, selected)
+            return selected
+        invalidate_rotation_state()
+    return None
+
+
 @router.get("/entries/today", response_model=APIResponse)
-async def get_todays_entry(db: Session = Depends(get_db)):
+async def get_todays_entry(
+    request: Request,
+    today: LocalDay = Depends(requested_day),
+    db: AsyncSession = Depends(get_read_db)
+):
     """
     Get today's quiet time entry (Public - No authentication required)
     Rotates through all entries daily, cycling back to the beginning when reaching the end.
+    Supports conditional requests; cacheable until the next midnight in `tz` (default UTC).
+    Pass `tz` (an IANA name such as `America/New_York`, or a UTC offset such as `+05:30`) to roll over at local midnight.
     """
-    from datetime import datetime, timezone
-    
-    # Get all entries ordered by creation date (oldest first for consistent rotation)
-    entries = db.query(QuietTimeEntry).order_by(QuietTimeEntry.created_at.asc()).all()
-    
-    if not entries:
+    model = read_model.active()
+    validators = None
+    if model is not None:
+        rotation = await get_rotation_state(db, today)
+        record = model.at_position(rotation.position)
+        if record is not None:
+            validators = (record.id, record.updated_at)
+    else:
+        selected = await _todays_entry(db, today)
+        if selected is not None:
+            rotation, updated_at, entry = selected
+            validators = (rotation.entry_id, updated_at)
+    
+    if validators is None:
         return APIResponse(
             success=True,
             message="No entries available",
             data=None
         )
     
-    # Calculate which entry to show based on current date
-    # Use a fixed reference date (e.g., January 1, 2025) for consistent daily rotation
-    reference_date = datetime(2025, 1, 1, tzinfo=timezone.utc)
-    current_date = datetime.now(timezone.utc)
+    entry_id, updated_at = validators
+    days_passed = rotation.day
+    etag = make_etag("today", entry_id, updated_at.isoformat() if updated_at else "", days_passed)
+    headers = cache_headers(etag, today.seconds_left())
     
-    # Calculate days since reference date
-    days_passed = (current_date - reference_date).days
+    if is_not_modified(request, etag):
+        return not_modified_response(headers)
     
-    # Use modulo to cycle through entries
-    entry_index = days_passed % len(entries)
-    selected_entry = entries[entry_index]
+    if model is not None:
+        return read_model.envelope("Today's entry retrieved successfully", record.full, headers)
     
-    # Format the selected entry
-    formatted_entry = QuietTimeEntryResponse(
-        id=str(selected_entry.id),
-        song=SongSchema(
-            title=selected_entry.song_title,
-            youtubeId=selected_entry.song_youtube_id
-        ),
-        scripture=ScriptureSchema(
-            reference=selected_entry.scripture_reference,
-            text=selected_entry.scripture_text
-        ),
-        prayer=PrayerSchema(
-            title=selected_entry.prayer_title,
-            content=selected_entry.prayer_content
-        ),
-        createdAt=selected_entry.created_at.isoformat(),
-        updatedAt=selected_entry.updated_at.isoformat() if selected_entry.updated_at else None
+    return api_response(
+        "Today's entry retrieved successfully",
+        entry,
+        headers=headers
     )
-    
-    return APIResponse(
-        success=True,
-        message="Today's entry retrieved successfully",
-        data=formatted_entry
+
+
+def _stream_entries(stream: str, fields: Tuple[str, ...]) -> StreamingResponse:
+    # The request-scoped session is closed before the body is sent,
+    # so the stream owns its own session for as long as it runs.
+    async def formatted_entries():
+        async with ReadSessionLocal() as db:
+            rows = await db.stream(
+                select_fields(fields)
+                .order_by(QuietTimeEntry.created_at.desc(), QuietTimeEntry.id.desc())
+                .execution_options(yield_per=STREAM_BATCH_SIZE)
+            )
+            async for row in rows:
+                yield fields_to_dict(row, fields)
+
+    if stream == "ndjson":
+        return StreamingResponse(ndjson_lines(formatted_entries()), media_type=NDJSON_MEDIA_TYPE)
+    return StreamingResponse(
+        json_envelope(formatted_entries(), "Entries retrieved successfully", "No entries available"),
+        media_type="application/json"
+    )
+
+
+def _entries_from_read_model(model, full: bool, page_size: Optional[int], after: Optional[tuple], headers: dict):
+    records, more = model.page(page_size, after)
+    items = read_model.json_array(record.full if full else record.summary for record in records)
+    message = "Entries retrieved successfully" if records else "No entries available"
+    if page_size is None:
+        return read_model.envelope(message, items, headers)
+    next_cursor = encode_cursor(*records[-1].list_key) if more else None
+    return read_model.envelope(
+        message,
+        b'{"items":' + items + b',"nextCursor":' + dumps(next_cursor) + b"}",
+        headers
     )
 
 
 @router.get("/entries", response_model=APIResponse)
-async def get_all_entries(db: Session = Depends(get_db)):
+async def get_all_entries(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    stream: Optional[str] = Query(None, pattern="^(ndjson|json)$"),
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
+):
     """
     Get all quiet time entries (Public - No authentication required)
+    Returns a summary of each entry (no scripture text or prayer content) unless
+    `fields` asks for more, e.g. `fields=id,song.title,scripture` or `fields=*`.
+    Supports conditional requests keyed on the row count and latest update.
+    Pass `limit` (and then the returned `nextCursor` as `cursor`) to page through
+    entries newest first, or `stream=ndjson|json` to stream the full list.
+    """
+    try:
+        selected_fields = parse_fields(fields)
+    except UnknownField as e:
+        return APIResponse(
+            success=False,
+            message=str(e),
+            data=None
+        )
+    
+    if stream:
+        return _stream_entries(stream, selected_fields)
+    
+    paginated = limit is not None or cursor is not None
+    if cursor is not None:
+        try:
+            after_created_at, after_id = decode_cursor(cursor)
+        except InvalidCursor:
+            return APIResponse(
+                success=False,
+                message="Invalid cursor",
+                data=None
+            )
+    
+    # The read model holds encoded summary and full entries; other selections use the database
+    model = read_model.active() if selected_fields in (SUMMARY_FIELDS, ALL_FIELDS) else None
+    if model is not None:
+        total_entries, last_updated = len(model), model.last_updated
+    else:
+        total_entries, last_updated = (await db.execute(
+            select(func.count(QuietTimeEntry.id), func.max(QuietTimeEntry.updated_at))
+        )).one()
+    etag = make_etag(
+        "entries",
+        total_entries,
+        last_updated.isoformat() if last_updated else "",
+        limit,
+        cursor,
+        ",".join(selected_fields)
+    )
+    headers = cache_headers(etag, seconds_until_utc_midnight())
+    
+    if is_not_modified(request, etag):
+        return not_modified_response(headers)
+    
+    if model is not None:
+        return _entries_from_read_model(
+            model,
+            selected_fields == ALL_FIELDS,
+            (limit or DEFAULT_PAGE_SIZE) if paginated else None,
+            (after_created_at, after_id) if cursor is not None else None,
+            headers
+        )
+    
+    # Paging needs the sort key even when it isn't a requested field
+    sort_key = (QuietTimeEntry.created_at, QuietTimeEntry.id) if paginated else ()
+    query = select_fields(selected_fields, *sort_key).order_by(
+        QuietTimeEntry.created_at.desc(), QuietTimeEntry.id.desc()
+    )
+    
+    if paginated:
+        page_size = limit or DEFAULT_PAGE_SIZE
+        if cursor is not None:
+            # Keyset: everything strictly after the last row of the previous page
+            query = query.filter(or_(
+                QuietTimeEntry.created_at < after_created_at,
+                and_(QuietTimeEntry.created_at == after_created_at, QuietTimeEntry.id < after_id)
+            ))
+        # One extra row tells us whether another page exists
+        rows = (await db.execute(query.limit(page_size + 1))).all()
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+        
+        return api_response(
+            "Entries retrieved successfully" if rows else "No entries available",
+            {"items": [fields_to_dict(row, selected_fields) for row in rows], "nextCursor": next_cursor},
+            headers=headers
+        )
+    
+    rows = (await db.execute(query)).all()
+    
+    if not rows:
+        return api_response("No entries available", [], headers=headers)
+    
+    return api_response(
+        "Entries retrieved successfully",
+        [fields_to_dict(row, selected_fields) for row in rows],
+        headers=headers
+    )
+
+
+@router.get("/entries/search", response_model=APIResponse)
+async def search_entries(
+    q: str = Query(..., min_length=1, max_length=MAX_SEARCH_QUERY_LENGTH),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_admin: Admin = Depends(get_current_admin)
+):
     """
-    entries = db.query(QuietTimeEntry).order_by(QuietTimeEntry.created_at.desc()).all()
+    Search entries by song title, scripture reference and text, and prayer
+    title and content (Admin only)
+    Results are ranked best match first and paged with `limit`/`offset`;
+    `fields` works as in GET /entries.
+    """
+    try:
+        selected_fields = parse_fields(fields)
+    except UnknownField as e:
+        return APIResponse(
+            success=False,
+            message=str(e),
+            data=None
+        )
     
-    if not entries:
+    if not search_terms(q):
         return APIResponse(
-            success=True,
-            message="No entries available",
-            data=[]
+            success=False,
+            message="Search query must contain at least one word",
+            data=None
+        )
+    
+    query = search_query(db.bind.dialect.name, q, selected_fields)
+    # One extra row tells us whether another page exists
+    rows = (await db.execute(query.limit(limit + 1).offset(offset))).all()
+    next_offset = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_offset = offset + limit
+    
+    return api_response(
+        "Entries found" if rows else "No matching entries",
+        {"items": [fields_to_dict(row, selected_fields) for row in rows], "nextOffset": next_offset}
+    )
+
+
+@router.get("/entries/changes", response_model=APIResponse)
+async def get_entry_changes(
+    since: Optional[str] = None,
+    limit: int = Query(DEFAULT_CHANGES_PAGE_SIZE, ge=1, le=MAX_CHANGES_PAGE_SIZE),
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Get entries created, updated or deleted since a cursor (Public - No authentication required)
+    Without `since`, returns everything from the beginning. Store the returned
+    `cursor` and pass it as `since` next time; while `hasMore` is true, call
+    again right away. `items` are full entries unless `fields` says otherwise,
+    `deleted` lists removed ids.
+    """
+    try:
+        selected_fields = parse_fields(fields, default=ALL_FIELDS)
+    except UnknownField as e:
+        return APIResponse(
+            success=False,
+            message=str(e),
+            data=None
         )
     
-    # Format all entries
-    formatted_entries = []
-    for entry in entries:
-        formatted_entry = QuietTimeEntryResponse(
-            id=str(entry.id),
-            song=SongSchema(
-                title=entry.song_title,
-                youtubeId=entry.song_youtube_id
-            ),
-            scripture=ScriptureSchema(
-                reference=entry.scripture_reference,
-                text=entry.scripture_text
-            ),
-            prayer=PrayerSchema(
-                title=entry.prayer_title,
-                content=entry.prayer_content
-            ),
-            createdAt=entry.created_at.isoformat(),
-            updatedAt=entry.updated_at.isoformat() if entry.updated_at else None
+    after = None
+    if since is not None:
+        try:
+            after = decode_cursor(since)
+        except InvalidCursor:
+            return APIResponse(
+                success=False,
+                message="Invalid cursor",
+                data=None
+            )
+    
+    changes = await read_changes(db, after, limit, selected_fields)
+    
+    return api_response(
+        "Changes retrieved successfully" if changes.items or changes.deleted else "No changes",
+        {
+            "items": changes.items,
+            "deleted": changes.deleted,
+            "cursor": encode_cursor(*changes.cursor) if changes.cursor else None,
+            "hasMore": changes.has_more
+        }
+    )
+
+
+def _patch_values(item: QuietTimeEntryPatch) -> dict:
+    """Column values for the fields an item sets."""
+    values = {}
+    for group in ("song", "scripture", "prayer"):
+        patch = getattr(item, group)
+        if patch is None:
+            continue
+        for key, value in patch.model_dump(exclude_none=True).items():
+            values[ENTRY_FIELDS[f"{group}.{key}"].key] = value
+    return values
+
+
+def _duplicate_id(ids: List[int]) -> Optional[int]:
+    seen = set()
+    for entry_id in ids:
+        if entry_id in seen:
+            return entry_id
+        seen.add(entry_id)
+    return None
+
+
+@router.patch("/entries/batch", response_model=APIResponse)
+async def update_entries_batch(
+    batch: QuietTimeEntryBatchUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_admin: Admin = Depends(get_current_admin)
+):
+    """
+    Update many quiet time entries in one transaction (Admin only)
+    Each item has an `id` and only the fields to change. Items with the same
+    changes are applied by a single UPDATE. Ids that don't exist are reported
+    as `not_found`; the rest are still updated.
+    """
+    duplicate = _duplicate_id([item.id for item in batch.entries])
+    if duplicate is not None:
+        return APIResponse(
+            success=False,
+            message=f"Entry {duplicate} appears more than once",
+            data=None
         )
-        formatted_entries.append(formatted_entry)
     
-    return APIResponse(
-        success=True,
-        message="Entries retrieved successfully",
-        data=formatted_entries
+    # Items that set the same columns share one statement: UPDATE ... WHERE id IN
+    # when the values match too, otherwise a single executemany keyed by id
+    groups = {}
+    for item in batch.entries:
+        values = _patch_values(item)
+        groups.setdefault(tuple(sorted(values)), []).append((item.id, values))
+    
+    updated_at = {}
+    updated_by_id = []
+    for columns, items in groups.items():
+        if len({tuple(values.values()) for _, values in items}) == 1:
+            result = await db.execute(
+                update(QuietTimeEntry)
+                .where(QuietTimeEntry.id.in_([entry_id for entry_id, _ in items]))
+                .values(items[0][1])
+                .returning(QuietTimeEntry.id, QuietTimeEntry.updated_at)
+                .execution_options(synchronize_session=False)
+            )
+            updated_at.update(result.tuples().all())
+        else:
+            await db.execute(
+                update(QuietTimeEntry.__table__)
+                .where(QuietTimeEntry.id == bindparam("entry_id"))
+                .values({column: bindparam(f"new_{column}") for column in columns}),
+                [
+                    {"entry_id": entry_id, **{f"new_{column}": value for column, value in values.items()}}
+                    for entry_id, values in items
+                ]
+            )
+            updated_by_id.extend(entry_id for entry_id, _ in items)
+    if updated_by_id:
+        # executemany can't RETURNING; ids that don't exist simply aren't found here
+        updated_at.update((await db.execute(
+            select(QuietTimeEntry.id, QuietTimeEntry.updated_at).where(QuietTimeEntry.id.in_(updated_by_id))
+        )).tuples().all())
+    await db.commit()
+    if updated_at:
+        await read_model.saved_ids(db, list(updated_at))
+        microcache.invalidate()
+    
+    results = [
+        {"id": str(item.id), "status": "updated", "updatedAt": updated_at[item.id].isoformat()}
+        if item.id in updated_at else {"id": str(item.id), "status": "not_found"}
+        for item in batch.entries
+    ]
+    missing = len(results) - len(updated_at)
+    return api_response(
+        f"{len(updated_at)} entries updated" + (f", {missing} not found" if missing else ""),
+        {"updated": len(updated_at), "notFound": missing, "results": results}
+    )
+
+
+@router.delete("/entries/batch", response_model=APIResponse)
+async def delete_entries_batch(
+    batch: QuietTimeEntryBatchDelete,
+    db: AsyncSession = Depends(get_db),
+    current_admin: Admin = Depends(get_current_admin)
+):
+    """
+    Delete many quiet time entries in one transaction (Admin only)
+    Ids that don't exist are reported as `not_found`; the rest are deleted.
+    """
+    ids = list(dict.fromkeys(batch.ids))
+    
+    await lock_rotation(db)
+    deleted = dict((await db.execute(
+        delete(QuietTimeEntry)
+        .where(QuietTimeEntry.id.in_(ids))
+        .returning(QuietTimeEntry.id, QuietTimeEntry.rotation_position)
+        .execution_options(synchronize_session=False)
+    )).tuples().all())
+    await close_gaps(db, deleted.values())
+    await record_deletions(db, list(deleted))
+    await db.commit()
+    if deleted:
+        read_model.deleted(deleted)
+        invalidate_rotation_state()
+        microcache.invalidate()
+    
+    results = [
+        {"id": str(entry_id), "status": "deleted" if entry_id in deleted else "not_found"}
+        for entry_id in ids
+    ]
+    missing = len(ids) - len(deleted)
+    return api_response(
+        f"{len(deleted)} entries removed" + (f", {missing} not found" if missing else ""),
+        {"deleted": len(deleted), "notFound": missing, "results": results}
     )
 
 
@@ -183,14 +749,14 @@ async def get_all_entries(db: Session = Depends(get_db)):
 async def update_entry(
     entry_id: int,
     entry: QuietTimeEntryCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_admin: Admin = Depends(get_current_admin)
 ):
     """
     Update a quiet time entry (Admin only)
     """
     # Find the existing entry
-    existing_entry = db.query(QuietTimeEntry).filter(QuietTimeEntry.id == entry_id).first()
+    existing_entry = await db.get(QuietTimeEntry, entry_id)
     
     if not existing_entry:
         return APIResponse(
@@ -222,27 +788,13 @@ async def update_entry(
     existing_entry.prayer_title = entry.prayer.title
     existing_entry.prayer_content = entry.prayer.content
     
-    db.commit()
-    db.refresh(existing_entry)
+    await db.commit()
+    await db.refresh(existing_entry)
+    read_model.saved([existing_entry])
+    microcache.invalidate()
     
     # Format response
-    response_data = QuietTimeEntryResponse(
-        id=str(existing_entry.id),
-        song=SongSchema(
-            title=existing_entry.song_title,
-            youtubeId=existing_entry.song_youtube_id
-        ),
-        scripture=ScriptureSchema(
-            reference=existing_entry.scripture_reference,
-            text=existing_entry.scripture_text
-        ),
-        prayer=PrayerSchema(
-            title=existing_entry.prayer_title,
-            content=existing_entry.prayer_content
-        ),
-        createdAt=existing_entry.created_at.isoformat(),
-        updatedAt=existing_entry.updated_at.isoformat() if existing_entry.updated_at else None
-    )
+    response_data = format_entry(existing_entry)
     
     return APIResponse(
         success=True,
@@ -254,13 +806,15 @@ async def update_entry(
 @router.delete("/entries/{entry_id}", response_model=APIResponse)
 async def delete_entry(
     entry_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_admin: Admin = Depends(get_current_admin)
 ):
     """
     Delete a quiet time entry (Admin only)
     """
-    entry = db.query(QuietTimeEntry).filter(QuietTimeEntry.id == entry_id).first()
+    # Read the position under the lock so a concurrent delete can't shift it
+    await lock_rotation(db)
+    entry = await db.get(QuietTimeEntry, entry_id)
     
     if not entry:
         return APIResponse(
@@ -269,8 +823,15 @@ async def delete_entry(
             data=None
         )
     
-    db.delete(entry)
-    db.commit()
+    position = entry.rotation_position
+    await db.delete(entry)
+    await db.flush()
+    await close_gap(db, position)
+    await record_deletions(db, [entry_id])
+    await db.commit()
+    read_model.deleted({entry_id: position})
+    invalidate_rotation_state()
+    microcache.invalidate()
     
     return APIResponse(
         success=True,
@@ -279,63 +840,121 @@ async def delete_entry(
     )
 
 
+@router.get("/entries/schedule", response_model=APIResponse)
+async def get_schedule(
+    from_date: Optional[date] = Query(None, alias="from"),
+    days: int = Query(7, ge=1, le=MAX_SCHEDULE_DAYS),
+    today: LocalDay = Depends(requested_day),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Get the entries scheduled for a range of days, e.g. to prefetch for offline use.
+    Public endpoint - No authentication required.
+    Returns a date -> entry id map plus each distinct entry once, so ranges longer
+    than the rotation cycle don't repeat entry bodies. Dates are local to `tz`
+    (default UTC), which also picks today's date when `from` is omitted.
+    """
+    start = from_date or today.date
+    dates = [start + timedelta(days=offset) for offset in range(days)]
+    
+    # The cached entry count may predate a delete made by another worker;
+    # if a scheduled position has no entry, recompute once
+    for _ in range(2):
+        rotation = await get_rotation_state(db, today)
+        if rotation.total_entries == 0:
+            return APIResponse(
+                success=True,
+                message="No entries available",
+                data={"from": start.isoformat(), "days": days, "total_entries": 0, "schedule": {}, "entries": {}}
+            )
+        positions = {day: day_index(day) % rotation.total_entries for day in dates}
+        entries = (await db.execute(
+            select_entries(QuietTimeEntry.rotation_position)
+            .filter(QuietTimeEntry.rotation_position.in_(set(positions.values())))
+        )).all()
+        by_position = {entry.rotation_position: entry for entry in entries}
+        if len(by_position) == len(set(positions.values())):
+            break
+        invalidate_rotation_state()
+    
+    return api_response(
+        "Schedule retrieved successfully",
+        {
+            "from": start.isoformat(),
+            "days": days,
+            "total_entries": rotation.total_entries,
+            "schedule": {
+                day.isoformat(): str(by_position[position].id)
+                for day, position in positions.items()
+                if position in by_position
+            },
+            "entries": {str(entry.id): entry_to_dict(entry) for entry in entries}
+        }
+    )
+
+
+@router.get("/entries/rotation/status", response_model=APIResponse)
+async def get_rotation_status(today: LocalDay = Depends(requested_day), db: AsyncSession = Depends(get_read_db)):
+    """
+    Get everything about today's place in the rotation cycle in one call.
+    Public endpoint - No authentication required.
+    Pass `tz` (an IANA name such as `America/New_York`, or a UTC offset such as `+05:30`) to roll over at local midnight.
+    """
+    rotation = await get_rotation_state(db, today)
+    
+    return APIResponse(
+        success=True,
+        message="Rotation status retrieved successfully" if rotation.total_entries else "No entries available",
+        data={
+            "total_entries": rotation.total_entries,
+            "current_position": rotation.position,
+            "current_entry_id": str(rotation.entry_id) if rotation.entry_id is not None else None,
+            "days_remaining": rotation.remaining,
+            "entries_remaining": rotation.remaining,
+            "next_cycle_starts_in": rotation.remaining + 1 if rotation.total_entries else 0,
+            "is_last_entry": rotation.is_last
+        }
+    )
+
+
 @router.get("/entries/rotation/days-remaining", response_model=APIResponse)
-async def get_days_remaining_in_cycle(db: Session = Depends(get_db)):
+async def get_days_remaining_in_cycle(today: LocalDay = Depends(requested_day), db: AsyncSession = Depends(get_read_db)):
     """
     Get the number of days remaining in the current rotation cycle before it loops back to the beginning.
     Public endpoint - No authentication required.
+    Pass `tz` (an IANA name such as `America/New_York`, or a UTC offset such as `+05:30`) to roll over at local midnight.
     """
-    from datetime import datetime, timezone
-    
-    # Get all entries ordered by creation date (same as rotation logic)
-    entries = db.query(QuietTimeEntry).order_by(QuietTimeEntry.created_at.asc()).all()
+    rotation = await get_rotation_state(db, today)
     
-    if not entries:
+    if rotation.total_entries == 0:
         return APIResponse(
             success=True,
             message="No entries available",
             data={"days_remaining": 0, "total_entries": 0, "current_position": 0}
         )
     
-    # Use the same reference date and calculation as the rotation logic
-    reference_date = datetime(2025, 1, 1, tzinfo=timezone.utc)
-    current_date = datetime.now(timezone.utc)
-    days_passed = (current_date - reference_date).days
-    
-    # Calculate current position in the cycle (0-based)
-    current_position = days_passed % len(entries)
-    
-    # Calculate days remaining until the cycle completes
-    days_remaining = len(entries) - current_position - 1
-    
-    # If we're at the last entry, next cycle starts tomorrow
-    if current_position == len(entries) - 1:
-        days_remaining = 0
-    
     return APIResponse(
         success=True,
         message="Days remaining in current cycle retrieved successfully",
         data={
-            "days_remaining": days_remaining,
-            "total_entries": len(entries),
-            "current_position": current_position,
-            "next_cycle_starts_in": days_remaining + 1
+            "days_remaining": rotation.remaining,
+            "total_entries": rotation.total_entries,
+            "current_position": rotation.position,
+            "next_cycle_starts_in": rotation.remaining + 1
         }
     )
 
 
 @router.get("/entries/rotation/entries-remaining", response_model=APIResponse)
-async def get_entries_remaining_in_cycle(db: Session = Depends(get_db)):
+async def get_entries_remaining_in_cycle(today: LocalDay = Depends(requested_day), db: AsyncSession = Depends(get_read_db)):
     """
     Get the number of entries remaining in the current rotation cycle before it starts over.
     Public endpoint - No authentication required.
+    Pass `tz` (an IANA name such as `America/New_York`, or a UTC offset such as `+05:30`) to roll over at local midnight.
     """
-    from datetime import datetime, timezone
-    
-    # Get all entries ordered by creation date (same as rotation logic)
-    entries = db.query(QuietTimeEntry).order_by(QuietTimeEntry.created_at.asc()).all()
+    rotation = await get_rotation_state(db, today)
     
-    if not entries:
+    if rotation.total_entries == 0:
         return APIResponse(
             success=True,
             message="No entries available",
@@ -346,31 +965,14 @@ async def get_entries_remaining_in_cycle(db: Session = Depends(get_db)):
             }
         )
     
-    # Use the same reference date and calculation as the rotation logic
-    reference_date = datetime(2025, 1, 1, tzinfo=timezone.utc)
-    current_date = datetime.now(timezone.utc)
-    days_passed = (current_date - reference_date).days
-    
-    # Calculate current position in the cycle (0-based for calculation)
-    current_position_0_based = days_passed % len(entries)
-    
-    # Convert to 1-based for user display
-    current_position = current_position_0_based + 1
-    
-    # Calculate entries remaining until the cycle completes
-    entries_remaining = len(entries) - current_position_0_based - 1
-    
-    # If we're at the last entry, no entries remaining
-    if current_position_0_based == len(entries) - 1:
-        entries_remaining = 0
-    
     return APIResponse(
         success=True,
         message="Entries remaining in current cycle retrieved successfully",
         data={
-            "entries_remaining": entries_remaining,
-            "total_entries": len(entries),
-            "current_position": current_position,
-            "is_last_entry": current_position_0_based == len(entries) - 1
+            "entries_remaining": rotation.remaining,
+            "total_entries": rotation.total_entries,
+            # 1-based for user display
+            "current_position": rotation.position + 1,
+            "is_last_entry": rotation.is_last
         }
-    )
\ No newline at end of file
+    )
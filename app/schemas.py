@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from datetime import datetime
 from typing import Optional, Any, List
 
@@ -24,6 +24,50 @@ class QuietTimeEntryCreate(BaseModel):
     prayer: PrayerSchema
 
 
+# Ids per batch update/delete request
+MAX_BATCH_SIZE = 500
+
+
+class SongPatch(BaseModel):
+    title: Optional[str] = Field(None, min_length=1)
+    youtubeId: Optional[str] = Field(None, min_length=1)
+
+
+class ScripturePatch(BaseModel):
+    reference: Optional[str] = Field(None, min_length=1)
+    text: Optional[str] = Field(None, min_length=1)
+
+
+class PrayerPatch(BaseModel):
+    title: Optional[str] = Field(None, min_length=1)
+    content: Optional[str] = Field(None, min_length=1)
+
+
+class QuietTimeEntryPatch(BaseModel):
+    """One item of a batch update: only the fields that are sent change."""
+    id: int
+    song: Optional[SongPatch] = None
+    scripture: Optional[ScripturePatch] = None
+    prayer: Optional[PrayerPatch] = None
+
+    @model_validator(mode="after")
+    def has_changes(self):
+        if not any(
+            group is not None and group.model_dump(exclude_none=True)
+            for group in (self.song, self.scripture, self.prayer)
+        ):
+            raise ValueError("Nothing to update")
+        return self
+
+
+class QuietTimeEntryBatchUpdate(BaseModel):
+    entries: List[QuietTimeEntryPatch] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class QuietTimeEntryBatchDelete(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
 class QuietTimeEntryResponse(BaseModel):
     id: str
     song: SongSchema
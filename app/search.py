@@ -0,0 +1,73 @@
+"""
+Ranked full-text search over entries.
+
+PostgreSQL matches against the generated ``search_vector`` column (GIN
+indexed) and ranks with ``ts_rank_cd``; SQLite matches the FTS5 table and
+ranks with ``bm25``. Both weight titles and the scripture reference above
+body text. Other backends fall back to an unranked ILIKE scan, which is
+also the baseline in ``benchmarks/search.py``.
+"""
+import re
+from typing import List, Tuple
+from sqlalchemy import Select, and_, column, func, literal_column, or_, table
+from app.models import QuietTimeEntry, SEARCH_COLUMNS, SEARCH_FTS_TABLE
+from app.serializers import select_fields
+
+MAX_TERMS = 16
+# bm25 weights, in SEARCH_COLUMNS order (mirrors the tsvector A/B/C weights)
+BM25_WEIGHTS = (10.0, 10.0, 1.0, 5.0, 1.0)
+
+_TERM = re.compile(r"\w+")
+
+
+def search_terms(q: str) -> List[str]:
+    """Words in a query; punctuation and operators are ignored."""
+    return _TERM.findall(q)[:MAX_TERMS]
+
+
+def fts5_match(terms: List[str]) -> str:
+    """
+    Every term must match; the last one is a prefix so partial words still
+    find results. Terms are quoted, so user input is never FTS5 syntax.
+    """
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def _search_columns() -> List:
+    return [getattr(QuietTimeEntry, name) for name in SEARCH_COLUMNS]
+
+
+def ilike_query(terms: List[str], fields: Tuple[str, ...]) -> Select:
+    """Every term must appear in some searchable column. Scans the whole table."""
+    return select_fields(fields).filter(and_(*[
+        or_(*[
+            searchable.ilike(f"%{term}%", escape="\\") for searchable in _search_columns()
+        ])
+        for term in (re.sub(r"([%_\\])", r"\\\1", term) for term in terms)
+    ])).order_by(QuietTimeEntry.id.desc())
+
+
+def search_query(dialect: str, q: str, fields: Tuple[str, ...]) -> Select:
+    """Best match first; ties go to the newest entry."""
+    if dialect == "postgresql":
+        tsquery = func.websearch_to_tsquery("english", q)
+        vector = literal_column("quiet_time_entries.search_vector")
+        return select_fields(fields).filter(vector.op("@@")(tsquery)).order_by(
+            func.ts_rank_cd(vector, tsquery).desc(), QuietTimeEntry.id.desc()
+        )
+
+    terms = search_terms(q)
+    if dialect == "sqlite":
+        fts = table(SEARCH_FTS_TABLE, column("rowid"))
+        fts_ref = literal_column(SEARCH_FTS_TABLE)
+        return (
+            select_fields(fields)
+            .select_from(QuietTimeEntry)
+            .join(fts, fts.c.rowid == QuietTimeEntry.id)
+            .filter(fts_ref.op("MATCH")(fts5_match(terms)))
+            .order_by(func.bm25(fts_ref, *BM25_WEIGHTS), QuietTimeEntry.id.desc())
+        )
+
+    return ilike_query(terms, fields)
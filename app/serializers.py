@@ -0,0 +1,155 @@
+"""
+Fast path for serializing entries.
+
+Read routes select plain column tuples (no ORM identity map, no per-row
+Pydantic models) and encode dicts straight to bytes. The output is
+byte-for-byte what the APIResponse/QuietTimeEntryResponse path produces.
+"""
+import json
+from typing import Any, Mapping, Optional, Tuple
+from fastapi.responses import JSONResponse
+from sqlalchemy import Select, select
+from app.models import QuietTimeEntry
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+ENTRY_COLUMNS = (
+    QuietTimeEntry.id,
+    QuietTimeEntry.song_title,
+    QuietTimeEntry.song_youtube_id,
+    QuietTimeEntry.scripture_reference,
+    QuietTimeEntry.scripture_text,
+    QuietTimeEntry.prayer_title,
+    QuietTimeEntry.prayer_content,
+    QuietTimeEntry.created_at,
+    QuietTimeEntry.updated_at,
+)
+
+
+# Public field names for sparse fieldsets, in response order
+ENTRY_FIELDS = {
+    "id": QuietTimeEntry.id,
+    "song.title": QuietTimeEntry.song_title,
+    "song.youtubeId": QuietTimeEntry.song_youtube_id,
+    "scripture.reference": QuietTimeEntry.scripture_reference,
+    "scripture.text": QuietTimeEntry.scripture_text,
+    "prayer.title": QuietTimeEntry.prayer_title,
+    "prayer.content": QuietTimeEntry.prayer_content,
+    "createdAt": QuietTimeEntry.created_at,
+    "updatedAt": QuietTimeEntry.updated_at,
+}
+FIELD_GROUPS = {
+    group: tuple(name for name in ENTRY_FIELDS if name.startswith(f"{group}."))
+    for group in ("song", "scripture", "prayer")
+}
+ALL_FIELDS = tuple(ENTRY_FIELDS)
+# Everything except the unbounded Text columns
+SUMMARY_FIELDS = tuple(
+    name for name in ENTRY_FIELDS if name not in ("scripture.text", "prayer.content")
+)
+
+
+class UnknownField(ValueError):
+    pass
+
+
+def parse_fields(value: Optional[str], default: Tuple[str, ...] = SUMMARY_FIELDS) -> Tuple[str, ...]:
+    """
+    Parse a ``fields=`` parameter such as ``id,song.title,scripture``.
+    ``*`` selects every field; group names select all of their sub-fields.
+    """
+    if value is None or not value.strip():
+        return default
+    if value.strip() == "*":
+        return ALL_FIELDS
+    requested = set()
+    for name in (part.strip() for part in value.split(",")):
+        if not name:
+            continue
+        if name in FIELD_GROUPS:
+            requested.update(FIELD_GROUPS[name])
+        elif name in ENTRY_FIELDS:
+            requested.add(name)
+        else:
+            raise UnknownField(f"Unknown field: {name}")
+    return tuple(name for name in ENTRY_FIELDS if name in requested)
+
+
+def select_entries(*extra_columns) -> Select:
+    return select(*ENTRY_COLUMNS, *extra_columns)
+
+
+def select_fields(fields: Tuple[str, ...], *extra_columns) -> Select:
+    """Project only the requested columns, so unrequested Text never leaves the database."""
+    columns = [ENTRY_FIELDS[name] for name in fields]
+    selected = {column.key for column in columns}
+    columns += [column for column in extra_columns if column.key not in selected]
+    return select(*columns)
+
+
+def entry_to_dict(row: Any) -> dict:
+    """Same keys, order and formatting as QuietTimeEntryResponse."""
+    return {
+        "id": str(row.id),
+        "song": {
+            "title": row.song_title,
+            "youtubeId": row.song_youtube_id
+        },
+        "scripture": {
+            "reference": row.scripture_reference,
+            "text": row.scripture_text
+        },
+        "prayer": {
+            "title": row.prayer_title,
+            "content": row.prayer_content
+        },
+        "createdAt": row.created_at.isoformat(),
+        "updatedAt": row.updated_at.isoformat() if row.updated_at else None
+    }
+
+
+def fields_to_dict(row: Any, fields: Tuple[str, ...]) -> dict:
+    """Like entry_to_dict, limited to ``fields`` (nested groups kept in order)."""
+    if fields == ALL_FIELDS:
+        return entry_to_dict(row)
+    result = {}
+    for name in fields:
+        value = getattr(row, ENTRY_FIELDS[name].key)
+        if name == "id":
+            value = str(value)
+        elif name in ("createdAt", "updatedAt"):
+            value = value.isoformat() if value else None
+        group, _, key = name.partition(".")
+        if key:
+            result.setdefault(group, {})[key] = value
+        else:
+            result[name] = value
+    return result
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    # Matches Starlette's JSONResponse output exactly
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def api_response(
+    message: str,
+    data: Any = None,
+    success: bool = True,
+    headers: Optional[Mapping[str, str]] = None
+) -> FastJSONResponse:
+    """The APIResponse envelope, encoded without model validation."""
+    return FastJSONResponse(
+        {"success": success, "message": message, "data": data},
+        headers=headers
+    )
@@ -0,0 +1,215 @@
+"""
+Response cache shared by every worker process on one machine (optional,
+SHARED_CACHE_PATH).
+
+The segment is a memory-mapped file, normally under /dev/shm, that every
+worker opens by name at startup. It holds:
+
+- the content generation: a counter any worker's write bumps, so every
+  worker stops serving responses rendered before it at once;
+- SHARED_CACHE_SLOTS direct-mapped slots, one rendered response each,
+  tagged with the generation they were rendered for and their freshness.
+
+A worker that misses its own micro-cache looks here before running the
+route, and publishes what it renders, so one render per URL and generation
+serves all workers. Access is serialized with flock(): readers share the
+lock, writers take it alone. Each hold is a copy of at most one slot.
+"""
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"QTSHM001"
+# magic, slot count, slot size, generation
+HEADER = struct.Struct("<8sIIQ")
+HEADER_SIZE = 64
+GENERATION_OFFSET = 16
+# key digest, generation, stored at, fresh until (wall clock), length
+SLOT_HEADER = struct.Struct("<16sQddI")
+SLOT_HEADER_SIZE = 64
+# status, header block length
+RECORD = struct.Struct("<HI")
+
+SharedResponse = Tuple[int, List[Tuple[bytes, bytes]], bytes, float, float]
+
+
+def _digest(key: tuple) -> bytes:
+    path, query = key
+    return hashlib.blake2b(path.encode("utf-8") + b"?" + query, digest_size=16).digest()
+
+
+def _encode(status: int, headers: List[Tuple[bytes, bytes]], body: bytes) -> bytes:
+    header_block = b"\r\n".join(name + b": " + value for name, value in headers)
+    return RECORD.pack(status, len(header_block)) + header_block + body
+
+
+def _decode(record: bytes) -> Tuple[int, List[Tuple[bytes, bytes]], bytes]:
+    status, header_length = RECORD.unpack_from(record)
+    start = RECORD.size
+    header_block = record[start:start + header_length]
+    headers = [
+        tuple(line.split(b": ", 1)) for line in header_block.split(b"\r\n")
+    ] if header_block else []
+    return status, headers, record[start + header_length:]
+
+
+class SharedCache:
+    """Closed (every lookup misses) until open() maps the segment."""
+
+    def __init__(self):
+        self._fd: Optional[int] = None
+        self._map: Optional[mmap.mmap] = None
+        self.slots = 0
+        self.slot_bytes = 0
+        # Per process, like the in-process caches
+        self.hits = 0
+        self.misses = 0
+        # flock() is per open file, not per thread
+        self._thread_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self._map is not None
+
+    def open(self, path: str, slots: int, slot_bytes: int) -> None:
+        """
+        Map ``path``, creating it (or starting it over) if it is missing or
+        laid out differently.
+        """
+        if fcntl is None:
+            logger.warning("Shared cache needs fcntl (POSIX); running without it")
+            return
+        slot_bytes = max(slot_bytes, SLOT_HEADER_SIZE + RECORD.size + 1)
+        size = HEADER_SIZE + slots * slot_bytes
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                header = os.pread(fd, HEADER.size, 0)
+                if len(header) < HEADER.size or HEADER.unpack(header)[:3] != (MAGIC, slots, slot_bytes):
+                    # New file or another layout: start over (the file stays sparse)
+                    os.ftruncate(fd, 0)
+                    os.ftruncate(fd, size)
+                    os.pwrite(fd, HEADER.pack(MAGIC, slots, slot_bytes, 0), 0)
+                mapped = mmap.mmap(fd, size)
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        except Exception:
+            os.close(fd)
+            raise
+        self._fd, self._map = fd, mapped
+        self.slots, self.slot_bytes = slots, slot_bytes
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            os.close(self._fd)
+            self._fd = self._map = None
+
+    @contextmanager
+    def _locked(self, operation: int) -> Iterator[None]:
+        with self._thread_lock:
+            fcntl.flock(self._fd, operation)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def generation(self) -> int:
+        with self._locked(fcntl.LOCK_SH):
+            return struct.unpack_from("<Q", self._map, GENERATION_OFFSET)[0]
+
+    def bump(self) -> int:
+        """Advance the generation for every worker; returns the new value."""
+        with self._locked(fcntl.LOCK_EX):
+            generation = struct.unpack_from("<Q", self._map, GENERATION_OFFSET)[0] + 1
+            struct.pack_into("<Q", self._map, GENERATION_OFFSET, generation)
+            return generation
+
+    def _slot(self, digest: bytes) -> int:
+        return HEADER_SIZE + int.from_bytes(digest[:8], "little") % self.slots * self.slot_bytes
+
+    def get(self, key: tuple, generation: int) -> Optional[SharedResponse]:
+        """
+        The response stored for ``key`` at ``generation``, as (status,
+        headers, body, stored_at, fresh_until) with wall-clock times.
+        """
+        if self._map is None:
+            return None
+        digest = _digest(key)
+        offset = self._slot(digest)
+        with self._locked(fcntl.LOCK_SH):
+            stored_digest, stored_generation, stored_at, fresh_until, length = SLOT_HEADER.unpack_from(
+                self._map, offset
+            )
+            found = stored_digest == digest and stored_generation == generation and length > 0
+            if found:
+                start = offset + SLOT_HEADER_SIZE
+                record = self._map[start:start + length]
+        if not found:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return _decode(record) + (stored_at, fresh_until)
+
+    def put(
+        self,
+        key: tuple,
+        generation: int,
+        status: int,
+        headers: List[Tuple[bytes, bytes]],
+        body: bytes,
+        fresh_for: float
+    ) -> bool:
+        """Store a response rendered at ``generation``; False if it does not fit."""
+        if self._map is None:
+            return False
+        record = _encode(status, headers, body)
+        if len(record) > self.slot_bytes - SLOT_HEADER_SIZE:
+            return False
+        digest = _digest(key)
+        offset = self._slot(digest)
+        now = time.time()
+        with self._locked(fcntl.LOCK_EX):
+            # A write landed while rendering: the response is already out of date
+            if struct.unpack_from("<Q", self._map, GENERATION_OFFSET)[0] != generation:
+                return False
+            start = offset + SLOT_HEADER_SIZE
+            self._map[start:start + len(record)] = record
+            SLOT_HEADER.pack_into(self._map, offset, digest, generation, now, now + fresh_for, len(record))
+        return True
+
+    def __len__(self) -> int:
+        """Slots holding a response for the current generation."""
+        if self._map is None:
+            return 0
+        with self._locked(fcntl.LOCK_SH):
+            generation = struct.unpack_from("<Q", self._map, GENERATION_OFFSET)[0]
+            slots = (
+                SLOT_HEADER.unpack_from(self._map, HEADER_SIZE + slot * self.slot_bytes)
+                for slot in range(self.slots)
+            )
+            # Never-written slots are zeroed, generation 0 included
+            return sum(
+                1 for _, stored_generation, _, _, length in slots
+                if stored_generation == generation and length > 0
+            )
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self), "hits": self.hits, "misses": self.misses}
+
+
+shared_cache = SharedCache()
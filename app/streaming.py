@@ -0,0 +1,147 @@
+"""
+Incremental JSON encoders and decoders for streaming requests/responses.
+
+Entries are serialized one at a time as they come off the database cursor,
+and uploads are decoded item by item as they arrive, so neither direction
+needs the whole payload in memory.
+"""
+import codecs
+import json
+from typing import Any, AsyncIterable, AsyncIterator
+from app.serializers import dumps
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+NUMBER_CHARS = "0123456789+-.eE"
+
+
+async def ndjson_lines(items: AsyncIterable[Any]) -> AsyncIterator[bytes]:
+    async for item in items:
+        yield dumps(item) + b"\n"
+
+
+async def json_envelope(
+    items: AsyncIterable[Any], message: str, empty_message: str
+) -> AsyncIterator[bytes]:
+    """
+    Stream the same ``{"success", "message", "data": [...]}`` envelope a
+    regular APIResponse would produce.
+    """
+    iterator = items.__aiter__()
+    try:
+        first = await iterator.__anext__()
+    except StopAsyncIteration:
+        first = None
+    header = {"success": True, "message": message if first is not None else empty_message}
+    # Drop the closing brace so the data array can be appended piecewise
+    yield dumps(header)[:-1] + b',"data":['
+    if first is not None:
+        yield dumps(first)
+        async for item in iterator:
+            yield b"," + dumps(item)
+    yield b"]}"
+
+
+class MalformedJSON(ValueError):
+    pass
+
+
+async def _decoded(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    # Incremental decoder: multi-byte characters may straddle chunk boundaries
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    async for chunk in chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+async def iter_ndjson(chunks: AsyncIterable[bytes]) -> AsyncIterator[Any]:
+    """
+    Yield one decoded value per non-blank line of an NDJSON upload.
+    A line that isn't valid JSON yields a MalformedJSON instance instead, so
+    the caller can report it and carry on with the next line.
+    """
+    buffer = ""
+    async for text in _decoded(chunks):
+        buffer += text
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            if line.strip():
+                yield _decode_line(line)
+    if buffer.strip():
+        yield _decode_line(buffer)
+
+
+def _decode_line(line: str) -> Any:
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        return MalformedJSON(str(e))
+
+
+async def iter_json_array(chunks: AsyncIterable[bytes]) -> AsyncIterator[Any]:
+    """
+    Yield the elements of a top-level JSON array as they arrive, without
+    buffering the whole upload. Raises MalformedJSON on a syntax error,
+    since the rest of the array can't be recovered.
+    """
+    decoder = json.JSONDecoder()
+    texts = _decoded(chunks).__aiter__()
+    buffer = ""
+    eof = False
+
+    async def fill() -> None:
+        nonlocal buffer, eof
+        try:
+            buffer += await texts.__anext__()
+        except StopAsyncIteration:
+            eof = True
+
+    async def next_significant() -> str:
+        # Skip whitespace, reading more input as needed; "" means end of input
+        nonlocal buffer
+        while True:
+            buffer = buffer.lstrip()
+            if buffer or eof:
+                return buffer[:1]
+            await fill()
+
+    if await next_significant() != "[":
+        raise MalformedJSON("Expected a JSON array")
+    buffer = buffer[1:]
+    expect_item = True
+    first = True
+    while True:
+        token = await next_significant()
+        if token == "]" and (first or not expect_item):
+            buffer = buffer[1:]
+            break
+        if not expect_item:
+            if token != ",":
+                raise MalformedJSON("Expected ',' or ']' between array items")
+            buffer = buffer[1:]
+            expect_item = True
+            continue
+        if token == "":
+            raise MalformedJSON("Unexpected end of JSON array")
+        try:
+            value, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError as e:
+            if eof:
+                raise MalformedJSON(str(e)) from e
+            await fill()
+            continue
+        if not eof and not buffer[end:].strip(NUMBER_CHARS):
+            # The buffer may end inside a number, which then decodes short:
+            # "1" + "2.5" as 1, "1e" + "3" as 1. Wait for a character that
+            # can't continue it.
+            await fill()
+            continue
+        buffer = buffer[end:]
+        yield value
+        expect_item = False
+        first = False
+    if await next_significant() != "":
+        raise MalformedJSON("Unexpected data after JSON array")
@@ -0,0 +1,91 @@
+"""
+Morning-notification burst: many clients asking for today's entry and the
+rotation counters at once, with and without the public read micro-cache.
+
+Each mode runs in a fresh process (the cache is configured at import) and
+starts cold, so the cached run includes the coalesced first render.
+
+Run this script: python -m benchmarks.burst --entries 10000 --clients 2000
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import subprocess
+import sys
+
+from benchmarks.common import asgi_client, run_concurrently, seed_database
+
+API = "/api/v1/quiet-time"
+PATHS = (
+    f"{API}/entries/today",
+    f"{API}/entries/rotation/days-remaining",
+    f"{API}/entries/rotation/entries-remaining",
+)
+
+
+async def child(args) -> dict:
+    from sqlalchemy import event
+    from app.database import read_async_engine
+    from app.main import app
+
+    statements = [0]
+
+    def count(*_):
+        statements[0] += 1
+
+    event.listen(read_async_engine.sync_engine, "before_cursor_execute", count)
+    paths = itertools.cycle(PATHS)
+    errors = 0
+
+    async with asgi_client(app) as client:
+        async def request():
+            nonlocal errors
+            response = await client.get(next(paths))
+            if response.status_code != 200:
+                errors += 1
+
+        result = await run_concurrently(request, args.clients, args.concurrency)
+    result["sql_statements"] = statements[0]
+    result["errors"] = errors
+    return result
+
+
+def run_mode(cached: bool, args) -> dict:
+    env = dict(os.environ)
+    if not cached:
+        env["MICRO_CACHE_TTL_SECONDS"] = "0"
+    output = subprocess.run(
+        [
+            sys.executable, "-m", "benchmarks.burst", "--child",
+            "--clients", str(args.clients), "--concurrency", str(args.concurrency)
+        ],
+        env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(args):
+    seed_database(args.entries)
+    results = {
+        "entries": args.entries,
+        "clients": args.clients,
+        "concurrency": args.concurrency,
+        "uncached": run_mode(False, args),
+        "cached": run_mode(True, args),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", type=int, default=10000)
+    parser.add_argument("--clients", type=int, default=2000, help="requests in the burst")
+    parser.add_argument("--concurrency", type=int, default=500, help="requests in flight at once")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parsed = parser.parse_args()
+    if parsed.child:
+        print(json.dumps(asyncio.run(child(parsed))))
+    else:
+        main(parsed)
@@ -0,0 +1,132 @@
+"""
+Shared helpers for the benchmark scripts: a throwaway SQLite database
+seeded with synthetic entries, an in-process ASGI client and latency stats.
+
+Import this module before anything from ``app`` - it points DATABASE_URL at
+the benchmark database, whatever the environment says, since seeding drops
+every table. Use use_database() to run against another database on purpose.
+"""
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from typing import Awaitable, Callable, Dict, List, Set
+
+DEFAULT_DATABASE_PATH = os.path.join(tempfile.gettempdir(), "quiet_time_bench.db")
+DEFAULT_DATABASE_URL = f"sqlite:///{DEFAULT_DATABASE_PATH}"
+os.environ["DATABASE_URL"] = DEFAULT_DATABASE_URL
+os.environ.pop("READ_DATABASE_URL", None)
+
+# Databases seed_database() may drop the tables of
+_disposable: Set[str] = {DEFAULT_DATABASE_URL}
+
+
+def use_database(url: str, drop_tables: bool = False) -> None:
+    """
+    Benchmark against ``url`` instead of the temporary SQLite file. Seeding
+    drops its tables, so it refuses unless ``drop_tables`` confirms that is
+    fine. Call before anything imports app.config.
+    """
+    os.environ["DATABASE_URL"] = url
+    if drop_tables:
+        _disposable.add(url)
+
+WORDS = (
+    "grace peace love joy hope faith light mercy truth rest strength "
+    "shepherd still waters soul path righteousness valley shadow comfort"
+).split()
+
+
+def _prose(seed: int, words: int) -> str:
+    return " ".join(WORDS[(seed * 7 + i * 3) % len(WORDS)] for i in range(words))
+
+
+def synthetic_entry(i: int) -> dict:
+    return {
+        "song_title": f"Song {i}",
+        "song_youtube_id": f"yt{i:08d}",
+        "scripture_reference": f"Psalm {i % 150 + 1}:{i % 20 + 1}",
+        "scripture_text": _prose(i, 120),
+        "prayer_title": f"Prayer {i}",
+        "prayer_content": _prose(i + 1, 220),
+        "rotation_position": i,
+    }
+
+
+def seed_database(entries: int, batch_size: int = 1000) -> None:
+    """Recreate the schema and insert ``entries`` synthetic rows."""
+    from sqlalchemy import insert
+    from sqlalchemy.engine import make_url
+    from app.config import settings
+    from app.database import Base, engine
+    from app.models import QuietTimeEntry
+
+    if settings.DATABASE_URL not in _disposable:
+        raise SystemExit(
+            f"Refusing to drop the tables of {make_url(settings.DATABASE_URL).render_as_string()}: "
+            "it is not the temporary benchmark database; pass --drop-tables to confirm"
+        )
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        for start in range(0, entries, batch_size):
+            rows = [synthetic_entry(i) for i in range(start, min(start + batch_size, entries))]
+            connection.execute(insert(QuietTimeEntry), rows)
+
+
+def create_admin(username: str, password: str) -> None:
+    from app.auth import get_password_hash
+    from app.database import SessionLocal
+    from app.models import Admin
+
+    db = SessionLocal()
+    try:
+        db.add(Admin(username=username, hashed_password=get_password_hash(password)))
+        db.commit()
+    finally:
+        db.close()
+
+
+def asgi_client(app, raise_app_exceptions: bool = True):
+    import httpx
+
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=raise_app_exceptions)
+    return httpx.AsyncClient(transport=transport, base_url="http://bench")
+
+
+def summarize(latencies: List[float], elapsed: float) -> Dict[str, float]:
+    ordered = sorted(latencies)
+
+    def percentile(p: float) -> float:
+        if not ordered:
+            return 0.0
+        index = min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))
+        return ordered[index] * 1000
+
+    return {
+        "requests": len(ordered),
+        "p50_ms": round(percentile(50), 3),
+        "p95_ms": round(percentile(95), 3),
+        "p99_ms": round(percentile(99), 3),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3) if ordered else 0.0,
+        "rps": round(len(ordered) / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+async def run_concurrently(
+    request: Callable[[], Awaitable[object]], total: int, concurrency: int
+) -> Dict[str, float]:
+    """Issue ``total`` calls of ``request`` with at most ``concurrency`` in flight."""
+    latencies: List[float] = []
+    remaining = iter(range(total))
+
+    async def worker():
+        for _ in remaining:
+            started = time.perf_counter()
+            await request()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - started)
@@ -0,0 +1,87 @@
+"""
+Concurrent-request latency with blocking vs non-blocking database access.
+
+The "blocking" mode reproduces the pre-async handlers: an ``async def`` route
+running a query through the synchronous engine, which stalls the event loop.
+The "async" mode runs the same query through the async engine used by the
+routers. While the DB-heavy route is under load, probes poll the cheap public
+routes and record how long they take to answer.
+
+Run this script: python -m benchmarks.concurrency --entries 20000
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.common import asgi_client, run_concurrently, seed_database, summarize
+
+# DB-side work with almost no Python: a full scan that never matches
+SLOW_QUERY = "SELECT count(*) FROM quiet_time_entries WHERE scripture_text LIKE '%no such phrase%'"
+
+
+def build_app():
+    from sqlalchemy import text
+    from app.database import AsyncSessionLocal, SessionLocal
+    from app.main import app
+
+    @app.get("/bench/blocking")
+    async def blocking_query():
+        db = SessionLocal()
+        try:
+            return {"count": db.execute(text(SLOW_QUERY)).scalar()}
+        finally:
+            db.close()
+
+    @app.get("/bench/async")
+    async def async_query():
+        async with AsyncSessionLocal() as db:
+            return {"count": (await db.execute(text(SLOW_QUERY))).scalar()}
+
+    return app
+
+
+async def probe(client, path: str, done: asyncio.Event) -> dict:
+    """Poll ``path`` every few milliseconds until the load finishes."""
+    latencies = []
+    started = time.perf_counter()
+    while not done.is_set():
+        sent = time.perf_counter()
+        await client.get(path)
+        latencies.append(time.perf_counter() - sent)
+        await asyncio.sleep(0.005)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+async def measure(app, mode: str, total: int, concurrency: int) -> dict:
+    async with asgi_client(app) as client:
+        done = asyncio.Event()
+        probes = [
+            asyncio.create_task(probe(client, "/health", done)),
+            asyncio.create_task(probe(client, "/api/v1/quiet-time/entries/today", done)),
+        ]
+        await asyncio.sleep(0)
+        db_route = await run_concurrently(lambda: client.get(f"/bench/{mode}"), total, concurrency)
+        done.set()
+        health, today = await asyncio.gather(*probes)
+        return {"db_route": db_route, "probe_health": health, "probe_today": today}
+
+
+async def main(args):
+    seed_database(args.entries)
+    app = build_app()
+    results = {
+        "entries": args.entries,
+        "concurrency": args.concurrency,
+        "blocking": await measure(app, "blocking", args.requests, args.concurrency),
+        "async": await measure(app, "async", args.requests, args.concurrency),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", type=int, default=20000)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,80 @@
+"""
+Public-endpoint latency during a login storm.
+
+"inline" mode verifies bcrypt hashes directly on the event loop (the old
+behaviour); "offloaded" mode uses the bounded password pool from app.auth.
+While the logins run, a probe polls /entries/today and records its latency.
+
+Run this script: python -m benchmarks.login_storm --logins 40 --concurrency 20
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.common import asgi_client, create_admin, run_concurrently, seed_database, summarize
+
+USERNAME = "bench-admin"
+PASSWORD = "bench-password"
+
+
+async def probe(client, done: asyncio.Event) -> dict:
+    latencies = []
+    started = time.perf_counter()
+    while not done.is_set():
+        sent = time.perf_counter()
+        await client.get("/api/v1/quiet-time/entries/today")
+        latencies.append(time.perf_counter() - sent)
+        await asyncio.sleep(0.005)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+async def measure(app, logins: int, concurrency: int) -> dict:
+    async with asgi_client(app) as client:
+        baseline = await run_concurrently(
+            lambda: client.get("/api/v1/quiet-time/entries/today"), 50, 1
+        )
+        done = asyncio.Event()
+        probe_task = asyncio.create_task(probe(client, done))
+        await asyncio.sleep(0)
+        login = await run_concurrently(
+            lambda: client.post("/api/v1/auth/login", json={"username": USERNAME, "password": PASSWORD}),
+            logins,
+            concurrency
+        )
+        done.set()
+        return {"today_idle": baseline, "login": login, "today_during_storm": await probe_task}
+
+
+async def main(args):
+    import app.auth
+    from app.main import app as asgi_app
+
+    seed_database(args.entries)
+    create_admin(USERNAME, PASSWORD)
+
+    offloaded = app.auth.verify_password_async
+
+    async def inline(plain_password: str, hashed_password: str) -> bool:
+        return app.auth.verify_password(plain_password, hashed_password)
+
+    app.auth.verify_password_async = inline
+    inline_results = await measure(asgi_app, args.logins, args.concurrency)
+    app.auth.verify_password_async = offloaded
+    offloaded_results = await measure(asgi_app, args.logins, args.concurrency)
+
+    print(json.dumps({
+        "entries": args.entries,
+        "logins": args.logins,
+        "concurrency": args.concurrency,
+        "inline": inline_results,
+        "offloaded": offloaded_results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", type=int, default=1000)
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,108 @@
+"""
+Overload: a spike of full-list dumps and logins while clients keep asking
+for today's entry, with admission control on and off.
+
+Each mode runs in a fresh process (the limits are configured at import) and
+the micro-cache is off, so every list request reaches the database. Reports
+today's latency during the spike, and how many heavy and login requests were
+served or turned away with 503.
+
+Run this script: python -m benchmarks.overload --entries 10000 --heavy 200 --logins 40
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import Counter
+
+from benchmarks.common import asgi_client, create_admin, run_concurrently, seed_database, summarize
+
+API = "/api/v1/quiet-time"
+USERNAME = "bench-admin"
+PASSWORD = "bench-password"
+
+
+async def probe(client, done: asyncio.Event) -> dict:
+    latencies = []
+    started = time.perf_counter()
+    while not done.is_set():
+        sent = time.perf_counter()
+        await client.get(f"{API}/entries/today")
+        latencies.append(time.perf_counter() - sent)
+        await asyncio.sleep(0.005)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+async def child(args) -> dict:
+    from app.main import app
+
+    heavy, logins = Counter(), Counter()
+    async with asgi_client(app) as client:
+        async def dump():
+            heavy[(await client.get(f"{API}/entries?fields=*")).status_code] += 1
+
+        async def login():
+            response = await client.post(
+                "/api/v1/auth/login", json={"username": USERNAME, "password": PASSWORD}
+            )
+            logins[response.status_code] += 1
+
+        idle = await run_concurrently(lambda: client.get(f"{API}/entries/today"), 50, 1)
+        done = asyncio.Event()
+        probe_task = asyncio.create_task(probe(client, done))
+        started = time.perf_counter()
+        await asyncio.gather(
+            run_concurrently(dump, args.heavy, args.concurrency),
+            run_concurrently(login, args.logins, args.concurrency)
+        )
+        spike_seconds = time.perf_counter() - started
+        done.set()
+        return {
+            "today_idle": idle,
+            "today_during_spike": await probe_task,
+            "spike_seconds": round(spike_seconds, 2),
+            "heavy_status": {str(status): count for status, count in sorted(heavy.items())},
+            "login_status": {str(status): count for status, count in sorted(logins.items())},
+        }
+
+
+def run_mode(limited: bool, args) -> dict:
+    env = dict(os.environ, MICRO_CACHE_TTL_SECONDS="0", ADMISSION_CONTROL_ENABLED=str(limited).lower())
+    output = subprocess.run(
+        [
+            sys.executable, "-m", "benchmarks.overload", "--child",
+            "--heavy", str(args.heavy), "--logins", str(args.logins), "--concurrency", str(args.concurrency)
+        ],
+        env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(args):
+    seed_database(args.entries)
+    create_admin(USERNAME, PASSWORD)
+    results = {
+        "entries": args.entries,
+        "heavy": args.heavy,
+        "logins": args.logins,
+        "unlimited": run_mode(False, args),
+        "admission_control": run_mode(True, args),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", type=int, default=10000)
+    parser.add_argument("--heavy", type=int, default=200, help="full-list requests in the spike")
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=100, help="requests in flight per kind")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parsed = parser.parse_args()
+    if parsed.child:
+        print(json.dumps(asyncio.run(child(parsed))))
+    else:
+        main(parsed)
@@ -0,0 +1,108 @@
+"""
+In-memory read model: memory held per table size, load time, and public
+read latency served from the database versus from the model.
+
+Load time is from an untraced load; memory is what tracemalloc sees
+allocated by a second load and still alive afterwards. Entries are the synthetic ones from benchmarks.common (about
+0.9 KB of scripture and 1.6 KB of prayer text each), so scale the result by
+your real average entry size. The micro-cache is bypassed so every request
+reaches the route.
+
+Run this script: python -m benchmarks.read_model --entries 1000,10000,50000
+"""
+import argparse
+import asyncio
+import gc
+import json
+import time
+import tracemalloc
+
+from benchmarks.common import asgi_client, run_concurrently, seed_database
+
+API = "/api/v1/quiet-time"
+SCENARIOS = {
+    "today": f"{API}/entries/today",
+    "rotation_status": f"{API}/entries/rotation/status",
+    "entries_page": f"{API}/entries?limit=20",
+    "entries_page_full": f"{API}/entries?limit=100&fields=*",
+    "entries_summary_all": f"{API}/entries",
+}
+
+
+async def measure_load(read_model) -> dict:
+    read_model.store = None
+    gc.collect()
+    started = time.perf_counter()
+    await read_model.load()
+    elapsed = time.perf_counter() - started
+
+    read_model.store = None
+    gc.collect()
+    tracemalloc.start()
+    await read_model.load()
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "load_ms": round(elapsed * 1000, 1),
+        "retained_mib": round(retained / 2 ** 20, 2),
+        "peak_mib": round(peak / 2 ** 20, 2),
+        "bytes_per_entry": round(retained / max(len(read_model.store), 1)),
+    }
+
+
+async def measure_routes(app, counter, args) -> dict:
+    results = {}
+    async with asgi_client(app) as client:
+        for name, path in SCENARIOS.items():
+            async def request():
+                response = await client.get(path)
+                response.raise_for_status()
+
+            total = max(1, args.requests // 10) if name == "entries_summary_all" else args.requests
+            before = counter[0]
+            results[name] = await run_concurrently(request, total, args.concurrency)
+            results[name]["sql_per_request"] = round((counter[0] - before) / total, 2)
+    return results
+
+
+async def main(args):
+    from sqlalchemy import event
+    from app import read_model
+    from app.config import settings
+    from app.database import read_async_engine
+
+    # Measure the routes, not the response cache in front of them
+    settings.MICRO_CACHE_TTL_SECONDS = 0
+    from app.main import app
+
+    counter = [0]
+
+    def count(*_):
+        counter[0] += 1
+
+    event.listen(read_async_engine.sync_engine, "before_cursor_execute", count)
+
+    results = {}
+    for entries in (int(value) for value in args.entries.split(",")):
+        seed_database(entries)
+        read_model.store = None
+        database = await measure_routes(app, counter, args)
+        memory = await measure_load(read_model)
+        in_memory = await measure_routes(app, counter, args)
+        read_model.store = None
+        results[str(entries)] = {
+            "memory": memory,
+            "memory_per_10k_entries_mib": round(memory["retained_mib"] / entries * 10000, 2),
+            "database": database,
+            "read_model": in_memory,
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", default="1000,10000", help="comma-separated table sizes")
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=8)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,64 @@
+"""
+Search latency: the indexed query (FTS5 on SQLite, tsvector + GIN on
+PostgreSQL) versus an ILIKE scan over the same five columns, one page of
+results per query.
+
+The synthetic prose reuses a small vocabulary, so single common words match
+nearly every row: ranking then has to score all of them, while the unranked
+scan stops after one page. Selective queries (a reference, a title) are
+where the index pays off, and the gap grows with the table.
+
+Run this script: python -m benchmarks.search --sizes 1000,10000,100000
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.common import seed_database
+
+# From selective to matching almost everything
+QUERIES = ("song 4242", "psalm 23", "still waters", "shepherd")
+
+
+async def timed_query(build, repeat: int, page_size: int) -> dict:
+    from app.database import AsyncSessionLocal
+
+    timings = []
+    rows = []
+    async with AsyncSessionLocal() as db:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            rows = (await db.execute(build().limit(page_size))).all()
+            timings.append(time.perf_counter() - started)
+    return {"best_ms": round(min(timings) * 1000, 3), "rows": len(rows)}
+
+
+async def main(args):
+    from app.database import async_engine
+    from app.search import ilike_query, search_query, search_terms
+
+    dialect = async_engine.dialect.name
+    fields = ("id", "song.title", "scripture.reference")
+    results = {"dialect": dialect, "sizes": {}}
+    for size in (int(value) for value in args.sizes.split(",")):
+        seed_database(size)
+        per_query = {}
+        for q in QUERIES:
+            indexed = await timed_query(lambda: search_query(dialect, q, fields), args.repeat, args.page_size)
+            scan = await timed_query(lambda: ilike_query(search_terms(q), fields), args.repeat, args.page_size)
+            per_query[q] = {
+                "indexed": indexed,
+                "ilike": scan,
+                "speedup": round(scan["best_ms"] / indexed["best_ms"], 2) if indexed["best_ms"] else None,
+            }
+        results["sizes"][size] = per_query
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--page-size", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
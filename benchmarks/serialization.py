@@ -0,0 +1,82 @@
+"""
+List serialization throughput: ORM rows + per-row Pydantic models (the old
+path) versus Core column tuples encoded straight to bytes (app.serializers).
+Fails loudly if the two paths ever produce different bytes.
+
+Run this script: python -m benchmarks.serialization --sizes 1000,10000,100000
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.common import seed_database
+
+
+async def legacy_body() -> bytes:
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+    from sqlalchemy import select
+    from app.database import AsyncSessionLocal
+    from app.models import QuietTimeEntry
+    from app.routers.quiet_time import format_entry
+    from app.schemas import APIResponse
+
+    async with AsyncSessionLocal() as db:
+        entries = (await db.scalars(
+            select(QuietTimeEntry).order_by(QuietTimeEntry.created_at.desc(), QuietTimeEntry.id.desc())
+        )).all()
+    response = APIResponse(
+        success=True,
+        message="Entries retrieved successfully",
+        data=[format_entry(entry) for entry in entries]
+    )
+    return JSONResponse(jsonable_encoder(response)).body
+
+
+async def fast_body() -> bytes:
+    from app.database import AsyncSessionLocal
+    from app.models import QuietTimeEntry
+    from app.serializers import api_response, entry_to_dict, select_entries
+
+    async with AsyncSessionLocal() as db:
+        rows = (await db.execute(
+            select_entries().order_by(QuietTimeEntry.created_at.desc(), QuietTimeEntry.id.desc())
+        )).all()
+    return api_response("Entries retrieved successfully", [entry_to_dict(row) for row in rows]).body
+
+
+async def timed(build, repeat: int) -> dict:
+    timings = []
+    body = b""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = await build()
+        timings.append(time.perf_counter() - started)
+    best = min(timings)
+    return {"best_ms": round(best * 1000, 2), "lists_per_sec": round(1 / best, 2), "bytes": len(body)}, body
+
+
+async def main(args):
+    from app.serializers import orjson
+
+    results = {"encoder": "orjson" if orjson is not None else "json", "sizes": {}}
+    for size in (int(value) for value in args.sizes.split(",")):
+        seed_database(size)
+        legacy, legacy_bytes = await timed(legacy_body, args.repeat)
+        fast, fast_bytes = await timed(fast_body, args.repeat)
+        if legacy_bytes != fast_bytes:
+            raise SystemExit(f"Response bytes differ at {size} entries")
+        results["sizes"][size] = {
+            "legacy": legacy,
+            "fast": fast,
+            "speedup": round(legacy["best_ms"] / fast["best_ms"], 2),
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--repeat", type=int, default=3)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,358 @@
+"""
+End-to-end benchmark suite: every route, driven through the in-process ASGI
+client against a seeded database.
+
+For each table size and scenario it reports p50/p95/p99 latency, requests
+per second, SQL statements per request, errors, and memory allocated while
+serving (a separate tracemalloc pass, so tracing doesn't skew latency).
+Read routes run first; writes run last, and deletes only remove rows
+created by the suite.
+
+Results are JSON. Save one run as a baseline and pass it to the next run to
+get per-scenario deltas:
+
+    python -m benchmarks.suite --entries 10000,100000 --output baseline.json
+    python -m benchmarks.suite --entries 10000,100000 --baseline baseline.json --fail-on-regression
+
+PostgreSQL: pass --database-url together with --drop-tables. The suite drops
+and recreates the tables, so never point it at a real database. DATABASE_URL
+from the environment is ignored.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from benchmarks.common import asgi_client, create_admin, run_concurrently, seed_database, use_database
+
+USERNAME = "bench-admin"
+PASSWORD = "bench-password"
+API = "/api/v1/quiet-time"
+
+# today_many_zones cycles through these; most share a local date at any moment
+TIME_ZONES = itertools.cycle((
+    "America/Los_Angeles", "America/New_York", "Europe/London", "Europe/Berlin",
+    "Asia/Kolkata", "Asia/Tokyo", "Australia/Sydney", "+05:30", "-03:00",
+))
+# Compared against the baseline, in percent
+LATENCY_KEYS = ("p50_ms", "p95_ms", "p99_ms")
+
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    # Called with the shared run context, returns (path, request kwargs)
+    request: Callable[["RunContext"], tuple]
+    # Fraction of --requests to send (for the very heavy routes)
+    weight: float = 1.0
+    write: bool = False
+
+
+class RunContext:
+    def __init__(self, entries: int, token: str, etag_today: str, changes_cursor: Optional[str]):
+        self.entries = entries
+        self.auth = {"Authorization": f"Bearer {token}"}
+        self.etag_today = etag_today
+        # Points at the newest seeded row, so a sync from it finds nothing new
+        self.changes_cursor = changes_cursor
+        self.created_ids: List[str] = []
+        self._counter = itertools.count()
+
+    def next(self) -> int:
+        return next(self._counter)
+
+
+def _entry_body(i: int) -> dict:
+    return {
+        "song": {"title": f"Bench song {i}", "youtubeId": f"bench{i:06d}"},
+        "scripture": {"reference": f"John {i % 21 + 1}:{i % 30 + 1}", "text": "Bench scripture text " * 20},
+        "prayer": {"title": f"Bench prayer {i}", "content": "Bench prayer content " * 40},
+    }
+
+
+def _existing_id(ctx: RunContext) -> int:
+    # Seeded ids are 1..entries
+    return ctx.next() % ctx.entries + 1
+
+
+def _pop_created(ctx: RunContext) -> tuple:
+    entry_id = ctx.created_ids.pop() if ctx.created_ids else 0
+    return f"{API}/entries/{entry_id}", {"headers": ctx.auth}
+
+
+# Entries touched per batch update/delete request
+BATCH_SIZE = 20
+
+
+def _batch_update(ctx: RunContext) -> tuple:
+    entries = [{"id": _existing_id(ctx), "song": {"title": f"Batch song {ctx.next()}"}} for _ in range(BATCH_SIZE)]
+    # Ids wrap around on small tables; a batch may not repeat one
+    unique = list({entry["id"]: entry for entry in entries}.values())
+    return f"{API}/entries/batch", {"json": {"entries": unique}, "headers": ctx.auth}
+
+
+def _batch_delete(ctx: RunContext) -> tuple:
+    ids = [ctx.created_ids.pop() for _ in range(min(BATCH_SIZE, len(ctx.created_ids)))] or [0]
+    return f"{API}/entries/batch", {"json": {"ids": ids}, "headers": ctx.auth}
+
+
+SCENARIOS = (
+    Scenario("health", "GET", lambda ctx: ("/health", {})),
+    Scenario("today", "GET", lambda ctx: (f"{API}/entries/today", {})),
+    Scenario("today_many_zones", "GET", lambda ctx: (
+        f"{API}/entries/today", {"params": {"tz": next(TIME_ZONES)}}
+    )),
+    Scenario("today_not_modified", "GET", lambda ctx: (
+        f"{API}/entries/today", {"headers": {"If-None-Match": ctx.etag_today}}
+    )),
+    Scenario("entries_page", "GET", lambda ctx: (f"{API}/entries", {"params": {"limit": 20}})),
+    Scenario("entries_page_full", "GET", lambda ctx: (f"{API}/entries", {"params": {"limit": 100, "fields": "*"}})),
+    Scenario("entries_summary_all", "GET", lambda ctx: (f"{API}/entries", {}), weight=0.1),
+    Scenario("entries_stream_ndjson", "GET", lambda ctx: (
+        f"{API}/entries", {"params": {"stream": "ndjson", "fields": "*"}}
+    ), weight=0.05),
+    Scenario("search", "GET", lambda ctx: (
+        f"{API}/entries/search", {"params": {"q": "psalm 23"}, "headers": ctx.auth}
+    )),
+    Scenario("changes_first_page", "GET", lambda ctx: (f"{API}/entries/changes", {})),
+    Scenario("changes_up_to_date", "GET", lambda ctx: (
+        f"{API}/entries/changes", {"params": {"since": ctx.changes_cursor}}
+    )),
+    Scenario("schedule_30d", "GET", lambda ctx: (f"{API}/entries/schedule", {"params": {"days": 30}})),
+    Scenario("rotation_status", "GET", lambda ctx: (f"{API}/entries/rotation/status", {})),
+    Scenario("rotation_days_remaining", "GET", lambda ctx: (f"{API}/entries/rotation/days-remaining", {})),
+    Scenario("rotation_entries_remaining", "GET", lambda ctx: (f"{API}/entries/rotation/entries-remaining", {})),
+    Scenario("login", "POST", lambda ctx: (
+        "/api/v1/auth/login", {"json": {"username": USERNAME, "password": PASSWORD}}
+    ), weight=0.1),
+    Scenario("create", "POST", lambda ctx: (
+        f"{API}/entries", {"json": _entry_body(ctx.next()), "headers": ctx.auth}
+    ), weight=0.25, write=True),
+    Scenario("update", "PATCH", lambda ctx: (
+        f"{API}/entries/{_existing_id(ctx)}", {"json": _entry_body(ctx.next()), "headers": ctx.auth}
+    ), weight=0.25, write=True),
+    Scenario("update_batch", "PATCH", _batch_update, weight=0.05, write=True),
+    Scenario("delete", "DELETE", _pop_created, weight=0.1, write=True),
+    Scenario("delete_batch", "DELETE", _batch_delete, weight=0.05, write=True),
+)
+
+
+class StatementCounter:
+    """Counts SQL statements sent by the async engine."""
+
+    def __init__(self, engine):
+        from sqlalchemy import event
+
+        self.count = 0
+        event.listen(engine.sync_engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args) -> None:
+        self.count += 1
+
+
+def latest_change_cursor() -> Optional[str]:
+    from sqlalchemy import select
+    from app.database import engine
+    from app.models import QuietTimeEntry
+    from app.pagination import encode_cursor
+
+    with engine.connect() as connection:
+        latest = connection.execute(
+            select(QuietTimeEntry.updated_at, QuietTimeEntry.id)
+            .order_by(QuietTimeEntry.updated_at.desc(), QuietTimeEntry.id.desc())
+            .limit(1)
+        ).first()
+    return encode_cursor(*latest) if latest else None
+
+
+def reset_caches() -> None:
+    """Process-local caches must not carry state across reseeds."""
+    from app import microcache
+    from app.auth import admin_cache
+    from app.compression import compressed_cache
+    from app.rotation import invalidate_rotation_state
+
+    admin_cache.clear()
+    compressed_cache.clear()
+    invalidate_rotation_state()
+    microcache.invalidate()
+
+
+async def run_scenario(client, scenario: Scenario, ctx: RunContext, args, counter: StatementCounter) -> dict:
+    total = max(1, int(args.requests * scenario.weight))
+    errors = 0
+
+    async def send():
+        nonlocal errors
+        path, kwargs = scenario.request(ctx)
+        response = await client.request(scenario.method, path, **kwargs)
+        # The envelope always starts with "success", so no need to parse large bodies
+        if response.status_code >= 400 or response.content.startswith(b'{"success":false'):
+            errors += 1
+        elif scenario.name == "create":
+            ctx.created_ids.append(response.json()["data"]["id"])
+        return response
+
+    # Warm-up (caches, pools) is not measured
+    for _ in range(min(args.warmup, total)):
+        await send()
+    errors = 0
+
+    statements_before = counter.count
+    result = await run_concurrently(send, total, args.concurrency)
+    result["sql_per_request"] = round((counter.count - statements_before) / total, 2)
+    result["errors"] = errors
+
+    # Memory: a short sequential pass under tracemalloc
+    samples = max(1, min(args.memory_samples, total))
+    tracemalloc.start()
+    for _ in range(samples):
+        await send()
+    allocated, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    result["alloc_peak_kib"] = round(peak / 1024, 1)
+    result["alloc_retained_kib"] = round(allocated / 1024, 1)
+    return result
+
+
+async def run_size(app, entries: int, args, counter: StatementCounter) -> dict:
+    seed_database(entries)
+    create_admin(USERNAME, PASSWORD)
+    reset_caches()
+
+    headers = {"Accept-Encoding": args.accept_encoding} if args.accept_encoding else {}
+    # Server errors count as failed requests instead of aborting the run
+    async with asgi_client(app, raise_app_exceptions=False) as client:
+        client.headers.update(headers)
+        login = await client.post("/api/v1/auth/login", json={"username": USERNAME, "password": PASSWORD})
+        today = await client.get(f"{API}/entries/today")
+        ctx = RunContext(
+            entries, login.json()["data"]["token"], today.headers.get("etag", ""), latest_change_cursor()
+        )
+
+        selected = [s for s in SCENARIOS if not args.only or s.name in args.only]
+        if args.skip_writes:
+            selected = [s for s in selected if not s.write]
+        results = {}
+        for scenario in selected:
+            results[scenario.name] = await run_scenario(client, scenario, ctx, args, counter)
+            print(f"  {entries:>7} {scenario.name:<28} p95 {results[scenario.name]['p95_ms']:>9} ms", file=sys.stderr)
+        return results
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _delta(current: float, baseline: float) -> Optional[float]:
+    if not baseline:
+        return None
+    return round((current - baseline) / baseline * 100, 1)
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> dict:
+    """
+    Percent change per scenario. A scenario regresses when any latency
+    percentile grows, or requests/sec drops, by more than ``tolerance``
+    percent, or when it issues more SQL statements than before.
+    """
+    comparison = {"tolerance_pct": tolerance, "regressions": [], "sizes": {}}
+    for size, scenarios in results["sizes"].items():
+        base_scenarios = baseline.get("sizes", {}).get(size)
+        if not base_scenarios:
+            continue
+        per_size = {}
+        for name, current in scenarios.items():
+            previous = base_scenarios.get(name)
+            if not previous:
+                continue
+            change = {key: _delta(current[key], previous[key]) for key in LATENCY_KEYS + ("rps",)}
+            change["sql_per_request"] = round(current["sql_per_request"] - previous["sql_per_request"], 2)
+            regressed = (
+                any(change[key] is not None and change[key] > tolerance for key in LATENCY_KEYS)
+                or (change["rps"] is not None and change["rps"] < -tolerance)
+                or change["sql_per_request"] > 0
+            )
+            change["regressed"] = regressed
+            if regressed:
+                comparison["regressions"].append(f"{size}:{name}")
+            per_size[name] = change
+        comparison["sizes"][size] = per_size
+    return comparison
+
+
+async def main(args):
+    from app.database import async_engine
+    from app.main import app
+
+    counter = StatementCounter(async_engine)
+    results = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "dialect": async_engine.dialect.name,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "accept_encoding": args.accept_encoding,
+        },
+        "sizes": {},
+    }
+    for entries in (int(value) for value in args.entries.split(",")):
+        results["sizes"][str(entries)] = await run_size(app, entries, args, counter)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            results["comparison"] = compare(results, json.load(f), args.tolerance)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    print(output)
+
+    if args.fail_on_regression and results.get("comparison", {}).get("regressions"):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", default="10000", help="comma-separated table sizes")
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario (before weighting)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--memory-samples", type=int, default=10)
+    parser.add_argument("--accept-encoding", default="gzip")
+    parser.add_argument("--only", nargs="*", help="scenario names to run")
+    parser.add_argument("--skip-writes", action="store_true")
+    parser.add_argument("--database-url", help="defaults to a temporary SQLite file")
+    parser.add_argument(
+        "--drop-tables", action="store_true", help="confirm --database-url may be wiped and reseeded"
+    )
+    parser.add_argument("--output", help="also write the JSON to this file")
+    parser.add_argument("--baseline", help="JSON from an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=10.0, help="allowed change in percent")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parsed = parser.parse_args()
+    if parsed.database_url:
+        # Must happen before anything imports app.config
+        use_database(parsed.database_url, drop_tables=parsed.drop_tables)
+    # Measure the routes, not the load shedding in front of them (see benchmarks.overload)
+    os.environ.setdefault("ADMISSION_CONTROL_ENABLED", "false")
+    # nor cache hits, which would hide a slower query path (see benchmarks.burst)
+    os.environ.setdefault("MICRO_CACHE_TTL_SECONDS", "0")
+    asyncio.run(main(parsed))
@@ -0,0 +1,141 @@
+"""
+Several uvicorn workers on one machine, with the micro-cache per worker and
+with the shared cache (SHARED_CACHE_PATH) on top of it.
+
+Each mode starts a real `uvicorn --workers N` server. A burst of requests
+for today's entry and the rotation counters, each on a new connection so they
+spread across the workers, reports latency and the SQL statements issued
+(summed from the X-DB-Query-Count header). Then an admin renames today's
+entry several times; after each rename, reads on fresh connections count how
+many still returned the old title.
+
+Run this script: python -m benchmarks.workers --workers 4 --entries 10000
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.common import create_admin, run_concurrently, seed_database
+
+API = "/api/v1/quiet-time"
+PATHS = (
+    f"{API}/entries/today",
+    f"{API}/entries/rotation/days-remaining",
+    f"{API}/entries/rotation/entries-remaining",
+)
+USERNAME = "bench-admin"
+PASSWORD = "bench-password"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int, workers: int, shared_path: str = None) -> subprocess.Popen:
+    env = dict(os.environ, SQL_PROFILING="true", SLOW_QUERY_MS="0")
+    if shared_path:
+        env["SHARED_CACHE_PATH"] = shared_path
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--port", str(port), "--workers", str(workers), "--log-level", "warning"
+        ],
+        env=env
+    )
+
+
+async def wait_until_up(client, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except Exception:
+            if time.monotonic() > deadline:
+                raise
+        await asyncio.sleep(0.2)
+
+
+async def measure(port: int, args) -> dict:
+    import httpx
+
+    # No keep-alive, so every request may land on a different worker
+    client = httpx.AsyncClient(
+        base_url=f"http://127.0.0.1:{port}", limits=httpx.Limits(max_keepalive_connections=0)
+    )
+    async with client:
+        await wait_until_up(client)
+        # Give every worker time to finish its startup
+        await asyncio.sleep(1)
+
+        paths = itertools.cycle(PATHS)
+        statements = [0]
+
+        async def request():
+            response = await client.get(next(paths))
+            response.raise_for_status()
+            statements[0] += int(response.headers.get("x-db-query-count", 0))
+
+        burst = await run_concurrently(request, args.requests, args.concurrency)
+        burst["sql_statements"] = statements[0]
+
+        token = (await client.post(
+            "/api/v1/auth/login", json={"username": USERNAME, "password": PASSWORD}
+        )).json()["data"]["token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        stale = 0
+        for round_number in range(args.rounds):
+            # SQLite timestamps (and so ETags) have one-second resolution
+            await asyncio.sleep(1.1)
+            today = (await client.get(f"{API}/entries/today")).json()["data"]
+            title = f"Renamed {round_number}"
+            update = dict(today, song=dict(today["song"], title=title))
+            (await client.patch(f"{API}/entries/{today['id']}", json=update, headers=headers)).raise_for_status()
+            for _ in range(args.reads):
+                data = (await client.get(f"{API}/entries/today")).json()["data"]
+                stale += data["song"]["title"] != title
+        return {"burst": burst, "stale_reads_after_write": stale, "reads_after_write": args.rounds * args.reads}
+
+
+def run_mode(shared: bool, args) -> dict:
+    port = free_port()
+    with tempfile.TemporaryDirectory(dir="/dev/shm" if os.path.isdir("/dev/shm") else None) as directory:
+        server = start_server(port, args.workers, os.path.join(directory, "cache") if shared else None)
+        try:
+            return asyncio.run(measure(port, args))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+def main(args):
+    seed_database(args.entries)
+    create_admin(USERNAME, PASSWORD)
+    results = {
+        "entries": args.entries,
+        "workers": args.workers,
+        "per_worker": run_mode(False, args),
+        "shared": run_mode(True, args),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=5, help="admin writes in the freshness check")
+    parser.add_argument("--reads", type=int, default=20, help="reads after each write")
+    main(parser.parse_args())
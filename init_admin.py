@@ -1,15 +1,13 @@
 """
 Script to initialize the admin user in the database.
-Run this script once to create the admin account.
+Run `alembic upgrade head` first, then run this script once to create the
+admin account.
 """
 from sqlalchemy.orm import Session
-from app.database import SessionLocal, engine, Base
+from app.database import SessionLocal
 from app.models import Admin
 from app.auth import get_password_hash
 
-# Create tables if they don't exist
-Base.metadata.create_all(bind=engine)
-
 
 def init_admin():
     db: Session = SessionLocal()
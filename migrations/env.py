@@ -0,0 +1,61 @@
+"""
+Alembic environment. Runs migrations with the app's synchronous engine, so
+DATABASE_URL and the pool settings come from app.config.
+"""
+from logging.config import fileConfig
+from alembic import context
+from app.database import Base, engine
+import app.models  # noqa: F401 - registers the tables on Base.metadata
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+# Search index objects are created with raw DDL (see app.models), not from the
+# metadata, so autogenerate must not try to drop them
+IGNORED_TABLES = ("quiet_time_entries_fts",)
+IGNORED_COLUMNS = ("search_vector",)
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    if type_ == "table" and name.startswith(IGNORED_TABLES):
+        return False
+    if type_ == "column" and name in IGNORED_COLUMNS:
+        return False
+    if type_ == "index" and name == "ix_quiet_time_entries_search":
+        return False
+    return True
+
+
+def run_migrations_offline() -> None:
+    context.configure(
+        url=engine.url.render_as_string(hide_password=False),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        include_object=include_object,
+        render_as_batch=engine.dialect.name == "sqlite",
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    with engine.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+            # SQLite can't ALTER most things in place; batch mode rebuilds the table
+            render_as_batch=connection.dialect.name == "sqlite",
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,59 @@
+"""Initial schema: admins and quiet_time_entries
+
+Revision ID: 0001
+Revises:
+Create Date: 2025-01-01
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Databases created by the app before Alembic already have these tables;
+    # leave them as they are so `alembic upgrade head` can run on them
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "admins" not in existing:
+        _create_admins()
+    if "quiet_time_entries" not in existing:
+        _create_quiet_time_entries()
+
+
+def _create_admins() -> None:
+    op.create_table(
+        "admins",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("username", sa.String(length=100), nullable=False),
+        sa.Column("hashed_password", sa.String(length=255), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_admins_id", "admins", ["id"])
+    op.create_index("ix_admins_username", "admins", ["username"], unique=True)
+
+
+def _create_quiet_time_entries() -> None:
+    op.create_table(
+        "quiet_time_entries",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("song_title", sa.String(length=255), nullable=False),
+        sa.Column("song_youtube_id", sa.String(length=100), nullable=False),
+        sa.Column("scripture_reference", sa.String(length=255), nullable=False),
+        sa.Column("scripture_text", sa.Text(), nullable=False),
+        sa.Column("prayer_title", sa.String(length=255), nullable=False),
+        sa.Column("prayer_content", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_quiet_time_entries_id", "quiet_time_entries", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_quiet_time_entries_id", table_name="quiet_time_entries")
+    op.drop_table("quiet_time_entries")
+    op.drop_index("ix_admins_username", table_name="admins")
+    op.drop_index("ix_admins_id", table_name="admins")
+    op.drop_table("admins")
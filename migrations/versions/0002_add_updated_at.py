@@ -0,0 +1,34 @@
+"""Add updated_at to quiet_time_entries (was migrate_add_updated_at.py)
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-01-01
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("quiet_time_entries")}
+    # Tables created by the app before Alembic may already have the column;
+    # keep their timestamps and only fill in the gaps
+    if "updated_at" in columns:
+        op.execute("UPDATE quiet_time_entries SET updated_at = created_at WHERE updated_at IS NULL")
+        return
+
+    with op.batch_alter_table("quiet_time_entries") as batch:
+        batch.add_column(
+            sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now())
+        )
+    # Existing entries haven't changed since they were created
+    op.execute("UPDATE quiet_time_entries SET updated_at = created_at")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("quiet_time_entries") as batch:
+        batch.drop_column("updated_at")
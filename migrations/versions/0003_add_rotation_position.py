@@ -0,0 +1,40 @@
+"""Add rotation_position to quiet_time_entries (was migrate_add_rotation_position.py)
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-01-01
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("quiet_time_entries") as batch:
+        batch.add_column(sa.Column("rotation_position", sa.Integer(), nullable=True))
+
+    # Number existing rows in the order the rotation used (oldest first).
+    # UPDATE ... FROM works on PostgreSQL and SQLite 3.33+.
+    op.execute("""
+        UPDATE quiet_time_entries
+        SET rotation_position = ordered.position
+        FROM (
+            SELECT id, ROW_NUMBER() OVER (ORDER BY created_at ASC, id ASC) - 1 AS position
+            FROM quiet_time_entries
+        ) AS ordered
+        WHERE quiet_time_entries.id = ordered.id
+    """)
+
+    with op.batch_alter_table("quiet_time_entries") as batch:
+        batch.alter_column("rotation_position", existing_type=sa.Integer(), nullable=False)
+        batch.create_index("ix_quiet_time_entries_rotation_position", ["rotation_position"], unique=True)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("quiet_time_entries") as batch:
+        batch.drop_index("ix_quiet_time_entries_rotation_position")
+        batch.drop_column("rotation_position")
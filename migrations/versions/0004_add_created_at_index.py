@@ -0,0 +1,20 @@
+"""Add the (created_at, id) keyset pagination index (was migrate_add_created_at_index.py)
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2025-01-01
+"""
+from alembic import op
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_quiet_time_entries_created_at_id", "quiet_time_entries", ["created_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_quiet_time_entries_created_at_id", table_name="quiet_time_entries")
@@ -0,0 +1,85 @@
+"""Add the full-text search index (was migrate_add_search_index.py)
+
+PostgreSQL: generated, weighted tsvector column with a GIN index.
+SQLite: external-content FTS5 table kept in sync by triggers.
+The SQL is copied from app.models on purpose: a migration must keep doing
+what it did when it was written.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2025-01-01
+"""
+from alembic import op
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+COLUMNS = "song_title, scripture_reference, scripture_text, prayer_title, prayer_content"
+NEW = ", ".join(f"new.{column.strip()}" for column in COLUMNS.split(","))
+OLD = ", ".join(f"old.{column.strip()}" for column in COLUMNS.split(","))
+FTS = "quiet_time_entries_fts"
+
+POSTGRES_UPGRADE = (
+    """
+    ALTER TABLE quiet_time_entries ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(song_title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(scripture_reference, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(prayer_title, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(scripture_text, '')), 'C') ||
+        setweight(to_tsvector('english', coalesce(prayer_content, '')), 'C')
+    ) STORED
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_quiet_time_entries_search
+    ON quiet_time_entries USING GIN (search_vector)
+    """,
+)
+
+SQLITE_UPGRADE = (
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS} USING fts5(
+        {COLUMNS},
+        content='quiet_time_entries', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS}_ai AFTER INSERT ON quiet_time_entries BEGIN
+        INSERT INTO {FTS}(rowid, {COLUMNS}) VALUES (new.id, {NEW});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS}_ad AFTER DELETE ON quiet_time_entries BEGIN
+        INSERT INTO {FTS}({FTS}, rowid, {COLUMNS}) VALUES ('delete', old.id, {OLD});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS}_au AFTER UPDATE OF {COLUMNS}
+    ON quiet_time_entries BEGIN
+        INSERT INTO {FTS}({FTS}, rowid, {COLUMNS}) VALUES ('delete', old.id, {OLD});
+        INSERT INTO {FTS}(rowid, {COLUMNS}) VALUES (new.id, {NEW});
+    END
+    """,
+    # Index the rows that already exist
+    f"INSERT INTO {FTS}({FTS}) VALUES ('rebuild')",
+)
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    statements = {"postgresql": POSTGRES_UPGRADE, "sqlite": SQLITE_UPGRADE}.get(dialect, ())
+    for statement in statements:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_quiet_time_entries_search")
+        op.execute("ALTER TABLE quiet_time_entries DROP COLUMN IF EXISTS search_vector")
+    elif dialect == "sqlite":
+        for suffix in ("ai", "ad", "au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {FTS}_{suffix}")
+        op.execute(f"DROP TABLE IF EXISTS {FTS}")
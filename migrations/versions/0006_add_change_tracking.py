@@ -0,0 +1,34 @@
+"""Add entry tombstones and the (updated_at, id) index for delta sync
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2025-01-01
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_quiet_time_entries_updated_at_id", "quiet_time_entries", ["updated_at", "id"])
+    op.create_table(
+        "quiet_time_entry_tombstones",
+        sa.Column("entry_id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint("entry_id"),
+    )
+    op.create_index(
+        "ix_quiet_time_entry_tombstones_deleted_at_entry_id",
+        "quiet_time_entry_tombstones",
+        ["deleted_at", "entry_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_quiet_time_entry_tombstones_deleted_at_entry_id", table_name="quiet_time_entry_tombstones")
+    op.drop_table("quiet_time_entry_tombstones")
+    op.drop_index("ix_quiet_time_entries_updated_at_id", table_name="quiet_time_entries")
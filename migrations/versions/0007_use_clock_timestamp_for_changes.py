@@ -0,0 +1,30 @@
+"""Stamp updated_at and deleted_at with clock_timestamp() on PostgreSQL
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2025-01-01
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+COLUMNS = (("quiet_time_entries", "updated_at"), ("quiet_time_entry_tombstones", "deleted_at"))
+
+
+def upgrade() -> None:
+    # SQLite's CURRENT_TIMESTAMP is already the statement's time
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for table, column in COLUMNS:
+        op.alter_column(table, column, server_default=sa.text("clock_timestamp()"))
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for table, column in COLUMNS:
+        op.alter_column(table, column, server_default=sa.text("now()"))
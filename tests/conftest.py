@@ -0,0 +1,60 @@
+import os
+import tempfile
+
+import pytest
+
+# Tests never touch a configured database: app.config reads the URL at import
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="quiet-time-tests-"), "test.db")
+os.environ.setdefault("METRICS_ENABLED", "false")
+# Routes are tested directly; the micro-cache has its own tests
+os.environ.setdefault("MICRO_CACHE_TTL_SECONDS", "0")
+
+
+async def add_entries(db, count: int, created_at=None) -> None:
+    """
+    Insert ``count`` entries at rotation positions 0..count-1 and commit.
+    ``created_at(i)`` sets each creation time, otherwise the database does.
+    """
+    from sqlalchemy import insert
+    from app.models import QuietTimeEntry
+    await db.execute(insert(QuietTimeEntry), [
+        {
+            "song_title": f"Song {i}",
+            "song_youtube_id": f"yt{i}",
+            "scripture_reference": f"Psalm {i}",
+            "scripture_text": "text",
+            "prayer_title": f"Prayer {i}",
+            "prayer_content": "content",
+            "rotation_position": i,
+            **({"created_at": created_at(i)} if created_at is not None else {}),
+        }
+        for i in range(count)
+    ])
+    await db.commit()
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def db():
+    """A session on empty tables in the throwaway database."""
+    from app.database import AsyncSessionLocal, Base, async_engine
+
+    async with async_engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    async with AsyncSessionLocal() as session:
+        yield session
+    async with async_engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+
+
+@pytest.fixture
+async def client():
+    import httpx
+    from app.main import app
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+        yield http
@@ -0,0 +1,139 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app import admission
+from app.admission import AdmissionControlMiddleware, Limiter, route_class
+from app.config import settings
+
+API = "/api/v1/quiet-time"
+
+
+async def holder(limiter: Limiter, order: list, name: str, release: asyncio.Event, timeout: float = 5):
+    if not await limiter.acquire(timeout):
+        order.append(f"{name} rejected")
+        return
+    order.append(name)
+    await release.wait()
+    limiter.release()
+
+
+@pytest.mark.anyio
+async def test_waiters_are_admitted_in_arrival_order():
+    limiter = Limiter("test", concurrency=1, queue=3)
+    order = []
+    releases = {name: asyncio.Event() for name in "abcd"}
+    tasks = []
+    for name in "abcd":
+        tasks.append(asyncio.create_task(holder(limiter, order, name, releases[name])))
+        await asyncio.sleep(0)
+    assert order == ["a"] and limiter.queue_depth == 3
+
+    for name in "abcd":
+        releases[name].set()
+        await asyncio.sleep(0.01)
+    await asyncio.gather(*tasks)
+    assert order == ["a", "b", "c", "d"]
+    assert limiter.stats() == {
+        "active": 0, "queue_depth": 0, "admitted": 4, "rejected_full": 0, "rejected_timeout": 0
+    }
+
+
+@pytest.mark.anyio
+async def test_released_slot_goes_to_the_queue_not_a_newcomer():
+    limiter = Limiter("test", concurrency=1, queue=1)
+    assert await limiter.acquire(1)
+    waiter = asyncio.create_task(limiter.acquire(1))
+    await asyncio.sleep(0)
+    limiter.release()
+    # The slot was handed over, so a request arriving now has to queue
+    assert limiter.active == 1
+    assert not await limiter.acquire(0.01)
+    assert await waiter
+
+
+@pytest.mark.anyio
+async def test_full_queue_rejects_at_once():
+    limiter = Limiter("test", concurrency=1, queue=1)
+    assert await limiter.acquire(1)
+    waiter = asyncio.create_task(limiter.acquire(1))
+    await asyncio.sleep(0)
+    assert not await limiter.acquire(1)
+    assert limiter.rejected_full == 1
+    limiter.release()
+    assert await waiter
+
+
+@pytest.mark.anyio
+async def test_timed_out_waiter_leaves_the_queue():
+    limiter = Limiter("test", concurrency=1, queue=2)
+    assert await limiter.acquire(1)
+    assert not await limiter.acquire(0.01)
+    assert limiter.rejected_timeout == 1
+    assert limiter.queue_depth == 0
+    limiter.release()
+    assert limiter.active == 0
+    assert await limiter.acquire(0.01)
+
+
+@pytest.mark.anyio
+async def test_cancelled_waiter_leaves_the_queue():
+    limiter = Limiter("test", concurrency=1, queue=2)
+    assert await limiter.acquire(1)
+    waiter = asyncio.create_task(limiter.acquire(1))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert limiter.queue_depth == 0
+    limiter.release()
+    assert limiter.active == 0
+
+
+def scope(method: str, path: str, query: bytes = b"") -> dict:
+    return {"type": "http", "method": method, "path": path, "query_string": query}
+
+
+@pytest.mark.parametrize("method, path, query, expected", [
+    ("GET", f"{API}/entries/today", b"tz=UTC", "priority"),
+    ("GET", "/health", b"", "priority"),
+    ("POST", "/api/v1/auth/login", b"", "login"),
+    ("GET", f"{API}/entries", b"", "heavy"),
+    ("GET", f"{API}/entries", b"limit=20&stream=ndjson", "heavy"),
+    ("GET", f"{API}/entries", b"limit=20", "default"),
+    ("GET", f"{API}/entries", b"cursor=abc", "default"),
+    ("GET", f"{API}/entries", b"cursor=abc&stream=json", "heavy"),
+    ("GET", f"{API}/entries/search", b"q=grace", "heavy"),
+    ("POST", f"{API}/entries/bulk", b"", "heavy"),
+    ("DELETE", f"{API}/entries/batch", b"", "heavy"),
+    ("PATCH", f"{API}/entries/3", b"", "default"),
+])
+def test_route_class(method, path, query, expected):
+    assert route_class(scope(method, path, query)) == expected
+
+
+@pytest.mark.anyio
+async def test_middleware_answers_503_when_the_class_is_full(monkeypatch):
+    limiter = Limiter("heavy", concurrency=1, queue=0)
+    monkeypatch.setitem(admission.limiters, "heavy", limiter)
+    started, finish = asyncio.Event(), asyncio.Event()
+
+    async def app(scope, receive, send):
+        started.set()
+        await finish.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    transport = httpx.ASGITransport(app=AdmissionControlMiddleware(app))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        first = asyncio.create_task(client.get(f"{API}/entries"))
+        await started.wait()
+        busy = await client.get(f"{API}/entries")
+        finish.set()
+        assert (await first).status_code == 200
+
+    assert busy.status_code == 503
+    assert busy.headers["retry-after"] == str(settings.ADMISSION_RETRY_AFTER_SECONDS)
+    assert busy.json()["success"] is False
+    assert limiter.active == 0
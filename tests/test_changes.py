@@ -0,0 +1,162 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import delete, insert, select
+
+from app.changes import clear_tombstones, read_changes, record_deletions, restamp
+from app.config import settings
+from app.models import EntryTombstone, QuietTimeEntry
+
+FIELDS = ("id",)
+
+
+def utc_now() -> datetime:
+    # SQLite keeps naive UTC with whole seconds
+    return datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+
+
+@pytest.fixture
+def settle(monkeypatch):
+    monkeypatch.setattr(settings, "SYNC_SETTLE_SECONDS", 60)
+
+
+async def add_entry(db, entry_id: int, updated_at: datetime) -> None:
+    await db.execute(insert(QuietTimeEntry), [{
+        "id": entry_id,
+        "song_title": f"Song {entry_id}",
+        "song_youtube_id": f"yt{entry_id}",
+        "scripture_reference": f"Psalm {entry_id}",
+        "scripture_text": "text",
+        "prayer_title": f"Prayer {entry_id}",
+        "prayer_content": "content",
+        "rotation_position": entry_id,
+        "updated_at": updated_at,
+    }])
+
+
+async def add_tombstone(db, entry_id: int, deleted_at: datetime) -> None:
+    await db.execute(insert(EntryTombstone), [{"entry_id": entry_id, "deleted_at": deleted_at}])
+
+
+async def sync(db, limit: int, since=None) -> list:
+    """Every change after ``since``, one page of ``limit`` at a time, as ("item"|"deleted", id)."""
+    seen = []
+    while True:
+        changes = await read_changes(db, since, limit, FIELDS)
+        seen += [("item", int(item["id"])) for item in changes.items]
+        seen += [("deleted", int(tombstone["id"])) for tombstone in changes.deleted]
+        since = changes.cursor
+        if not changes.has_more:
+            return seen
+
+
+@pytest.mark.anyio
+async def test_changes_inside_the_settle_window_are_held_back(db, settle, monkeypatch):
+    now = utc_now()
+    await add_entry(db, 1, now - timedelta(minutes=5))
+    await add_entry(db, 2, now)
+    await add_tombstone(db, 3, now)
+    await db.commit()
+
+    changes = await read_changes(db, None, 10, FIELDS)
+    assert [item["id"] for item in changes.items] == ["1"]
+    assert changes.deleted == []
+    assert changes.cursor == (now - timedelta(minutes=5), 1)
+
+    # Once settled, the next sync picks them up from the same cursor
+    monkeypatch.setattr(settings, "SYNC_SETTLE_SECONDS", 0)
+    assert await sync(db, 10, changes.cursor) == [("item", 2), ("deleted", 3)]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("limit", [1, 2, 3, 10])
+async def test_upserts_and_deletions_are_merged_in_order(db, settle, limit):
+    start = utc_now() - timedelta(minutes=10)
+    await add_entry(db, 1, start)
+    await add_tombstone(db, 7, start + timedelta(seconds=1))
+    await add_entry(db, 2, start + timedelta(seconds=2))
+    await add_tombstone(db, 8, start + timedelta(seconds=3))
+    await add_tombstone(db, 9, start + timedelta(seconds=4))
+    await add_entry(db, 3, start + timedelta(seconds=5))
+    await db.commit()
+
+    changes = await sync(db, limit)
+    assert sorted(changes, key=lambda change: change[1]) == [
+        ("item", 1), ("item", 2), ("item", 3), ("deleted", 7), ("deleted", 8), ("deleted", 9)
+    ]
+    if limit == 1:
+        # One change per page shows the merge order itself
+        assert changes == [
+            ("item", 1), ("deleted", 7), ("item", 2), ("deleted", 8), ("deleted", 9), ("item", 3)
+        ]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("limit", [1, 2, 4])
+async def test_cursor_ties_on_the_timestamp_are_broken_by_id(db, settle, limit):
+    tied = utc_now() - timedelta(minutes=10)
+    for entry_id in (2, 4, 5):
+        await add_entry(db, entry_id, tied)
+    for entry_id in (1, 3, 6):
+        await add_tombstone(db, entry_id, tied)
+    await db.commit()
+
+    assert await sync(db, 1) == [
+        ("deleted", 1), ("item", 2), ("deleted", 3), ("item", 4), ("item", 5), ("deleted", 6)
+    ]
+    # Every page boundary falls inside the tie; nothing is repeated or skipped
+    changes = await sync(db, limit)
+    assert sorted(entry_id for _, entry_id in changes) == [1, 2, 3, 4, 5, 6]
+
+
+@pytest.mark.anyio
+async def test_reused_id_clears_its_tombstone(db, settle, monkeypatch):
+    old = utc_now() - timedelta(minutes=10)
+    for entry_id in (1, 2, 3):
+        await add_entry(db, entry_id, old)
+    await db.commit()
+    await db.execute(delete(QuietTimeEntry).where(QuietTimeEntry.id == 3))
+    await record_deletions(db, [3])
+    await db.commit()
+
+    # SQLite hands out the id of the deleted last row again
+    reused = QuietTimeEntry(
+        song_title="New", song_youtube_id="new", scripture_reference="Psalm 150",
+        scripture_text="text", prayer_title="New", prayer_content="content", rotation_position=3
+    )
+    db.add(reused)
+    await db.flush()
+    assert reused.id == 3
+    await clear_tombstones(db, reused.id)
+    await db.commit()
+
+    assert (await db.execute(select(EntryTombstone.entry_id))).scalars().all() == []
+    monkeypatch.setattr(settings, "SYNC_SETTLE_SECONDS", 0)
+    assert [change for change in await sync(db, 10) if change[1] == 3] == [("item", 3)]
+
+
+@pytest.mark.anyio
+async def test_clear_tombstones_takes_a_range(db):
+    now = utc_now()
+    for entry_id in range(1, 6):
+        await add_tombstone(db, entry_id, now)
+    await clear_tombstones(db, 2, 4)
+    await db.commit()
+    assert (await db.execute(select(EntryTombstone.entry_id).order_by(EntryTombstone.entry_id))).scalars().all() == [1, 5]
+
+
+@pytest.mark.anyio
+async def test_restamp_moves_a_bulk_import_to_commit_time(db, settle):
+    # Rows written early in a long transaction, stamped with the time they were written
+    written = utc_now() - timedelta(minutes=10)
+    for entry_id in range(1, 6):
+        await add_entry(db, entry_id, written)
+    before = utc_now()
+    await restamp(db, 2, 4)
+    await db.commit()
+
+    stamps = dict((await db.execute(select(QuietTimeEntry.id, QuietTimeEntry.updated_at))).tuples().all())
+    assert stamps[1] == stamps[5] == written
+    assert all(stamps[entry_id] >= before for entry_id in (2, 3, 4))
+    # Restamped rows wait out the settle window like any fresh write
+    assert await sync(db, 10) == [("item", 1), ("item", 5)]
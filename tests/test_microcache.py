@@ -0,0 +1,160 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app import admission, microcache
+from app.admission import AdmissionControlMiddleware, Limiter
+from app.config import settings
+from app.microcache import MicroCacheMiddleware
+
+PATH = "/api/v1/quiet-time/entries"
+
+
+class Backend:
+    """Counts renders; each takes a moment so concurrent requests overlap."""
+
+    def __init__(self, status: int = 200):
+        self.status = status
+        self.renders = 0
+        self.started = asyncio.Event()
+        self.proceed = asyncio.Event()
+        self.proceed.set()
+
+    async def __call__(self, scope, receive, send):
+        self.renders += 1
+        self.started.set()
+        await self.proceed.wait()
+        await asyncio.sleep(0.01)
+        body = f"render {self.renders}".encode()
+        await send({
+            "type": "http.response.start",
+            "status": self.status,
+            "headers": [(b"etag", b'"v%d"' % self.renders), (b"content-type", b"text/plain")],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(settings, "MICRO_CACHE_TTL_SECONDS", 5)
+    microcache.response_cache.clear()
+    yield
+    microcache.response_cache.clear()
+
+
+def client_for(app):
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.mark.anyio
+async def test_concurrent_misses_share_one_render():
+    backend = Backend()
+    async with client_for(MicroCacheMiddleware(backend, [PATH])) as client:
+        responses = await asyncio.gather(*(client.get(PATH) for _ in range(20)))
+        again = await client.get(PATH)
+
+    assert backend.renders == 1
+    assert {response.text for response in responses + [again]} == {"render 1"}
+    assert again.headers["age"] == "0"
+    assert again.headers["content-length"] == str(len("render 1"))
+
+
+@pytest.mark.anyio
+async def test_query_strings_are_cached_apart_and_other_paths_pass_through():
+    backend = Backend()
+    async with client_for(MicroCacheMiddleware(backend, [PATH])) as client:
+        await client.get(PATH, params={"limit": 1})
+        await client.get(PATH, params={"limit": 2})
+        await client.get(PATH, params={"limit": 1})
+        await client.get(PATH, params={"stream": "ndjson"})
+        await client.get("/elsewhere")
+        await client.get("/elsewhere")
+    assert backend.renders == 5
+
+
+@pytest.mark.anyio
+async def test_invalidate_drops_cached_responses():
+    backend = Backend()
+    async with client_for(MicroCacheMiddleware(backend, [PATH])) as client:
+        assert (await client.get(PATH)).text == "render 1"
+        microcache.invalidate()
+        assert (await client.get(PATH)).text == "render 2"
+        assert (await client.get(PATH)).text == "render 2"
+
+
+@pytest.mark.anyio
+async def test_render_started_before_a_write_is_not_kept():
+    backend = Backend()
+    backend.proceed.clear()
+    async with client_for(MicroCacheMiddleware(backend, [PATH])) as client:
+        before = asyncio.create_task(client.get(PATH))
+        await backend.started.wait()
+        microcache.invalidate()
+        backend.proceed.set()
+        # The waiting request still gets an answer, but the next one renders again
+        assert (await before).text == "render 1"
+        assert (await client.get(PATH)).text == "render 2"
+    assert backend.renders == 2
+
+
+@pytest.mark.anyio
+async def test_replica_reads_right_after_a_write_are_not_kept(monkeypatch):
+    monkeypatch.setattr(settings, "READ_DATABASE_URL", "sqlite:///replica.db")
+    monkeypatch.setattr(settings, "READ_REPLICA_LAG_SECONDS", 0.05)
+    backend = Backend()
+    async with client_for(MicroCacheMiddleware(backend, [PATH])) as client:
+        microcache.invalidate()
+        # The replica may not have the write yet
+        assert (await client.get(PATH)).text == "render 1"
+        assert (await client.get(PATH)).text == "render 2"
+        await asyncio.sleep(0.05)
+        assert (await client.get(PATH)).text == "render 3"
+        assert (await client.get(PATH)).text == "render 3"
+
+
+@pytest.mark.anyio
+async def test_stale_response_is_served_while_one_refresh_runs(monkeypatch):
+    monkeypatch.setattr(settings, "MICRO_CACHE_TTL_SECONDS", 0.05)
+    backend = Backend()
+    async with client_for(MicroCacheMiddleware(backend, [PATH])) as client:
+        await client.get(PATH)
+        await asyncio.sleep(0.1)
+        stale = await asyncio.gather(*(client.get(PATH) for _ in range(5)))
+        await asyncio.sleep(0.05)
+        refreshed = await client.get(PATH)
+    assert {response.text for response in stale} == {"render 1"}
+    assert refreshed.text == "render 2"
+    assert backend.renders == 2
+
+
+@pytest.mark.anyio
+async def test_if_none_match_is_answered_from_the_cache():
+    backend = Backend()
+    async with client_for(MicroCacheMiddleware(backend, [PATH])) as client:
+        etag = (await client.get(PATH)).headers["etag"]
+        response = await client.get(PATH, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert backend.renders == 1
+
+
+@pytest.mark.anyio
+async def test_failures_are_not_cached():
+    backend = Backend(status=500)
+    async with client_for(MicroCacheMiddleware(backend, [PATH])) as client:
+        await client.get(PATH)
+        await client.get(PATH)
+    assert backend.renders == 2
+
+
+@pytest.mark.anyio
+async def test_hits_and_waiters_hold_no_admission_slot(monkeypatch):
+    # Same order as app.main: admission inside the micro-cache
+    monkeypatch.setitem(admission.limiters, "heavy", Limiter("heavy", concurrency=1, queue=0))
+    backend = Backend()
+    app = MicroCacheMiddleware(AdmissionControlMiddleware(backend), [PATH])
+    async with client_for(app) as client:
+        responses = await asyncio.gather(*(client.get(PATH) for _ in range(30)))
+    assert [response.status_code for response in responses] == [200] * 30
+    assert backend.renders == 1
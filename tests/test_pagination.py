@@ -0,0 +1,80 @@
+import base64
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app import read_model
+from app.pagination import InvalidCursor, decode_cursor, encode_cursor
+from tests.conftest import add_entries
+
+ENTRIES = "/api/v1/quiet-time/entries"
+START = datetime(2025, 3, 1, 12, 0, 0)
+
+
+def test_cursor_round_trip():
+    for timestamp in (START, START.replace(tzinfo=timezone.utc)):
+        cursor = encode_cursor(timestamp, 42)
+        assert "=" not in cursor
+        assert decode_cursor(cursor) == (timestamp, 42)
+
+
+@pytest.mark.parametrize("cursor", [
+    "",
+    "not base64!",
+    base64.urlsafe_b64encode(b"[1, 2, 3]").decode(),
+    base64.urlsafe_b64encode(b'["yesterday", 1]').decode(),
+    base64.urlsafe_b64encode(b'["2025-01-01", "x"]').decode(),
+    base64.urlsafe_b64encode(b'["2025-01-01", 1e400]').decode(),
+    base64.urlsafe_b64encode(b'["9999-12-31T23:59:59-05:00", 1]').decode(),
+])
+def test_invalid_cursors(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor)
+
+
+def tied(i: int) -> datetime:
+    # Three entries per second, so page boundaries fall inside timestamp ties
+    return START + timedelta(seconds=i // 3)
+
+
+async def page_through(client, limit: int, cursor=None):
+    ids = []
+    while True:
+        params = {"limit": limit}
+        if cursor is not None:
+            params["cursor"] = cursor
+        data = (await client.get(ENTRIES, params=params)).json()["data"]
+        ids.extend(int(item["id"]) for item in data["items"])
+        cursor = data["nextCursor"]
+        if cursor is None:
+            return ids
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("limit", [1, 2, 3, 4, 10, 11])
+async def test_pages_cover_every_entry_once(db, client, limit):
+    await add_entries(db, 10, created_at=tied)
+    # Newest first; ties on created_at by id
+    assert await page_through(client, limit) == list(range(10, 0, -1))
+
+
+@pytest.mark.anyio
+async def test_read_model_pages_match_the_database(db, client):
+    await add_entries(db, 10, created_at=tied)
+    from_database = [await page_through(client, limit) for limit in (1, 3, 4)]
+    await read_model.load()
+    try:
+        assert read_model.active() is not None
+        assert [await page_through(client, limit) for limit in (1, 3, 4)] == from_database
+        # The same cursor in the aware form (as PostgreSQL hands it out) reads the same page
+        aware = encode_cursor(START.replace(tzinfo=timezone.utc) + timedelta(seconds=2), 7)
+        assert await page_through(client, 2, aware) == [6, 5, 4, 3, 2, 1]
+    finally:
+        read_model.store = None
+
+
+@pytest.mark.anyio
+async def test_invalid_cursor_is_a_failed_response(db, client):
+    response = await client.get(ENTRIES, params={"limit": 2, "cursor": "garbage"})
+    assert response.status_code == 200
+    assert response.json() == {"success": False, "message": "Invalid cursor", "data": None}
@@ -0,0 +1,75 @@
+import pytest
+
+from app import read_model
+from app.auth import create_access_token, get_password_hash
+from app.models import Admin
+
+ENTRIES = "/api/v1/quiet-time/entries"
+READS = [
+    (ENTRIES, {}),
+    (ENTRIES, {"fields": "*"}),
+    (ENTRIES, {"limit": 2}),
+    (ENTRIES, {"limit": 3, "fields": "*"}),
+    (ENTRIES + "/today", {}),
+]
+
+
+def entry_body(n: int) -> dict:
+    return {
+        "song": {"title": f"Song {n}", "youtubeId": f"yt{n}"},
+        "scripture": {"reference": f"Psalm {n}", "text": "text"},
+        "prayer": {"title": f"Prayer {n}", "content": "content"},
+    }
+
+
+@pytest.fixture
+async def admin_headers(db):
+    db.add(Admin(username="admin", hashed_password=get_password_hash("secret")))
+    await db.commit()
+    return {"Authorization": "Bearer " + create_access_token({"sub": "admin"})}
+
+
+async def responses(client) -> list:
+    return [(await client.get(path, params=params)).json() for path, params in READS]
+
+
+async def assert_matches_database(client) -> None:
+    # Still the model loaded at the start, kept current by the writes themselves
+    model = read_model.active()
+    assert model is not None and not model.dirty
+    from_model = await responses(client)
+    read_model.store = None
+    try:
+        from_database = await responses(client)
+    finally:
+        read_model.store = model
+    assert from_model == from_database
+
+
+@pytest.mark.anyio
+async def test_read_model_follows_writes(db, client, admin_headers):
+    for n in range(5):
+        assert (await client.post(ENTRIES, json=entry_body(n), headers=admin_headers)).json()["success"]
+    await read_model.load()
+    try:
+        created = await client.post(ENTRIES, json=entry_body(5), headers=admin_headers)
+        new_id = created.json()["data"]["id"]
+        await assert_matches_database(client)
+
+        updated = await client.patch(f"{ENTRIES}/2", json=entry_body(20), headers=admin_headers)
+        assert updated.json()["success"]
+        await assert_matches_database(client)
+
+        batch = {"entries": [{"id": 1, "song": {"title": "Renamed"}}, {"id": new_id, "prayer": {"content": "new"}}]}
+        assert (await client.patch(ENTRIES + "/batch", json=batch, headers=admin_headers)).json()["success"]
+        await assert_matches_database(client)
+
+        assert (await client.delete(f"{ENTRIES}/3", headers=admin_headers)).json()["success"]
+        await assert_matches_database(client)
+
+        deleted = await client.request("DELETE", ENTRIES + "/batch", json={"ids": [1, new_id]}, headers=admin_headers)
+        assert deleted.json()["success"]
+        await assert_matches_database(client)
+        assert len(read_model.active()) == 3
+    finally:
+        read_model.store = None
@@ -0,0 +1,106 @@
+from datetime import timedelta, timezone
+
+import pytest
+from sqlalchemy import delete, select
+
+from app import microcache
+from app.config import settings
+from app.models import QuietTimeEntry
+from app.rotation import (
+    InvalidTimezone,
+    close_gaps,
+    count_entries,
+    get_rotation_state,
+    invalidate_rotation_state,
+    parse_timezone,
+    rotation_cache,
+)
+from tests.conftest import add_entries
+
+
+async def delete_positions(db, positions) -> None:
+    await db.execute(delete(QuietTimeEntry).where(QuietTimeEntry.rotation_position.in_(positions)))
+    await close_gaps(db, positions)
+
+
+async def rotation(db):
+    """(song title, position) in rotation order, and each entry's updated_at."""
+    rows = (await db.execute(
+        select(QuietTimeEntry.song_title, QuietTimeEntry.rotation_position, QuietTimeEntry.updated_at)
+        .order_by(QuietTimeEntry.rotation_position)
+    )).all()
+    return [(row.song_title, row.rotation_position) for row in rows], {row.song_title: row.updated_at for row in rows}
+
+
+@pytest.mark.parametrize("value, hours, minutes", [
+    (None, 0, 0),
+    ("UTC", 0, 0),
+    ("+05:30", 5, 30),
+    (" 05:45", 5, 45),
+    ("-0800", -8, 0),
+    ("UTC-03:30", -3, -30),
+    ("+9", 9, 0),
+])
+def test_parse_utc_offsets(value, hours, minutes):
+    assert parse_timezone(value) == timezone(timedelta(hours=hours, minutes=minutes))
+
+
+@pytest.mark.parametrize("value", ["+05:17", "-0001", "+14:30", "+05:60", "Nowhere/Special"])
+def test_parse_rejects_invalid_zones(value):
+    with pytest.raises(InvalidTimezone):
+        parse_timezone(value)
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("deleted", [[0], [9], [4], [2, 3, 7], [0, 9], [7, 2, 2, 3], [1, 3, 5, 7, 9], list(range(10))])
+async def test_close_gaps_renumbers_in_order(db, deleted):
+    await add_entries(db, 10)
+    _, updated_before = await rotation(db)
+
+    await delete_positions(db, deleted)
+
+    order, updated_after = await rotation(db)
+    kept = [f"Song {i}" for i in range(10) if i not in deleted]
+    assert order == [(title, position) for position, title in enumerate(kept)]
+    assert await count_entries(db) == len(kept)
+    # Moving in the rotation is not a content change
+    assert updated_after == {title: updated_before[title] for title in kept}
+
+
+@pytest.mark.anyio
+async def test_close_gaps_without_positions_changes_nothing(db):
+    await add_entries(db, 3)
+    await close_gaps(db, [])
+    assert (await rotation(db))[0] == [("Song 0", 0), ("Song 1", 1), ("Song 2", 2)]
+
+
+@pytest.mark.anyio
+async def test_rotation_state_from_a_lagging_replica_is_not_cached(db, monkeypatch):
+    monkeypatch.setattr(settings, "READ_DATABASE_URL", "sqlite:///replica.db")
+    monkeypatch.setattr(settings, "READ_REPLICA_LAG_SECONDS", 60)
+    await add_entries(db, 3)
+    invalidate_rotation_state()
+    microcache.invalidate()
+    assert (await get_rotation_state(db)).total_entries == 3
+    assert len(rotation_cache) == 0
+
+    monkeypatch.setattr(settings, "READ_REPLICA_LAG_SECONDS", 0)
+    await get_rotation_state(db)
+    assert len(rotation_cache) == 1
+    invalidate_rotation_state()
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("path", [
+    "/entries/today",
+    "/entries/schedule",
+    "/entries/rotation/status",
+    "/entries/rotation/days-remaining",
+    "/entries/rotation/entries-remaining",
+])
+async def test_routes_share_the_tz_parameter(db, client, path):
+    url = "/api/v1/quiet-time" + path
+    response = await client.get(url, params={"tz": "Nowhere/Special"})
+    assert response.status_code == 200
+    assert response.json() == {"success": False, "message": "Unknown time zone: Nowhere/Special", "data": None}
+    assert (await client.get(url, params={"tz": "+05:30"})).json()["success"]
@@ -0,0 +1,89 @@
+import pytest
+
+from app.shared_cache import SharedCache
+
+pytest.importorskip("fcntl", reason="the shared cache needs fcntl (POSIX)")
+
+KEY = ("/api/v1/quiet-time/entries/today", b"tz=UTC")
+HEADERS = [(b"etag", b'"abc"'), (b"content-type", b"application/json")]
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "cache")
+
+
+def opened(path, slots: int = 8, slot_bytes: int = 4096) -> SharedCache:
+    cache = SharedCache()
+    cache.open(path, slots, slot_bytes)
+    return cache
+
+
+def test_put_then_get_in_another_worker(path):
+    writer, reader = opened(path), opened(path)
+    assert writer.put(KEY, 0, 200, HEADERS, b'{"ok":true}', fresh_for=2)
+
+    status, headers, body, stored_at, fresh_until = reader.get(KEY, 0)
+    assert (status, headers, body) == (200, HEADERS, b'{"ok":true}')
+    assert fresh_until - stored_at == pytest.approx(2)
+    assert reader.stats() == {"size": 1, "hits": 1, "misses": 0}
+
+
+def test_bump_is_seen_by_every_worker_and_retires_old_slots(path):
+    first, second = opened(path), opened(path)
+    first.put(KEY, 0, 200, HEADERS, b"old", fresh_for=2)
+
+    assert second.bump() == 1
+    assert first.generation() == 1
+    assert first.get(KEY, first.generation()) is None
+    assert len(first) == 0
+
+
+def test_put_is_refused_once_the_generation_moved(path):
+    cache = opened(path)
+    cache.bump()
+    # Rendered for generation 0, finished after the write
+    assert not cache.put(KEY, 0, 200, HEADERS, b"late", fresh_for=2)
+    assert cache.get(KEY, 0) is None
+
+
+def test_response_larger_than_a_slot_is_not_stored(path):
+    cache = opened(path, slot_bytes=256)
+    assert not cache.put(KEY, 0, 200, HEADERS, b"x" * 256, fresh_for=2)
+    assert cache.put(KEY, 0, 200, HEADERS, b"x" * 64, fresh_for=2)
+
+
+def test_colliding_keys_replace_each_other(path):
+    cache = opened(path, slots=1)
+    other = ("/api/v1/quiet-time/entries/rotation/status", b"")
+    cache.put(KEY, 0, 200, HEADERS, b"today", fresh_for=2)
+    cache.put(other, 0, 200, [], b"status", fresh_for=2)
+
+    assert cache.get(KEY, 0) is None
+    assert cache.get(other, 0)[:3] == (200, [], b"status")
+
+
+def test_a_shorter_record_does_not_keep_the_old_tail(path):
+    cache = opened(path)
+    cache.put(KEY, 0, 200, HEADERS, b"a much longer body", fresh_for=2)
+    cache.put(KEY, 0, 200, HEADERS, b"short", fresh_for=2)
+    assert cache.get(KEY, 0)[2] == b"short"
+
+
+def test_reopening_with_another_layout_starts_over(path):
+    cache = opened(path)
+    cache.bump()
+    cache.put(KEY, 1, 200, HEADERS, b"kept", fresh_for=2)
+    assert opened(path).get(KEY, 1) is not None
+
+    resized = opened(path, slots=16)
+    assert resized.generation() == 0
+    assert resized.get(KEY, 1) is None
+
+
+def test_closed_cache_misses():
+    cache = SharedCache()
+    assert not cache.enabled
+    assert cache.get(KEY, 0) is None
+    assert not cache.put(KEY, 0, 200, HEADERS, b"", fresh_for=2)
+    assert len(cache) == 0
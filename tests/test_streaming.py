@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from app.streaming import MalformedJSON, iter_json_array, iter_ndjson
+
+ITEMS = [
+    {"song": {"title": "Amazing Grace é世\U0001f64f", "youtubeId": "abc"}, "n": [1, 2.5, -3e10, 1E-2]},
+    12,
+    2.5,
+    1e3,
+    -0.125,
+    "a \"quoted\", [bracketed] string",
+    True,
+    None,
+    [],
+    {},
+]
+
+
+async def chunked(data: bytes, *offsets: int):
+    start = 0
+    for offset in offsets:
+        yield data[start:offset]
+        start = offset
+    yield data[start:]
+
+
+async def collect(items):
+    return [item async for item in items]
+
+
+@pytest.mark.anyio
+async def test_json_array_split_at_every_offset():
+    data = json.dumps(ITEMS, ensure_ascii=False, separators=(", ", ": ")).encode("utf-8")
+    for offset in range(len(data) + 1):
+        assert await collect(iter_json_array(chunked(data, offset))) == ITEMS, offset
+
+
+@pytest.mark.anyio
+async def test_json_array_split_into_single_bytes():
+    data = json.dumps(ITEMS, ensure_ascii=False).encode("utf-8")
+    assert await collect(iter_json_array(chunked(data, *range(1, len(data))))) == ITEMS
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("body", [b"[1,2.5,1e3]", b" [ 1 , 2.5 , 1e3 ] ", b"[1\n,2.5,\t1e3]"])
+async def test_json_array_numbers_split_at_every_offset(body):
+    for offset in range(len(body) + 1):
+        assert await collect(iter_json_array(chunked(body, offset))) == [1, 2.5, 1000.0], offset
+
+
+@pytest.mark.anyio
+async def test_json_array_empty():
+    assert await collect(iter_json_array(chunked(b" [ ] ", 2))) == []
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("body", [b"{}", b"[1,]", b"[1 2]", b"[1", b"[1]x", b"[tru]", b""])
+async def test_json_array_malformed(body):
+    for offset in range(len(body) + 1):
+        with pytest.raises(MalformedJSON):
+            await collect(iter_json_array(chunked(body, offset)))
+
+
+@pytest.mark.anyio
+async def test_ndjson_split_at_every_offset():
+    data = ("\n".join(json.dumps(item, ensure_ascii=False) for item in ITEMS) + "\n\n").encode("utf-8")
+    for offset in range(len(data) + 1):
+        assert await collect(iter_ndjson(chunked(data, offset))) == ITEMS, offset
+
+
+@pytest.mark.anyio
+async def test_ndjson_reports_bad_lines_and_carries_on():
+    items = await collect(iter_ndjson(chunked(b'{"a": 1}\n{oops\n\n2', 5)))
+    assert items[0] == {"a": 1}
+    assert isinstance(items[1], MalformedJSON)
+    assert items[2] == 2